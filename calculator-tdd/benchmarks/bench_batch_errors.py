@@ -0,0 +1,61 @@
+"""
+Cost of per-element errors in bulk division.
+
+Compares a loop of ``Calculator.divide`` calls that keeps each result or
+exception (the way to get past errors before ``errors='collect'``) with
+``Calculator.divide_many(..., errors='collect')`` on the same operands,
+with 1% zero divisors. The memory column is what the results keep
+allocated once built, measured with ``tracemalloc`` in a separate run.
+Run with:
+
+    uv run python benchmarks/bench_batch_errors.py
+"""
+import random
+import time
+import tracemalloc
+from array import array
+
+from calculator import Calculator
+
+SIZE = 1_000_000
+
+
+def per_element(a, b) -> list:
+    divide = Calculator.divide
+    results = []
+    append = results.append
+    for x, y in zip(a, b):
+        try:
+            append(divide(x, y))
+        except (TypeError, ValueError, ArithmeticError) as error:
+            append(error)
+    return results
+
+
+def collected(a, b):
+    return Calculator.divide_many(a, b, errors='collect')
+
+
+def main() -> None:
+    rng = random.Random(42)
+    a = array('d', (rng.uniform(-1e6, 1e6) for _ in range(SIZE)))
+    b = array('d', (0.0 if rng.random() < 0.01 else rng.uniform(-1e3, 1e3)
+                    for _ in range(SIZE)))
+    print(f"{SIZE:,} divisions, 1% by zero")
+    print(f"{'method':<22} {'time':>9} {'memory':>14}")
+    for name, function in (("try/except per call", per_element),
+                           ("errors='collect'", collected)):
+        start = time.perf_counter()
+        result = function(a, b)
+        elapsed = time.perf_counter() - start
+        del result
+        tracemalloc.start()
+        result = function(a, b)
+        kept = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del result
+        print(f"{name:<22} {elapsed * 1e3:>7.1f}ms {kept / SIZE:>8.1f} B/elem")
+
+
+if __name__ == "__main__":
+    main()
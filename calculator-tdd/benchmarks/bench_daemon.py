@@ -0,0 +1,65 @@
+"""
+Per-call latency of ``python -m calculator`` with and without the daemon.
+
+Each case starts a new ``python -m calculator`` process per call, as a
+caller's shell script would, once in-process and once with
+``CALCULATOR_DAEMON=1`` forwarding the call to a warm daemon on a
+private socket. The daemon is started before timing and exits shortly
+after the run. Run with:
+
+    uv run python benchmarks/bench_daemon.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+CALLS = 30
+
+CASES = [
+    ("add 1 2", ["add", "1", "2"]),
+    ("sum", ["sum", "0.1", "0.2", "0.3"]),
+    ("eval", ["eval", "(a + b) * c", "a=1", "b=2", "c=3"]),
+    ("--exact divide", ["--exact", "divide", "1", "3"]),
+    ("--help", ["--help"]),
+]
+
+
+def per_call(args: list, env: dict) -> float:
+    """Return the median wall time of one call, in seconds."""
+    command = [sys.executable, "-m", "calculator", *args]
+    times = []
+    for _ in range(CALLS):
+        start = time.perf_counter()
+        subprocess.run(command, env=env, stdout=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main() -> None:
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "calculator.sock")
+    plain = dict(os.environ)
+    plain.pop("CALCULATOR_DAEMON", None)
+    plain.pop("PYTHONDONTWRITEBYTECODE", None)  # Time calls with the bytecode cache
+    daemon = dict(plain, CALCULATOR_DAEMON="1", CALCULATOR_DAEMON_SOCKET=path,
+                  CALCULATOR_DAEMON_IDLE="2")
+    # The first call starts the daemon; wait until it listens
+    subprocess.run([sys.executable, "-m", "calculator", "add", "1", "2"], env=daemon,
+                   stdout=subprocess.DEVNULL, check=True)
+    deadline = time.monotonic() + 10
+    while not os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    print(f"median of {CALLS} calls")
+    print(f"{'call':<16} {'in-process':>11} {'daemon':>9}")
+    for name, args in CASES:
+        local = per_call(args, plain)
+        forwarded = per_call(args, daemon)
+        print(f"{name:<16} {local * 1e3:>9.1f}ms {forwarded * 1e3:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Per-operation cost of dispatching through the operation registry.
+
+For each registered operation, compares calling the unchecked
+implementation directly with looking it up by name in
+``registry.OPERATIONS`` first, with ``registry.resolve`` (lookup plus
+policy selection) and with ``Calculator.calculate``. The last column is
+the whole ``CalculatorCLI.calculate`` call, parsing included. Run with:
+
+    uv run python benchmarks/bench_dispatch.py
+"""
+import operator
+import timeit
+
+from calculator import Calculator
+from calculator.cli import CalculatorCLI
+from calculator.registry import OPERATIONS, register, resolve
+
+NUMBER = 500_000
+
+
+def time_statement(statement: str, namespace: dict, number: int = NUMBER) -> float:
+    """Return the best per-run time of ``statement`` in nanoseconds."""
+    timer = timeit.Timer(statement, globals=namespace)
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e9
+
+
+def main() -> None:
+    register('power', operator.pow)  # a runtime operation, to compare with the built-ins
+    cli = CalculatorCLI()
+    calc = Calculator(validate=False)
+    print(f"{'operation':<10} {'direct':>9} {'lookup':>9} {'resolve':>9} "
+          f"{'calculate':>10} {'cli':>9}")
+    for name, operation in OPERATIONS.items():
+        namespace = {
+            'function': operation.unchecked, 'table': OPERATIONS, 'resolve': resolve,
+            'calc': calc, 'cli': cli, 'name': name, 'args': [name, '1.5', '2.5'],
+        }
+        direct = time_statement("function(1.5, 2.5)", namespace)
+        lookup = time_statement("table[name].unchecked(1.5, 2.5)", namespace)
+        resolved = time_statement("resolve(name, False)(1.5, 2.5)", namespace)
+        calculate = time_statement("calc.calculate(name, 1.5, 2.5)", namespace)
+        whole = time_statement("cli.calculate(args)", namespace)
+        print(f"{name:<10} {direct:>7.1f}ns {lookup:>7.1f}ns {resolved:>7.1f}ns "
+              f"{calculate:>8.1f}ns {whole:>7.1f}ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Throughput of the batch engines against the scalar methods.
+
+Times ``Engine.compute`` for each available engine and each operation on
+``array('d')`` operands, with clean data and with 1% special values (NaN
+operands, zero divisors, overflowing pairs), next to a loop of the
+``Calculator`` method over the same operands. Run with:
+
+    uv run python benchmarks/bench_engines.py
+    uv run python benchmarks/bench_engines.py --size 1000000
+"""
+import argparse
+import math
+import random
+import timeit
+from array import array
+
+from calculator import Calculator
+from calculator.engines import ENGINES
+
+OPERATIONS = ['add', 'subtract', 'multiply', 'divide']
+
+
+def operands(size: int, special: float) -> tuple:
+    """Float operands, a fraction ``special`` of the pairs NaN, zero divisors or huge."""
+    rng = random.Random(42)
+    a = array('d', (rng.uniform(-1e3, 1e3) for _ in range(size)))
+    b = array('d', (rng.uniform(-1e3, 1e3) for _ in range(size)))
+    for index in rng.sample(range(size), int(size * special)):
+        kind = rng.randrange(3)
+        if kind == 0:
+            a[index] = math.nan
+        elif kind == 1:
+            b[index] = 0.0
+        else:
+            a[index] = b[index] = 1e300
+    return a, b
+
+
+def scalar_loop(method, a, b) -> None:
+    """What a caller without batches writes: one method call per pair."""
+    for x, y in zip(a, b):
+        try:
+            method(x, y)
+        except (ValueError, ZeroDivisionError):
+            pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engines = [engine for engine in ENGINES.values() if engine.available()]
+    print(f"{args.size:,} elements per batch; ns/element")
+    print(f"{'operation':<10} {'data':<8} {'scalar':>8}"
+          + "".join(f" {engine.name:>8}" for engine in engines))
+    for label, special in (("clean", 0.0), ("1% spec", 0.01)):
+        a, b = operands(args.size, special)
+        for operation in OPERATIONS:
+            times = []
+            method = getattr(Calculator, operation)
+            timer = timeit.Timer(lambda: scalar_loop(method, a, b))
+            times.append(min(timer.repeat(repeat=args.repeat, number=1)))
+            for engine in engines:
+                timer = timeit.Timer(lambda: engine.compute(operation, a, b))
+                times.append(min(timer.repeat(repeat=args.repeat, number=1)))
+            print(f"{operation:<10} {label:<8}"
+                  + "".join(f" {elapsed / args.size * 1e9:>8.1f}" for elapsed in times))
+
+
+if __name__ == "__main__":
+    main()
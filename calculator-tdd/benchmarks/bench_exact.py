@@ -0,0 +1,62 @@
+"""
+Per-call cost of exact arithmetic versus the float path, by operand size.
+
+Times ``Calculator`` (float results) and ``ExactCalculator`` with the
+fraction and decimal backends on small ints, ints near 2**62, 30-digit and
+300-digit ints, and non-integer operands. Cases where the float path
+raises (ints too large for a float) are shown as "error". Run with:
+
+    uv run python benchmarks/bench_exact.py
+"""
+import timeit
+from fractions import Fraction
+
+from calculator import Calculator
+from calculator.exact import ExactCalculator
+
+OPERATIONS = ['add', 'subtract', 'multiply', 'divide']
+
+OPERANDS = {
+    'small int': (12345, 678),
+    'int ~2**62': (2**62 + 12345, 2**61 + 3),
+    '30 digits': (10**30 + 7, 10**29 + 3),
+    '300 digits': (10**300 + 7, 10**299 + 3),
+    'float': (1.5, 2.25),
+    'fraction': (Fraction(1, 3), Fraction(2, 7)),
+}
+
+CALCULATORS = {
+    'float': Calculator(),
+    'fraction': ExactCalculator('fraction'),
+    'decimal': ExactCalculator('decimal'),
+}
+
+
+def time_call(func, a, b, number: int = 100_000) -> float:
+    """Best per-call time of ``func(a, b)`` in nanoseconds, or None if it raises."""
+    try:
+        func(a, b)
+    except (TypeError, ValueError, ArithmeticError):
+        return None
+    timer = timeit.Timer('func(a, b)', globals={'func': func, 'a': a, 'b': b})
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e9
+
+
+def main() -> None:
+    header = f"{'operation':<10} {'operands':<12}" + "".join(f"{name:>12}" for name in CALCULATORS)
+    print(header)
+    for operation in OPERATIONS:
+        for label, (a, b) in OPERANDS.items():
+            line = f"{operation:<10} {label:<12}"
+            for name, calc in CALCULATORS.items():
+                if name == 'float' and isinstance(a, Fraction):
+                    # The float path only sees the fractions' float values
+                    ns = time_call(getattr(calc, operation), float(a), float(b))
+                else:
+                    ns = time_call(getattr(calc, operation), a, b)
+                line += f"{'error':>12}" if ns is None else f"{ns:>10.0f}ns"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Incremental recomputation in a million-node calculation graph.
+
+Builds a ``Graph`` of ``--columns`` inputs, each feeding a chain of
+``--depth`` nodes that also reads the next column's input (1,000 x 1,000
+by default), then times single-input updates against recomputing every
+node in order, which is what a spreadsheet without a dependency graph
+does. One update sets a divisor to zero, so errors spread down the chain
+that divides by it, as node states. Run with:
+
+    uv run python benchmarks/bench_graph.py
+    uv run python benchmarks/bench_graph.py --columns 100 --depth 10000
+"""
+import argparse
+import random
+import time
+
+from calculator import Calculator
+from calculator.graph import Graph
+
+OPERATIONS = ('add', 'subtract', 'multiply', 'divide')
+
+
+def build(columns: int, depth: int) -> tuple:
+    """Return the graph and its definitions, as (name, operation, left, right)."""
+    graph = Graph()
+    definitions = []
+    for column in range(columns):
+        graph.input(f"x{column}", 1.0 + column / columns)
+    for level in range(depth):
+        operation = OPERATIONS[level % 4]  # add, subtract, multiply, divide: stays bounded
+        for column in range(columns):
+            left = f"n{level - 1}_{column}" if level else f"x{column}"
+            definition = (f"n{level}_{column}", operation, left, f"x{(column + 1) % columns}")
+            graph.node(*definition)
+            definitions.append(definition)
+    return graph, definitions
+
+
+def recompute_all(graph: Graph, columns: int, definitions: list) -> None:
+    """Evaluate every node from the current inputs."""
+    results = {f"x{column}": graph[f"x{column}"] for column in range(columns)}
+    for name, operation, left, right in definitions:
+        try:
+            results[name] = getattr(Calculator, operation)(results[left], results[right])
+        except (TypeError, ValueError, ArithmeticError) as error:
+            results[name] = error
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--columns", type=int, default=1000)
+    parser.add_argument("--depth", type=int, default=1000)
+    parser.add_argument("--updates", type=int, default=100)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    graph, definitions = build(args.columns, args.depth)
+    print(f"{len(definitions):,} nodes built in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    recompute_all(graph, args.columns, definitions)
+    full = time.perf_counter() - start
+    print(f"{'recompute every node':<28} {full * 1e3:>10.1f}ms")
+
+    rng = random.Random(0)
+    computed = 0
+    start = time.perf_counter()
+    for _ in range(args.updates):
+        computed += graph.set(f"x{rng.randrange(args.columns)}", rng.uniform(1.0, 2.0))
+    each = (time.perf_counter() - start) / args.updates
+    print(f"{'single-input update':<28} {each * 1e3:>10.1f}ms "
+          f"({computed // args.updates:,} nodes, {full / each:,.0f}x faster)")
+
+    start = time.perf_counter()
+    computed = graph.set("x0", 0.0)
+    failed = sum(1 for _ in graph.errors())
+    print(f"{'update to a zero divisor':<28} {(time.perf_counter() - start) * 1e3:>10.1f}ms "
+          f"({computed:,} nodes, {failed:,} failing)")
+    start = time.perf_counter()
+    computed = graph.set("x0", 1.0)
+    print(f"{'update clearing the errors':<28} {(time.perf_counter() - start) * 1e3:>10.1f}ms "
+          f"({computed:,} nodes)")
+
+
+if __name__ == "__main__":
+    main()
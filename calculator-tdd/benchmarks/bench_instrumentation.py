@@ -0,0 +1,44 @@
+"""
+Cost of the opt-in instrumentation per operation call.
+
+Times ``Calculator.add`` calls on a plain calculator and on an
+``InstrumentedCalculator`` wrapping it, with valid and error-raising
+inputs. The plain calculator is never wrapped, so the first row is also
+the cost when instrumentation is off. Run with:
+
+    uv run python benchmarks/bench_instrumentation.py
+"""
+import time
+
+from calculator import Calculator
+from calculator.stats import InstrumentedCalculator
+
+CALLS = 200_000
+
+
+def per_call(method, x, y) -> float:
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        try:
+            method(x, y)
+        except ZeroDivisionError:
+            pass
+    return (time.perf_counter() - start) / CALLS
+
+
+def main() -> None:
+    plain = Calculator()
+    instrumented = InstrumentedCalculator(plain)
+    cases = [
+        ("add, plain", plain.add, 1.5, 2.5),
+        ("add, instrumented", instrumented.add, 1.5, 2.5),
+        ("divide by zero, plain", plain.divide, 1.0, 0.0),
+        ("divide by zero, instrumented", instrumented.divide, 1.0, 0.0),
+    ]
+    print(f"{CALLS:,} calls per case")
+    for name, method, x, y in cases:
+        print(f"{name:<30} {per_call(method, x, y) * 1e9:>8.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
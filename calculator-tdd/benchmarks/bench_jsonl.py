@@ -0,0 +1,85 @@
+"""
+Throughput of JSON lines mode against the plain-text stream mode.
+
+Times ``CalculatorCLI.jsonl`` on ``{"op": ..., "a": ..., "b": ...}``
+requests and ``CalculatorCLI.stream`` on the same calculations written as
+``<operation> <num1> <num2>`` lines, in-process, then both modes as a
+``python -m calculator`` process reading a file, with 1% of the requests
+dividing by zero. Run with:
+
+    uv run python benchmarks/bench_jsonl.py
+    uv run python benchmarks/bench_jsonl.py --lines 1000000
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from io import StringIO
+
+from calculator.__main__ import CalculatorCLI
+
+OPERATIONS = ['add', 'subtract', 'multiply', 'divide']
+
+
+def calls(count: int) -> list:
+    """(operation, a, b) triples, 1% of them divisions by zero."""
+    rng = random.Random(42)
+    result = []
+    for _ in range(count):
+        if rng.random() < 0.01:
+            result.append(('divide', rng.uniform(-1e3, 1e3), 0))
+        else:
+            result.append((rng.choice(OPERATIONS), rng.uniform(-1e3, 1e3), rng.randint(1, 999)))
+    return result
+
+
+def per_line(function, lines: list, repeat: int = 5) -> float:
+    """Best time per line of ``function(lines, out)``, in microseconds."""
+    timer = timeit.Timer(lambda: function(lines, StringIO()))
+    return min(timer.repeat(repeat=repeat, number=1)) / len(lines) * 1e6
+
+
+def process_rate(option: str, path: str) -> float:
+    """Lines per second of a python -m calculator process reading ``path``."""
+    with open(path, encoding='utf-8') as handle:
+        count = sum(1 for _ in handle)
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-m', 'calculator', option, path],
+                   stdout=subprocess.DEVNULL, check=True)
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=200_000)
+    args = parser.parse_args()
+
+    triples = calls(args.lines)
+    text = [f"{op} {a!r} {b}\n" for op, a, b in triples]
+    requests = [json.dumps({'op': op, 'a': a, 'b': b}) + "\n" for op, a, b in triples]
+    cli = CalculatorCLI()
+
+    print(f"{args.lines:,} calculations")
+    print(f"{'mode':<22} {'us/line':>10} {'lines/s':>12}")
+    for name, function, lines in (("stream (in-process)", cli.stream, text),
+                                  ("jsonl (in-process)", cli.jsonl, requests)):
+        micros = per_line(function, lines)
+        print(f"{name:<22} {micros:>10.2f} {1e6 / micros:>12,.0f}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, option, lines in (("stream (process)", '--stream', text),
+                                    ("jsonl (process)", '--jsonl', requests)):
+            path = os.path.join(directory, "input")
+            with open(path, 'w', encoding='utf-8') as handle:
+                handle.writelines(lines)
+            rate = process_rate(option, path)
+            print(f"{name:<22} {1e6 / rate:>10.2f} {rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
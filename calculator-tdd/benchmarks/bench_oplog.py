@@ -0,0 +1,104 @@
+"""
+Cost of the binary operation log, and replay throughput.
+
+Times ``CalculatorCLI.stream`` with and without ``--log`` (the columnar
+path logs whole runs of results at once), single ``Calculator`` calls
+with and without a ``LoggedCalculator`` around them, and ``replay`` of
+the resulting log. Run with:
+
+    uv run python benchmarks/bench_oplog.py
+    uv run python benchmarks/bench_oplog.py --lines 1000000 --max-overhead 0.05
+
+The exit status is 1 if ``stream --log`` is slower than ``stream`` by more
+than ``--max-overhead`` (default 0.08).
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import timeit
+from io import StringIO
+from typing import List, Optional
+
+from calculator import Calculator
+from calculator.__main__ import CalculatorCLI
+from calculator.oplog import LoggedCalculator, replay
+
+OPERATIONS = ['add', 'subtract', 'multiply', 'divide']
+
+
+def stream_lines(count: int) -> list:
+    """``<operation> <num1> <num2>`` lines, 1% of them divisions by zero."""
+    rng = random.Random(42)
+    lines = []
+    for _ in range(count):
+        if rng.random() < 0.01:
+            lines.append(f"divide {rng.uniform(-1e3, 1e3)!r} 0\n")
+        else:
+            lines.append(f"{rng.choice(OPERATIONS)} {rng.uniform(-1e3, 1e3)!r} "
+                         f"{rng.uniform(-1e3, 1e3)!r}\n")
+    return lines
+
+
+def stream_time(lines: list, options: list) -> float:
+    """Time per line of one stream run, in nanoseconds."""
+    cli = CalculatorCLI()
+    cli._apply_options(options)
+    start = time.perf_counter()
+    cli.stream(lines, StringIO())
+    elapsed = time.perf_counter() - start
+    if cli.operation_log is not None:
+        cli.operation_log.close()
+    return elapsed / len(lines) * 1e9
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-overhead", type=float, default=0.08,
+                        help="allowed relative cost of --log in stream mode (default 0.08)")
+    args = parser.parse_args(argv)
+
+    lines = stream_lines(args.lines)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "audit.bin")
+        plain = logged = float('inf')
+        for _ in range(args.repeat):  # Alternate, so both see the same machine load
+            plain = min(plain, stream_time(lines, []))
+            if os.path.exists(path):
+                os.unlink(path)
+            logged = min(logged, stream_time(lines, ['--log', path]))
+        print(f"{args.lines:,} stream lines")
+        print(f"{'stream':<24} {plain:>8.0f} ns/line")
+        print(f"{'stream --log':<24} {logged:>8.0f} ns/line  ({logged / plain - 1:+.1%})")
+
+        calc = Calculator()
+        wrapped = LoggedCalculator(calc, os.path.join(directory, "calls.bin"))
+        number = 200_000
+        for name, method in (("Calculator.add", calc.add),
+                             ("LoggedCalculator.add", wrapped.add)):
+            timer = timeit.Timer("add(1.5, 2.5)", globals={'add': method})
+            per_call = min(timer.repeat(repeat=args.repeat, number=number)) / number * 1e9
+            print(f"{name:<24} {per_call:>8.0f} ns/call")
+        wrapped.close()
+
+        start = time.perf_counter()
+        report = replay(path)
+        elapsed = time.perf_counter() - start
+        print(f"replay: {report['records']:,} records in {elapsed:.2f} s "
+              f"({report['records'] / elapsed:,.0f} records/s), "
+              f"{report['divergent']} divergent, log {os.path.getsize(path):,} bytes")
+
+    overhead = logged / plain - 1
+    if overhead > args.max_overhead:
+        print(f"\nstream --log costs {overhead:+.1%}, beyond {args.max_overhead:.0%}")
+        return 1
+    print(f"\nstream --log within {args.max_overhead:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
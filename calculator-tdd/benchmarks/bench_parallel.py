@@ -0,0 +1,72 @@
+"""
+Scaling of the process-pool batch executor with the number of workers.
+
+Times ``ParallelBatch.multiply_many`` on the same input for 1, 2, 4... up
+to N workers (default: the CPU count) and prints the speed-up over one
+worker, which runs in-process. Run with:
+
+    uv run python benchmarks/bench_parallel.py
+    uv run python benchmarks/bench_parallel.py --size 20000000 --numpy
+"""
+import argparse
+import os
+import time
+from array import array
+
+from calculator.parallel import DEFAULT_CHUNK_SIZE, ParallelBatch
+
+
+def worker_counts(limit: int) -> list:
+    """1, 2, 4... up to and including ``limit``."""
+    counts = []
+    count = 1
+    while count < limit:
+        counts.append(count)
+        count *= 2
+    counts.append(limit)
+    return counts
+
+
+def time_run(executor: ParallelBatch, a, b, repeat: int) -> float:
+    """Best wall-clock time of one multiply_many call, in seconds."""
+    executor.multiply_many(a, b)  # start the pool before timing
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        executor.multiply_many(a, b)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=4_000_000, help="elements per operand")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="largest worker count to try")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--numpy", action="store_true", help="use NumPy operands")
+    args = parser.parse_args()
+
+    if args.numpy:
+        import numpy as np
+
+        a = np.arange(args.size, dtype=np.float64)
+        b = np.full(args.size, 1.5)
+    else:
+        a = array("d", range(args.size))
+        b = array("d", [1.5]) * args.size
+
+    print(f"{args.size:,} elements, chunk size {args.chunk_size:,}")
+    print(f"{'workers':>8} {'seconds':>10} {'M ops/s':>10} {'speed-up':>10}")
+    single = None
+    for workers in worker_counts(args.workers):
+        with ParallelBatch(workers, args.chunk_size) as executor:
+            seconds = time_run(executor, a, b, args.repeat)
+        single = single or seconds
+        print(f"{workers:>8} {seconds:>10.3f} {args.size / seconds / 1e6:>10.1f} "
+              f"{single / seconds:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Cost of parsing stream input: per-token float() versus the parsing layer.
+
+Times, per line, the old stream-mode parsing loop (split each line, then
+``float()`` each operand inside try/except and check for NaN) against
+``calculator.parsing.parse_block``, and full stream mode on the same
+lines. Run with:
+
+    uv run python benchmarks/bench_parsing.py
+"""
+import random
+import timeit
+from io import StringIO
+
+from calculator.__main__ import CalculatorCLI
+from calculator.parsing import parse_block
+
+BLOCK = 4096
+OPERATIONS = ['add', 'subtract', 'multiply', 'divide']
+
+
+def per_token(lines):
+    """The per-line parsing done by CalculatorCLI.calculate."""
+    parsed = []
+    for line in lines:
+        args = line.split()
+        if len(args) != 3:
+            raise ValueError(f"Operation {args[0]} requires exactly 2 numbers")
+        try:
+            num1 = float(args[1])
+            num2 = float(args[2])
+        except ValueError:
+            raise ValueError("Invalid number format provided")
+        if num1 != num1 or num2 != num2:
+            raise ValueError("Cannot perform operation with NaN value")
+        parsed.append((args[0], num1, num2))
+    return parsed
+
+
+def time_per_line(func, lines, number: int = 20, repeat: int = 7) -> float:
+    """Best time per line of ``func(lines)``, in nanoseconds."""
+    timer = timeit.Timer(lambda: func(lines))
+    return min(timer.repeat(repeat=repeat, number=number)) / number / len(lines) * 1e9
+
+
+def main() -> None:
+    rng = random.Random(42)
+    lines = [f"{rng.choice(OPERATIONS)} {rng.uniform(-1e3, 1e3):.4f} {rng.randint(1, 999)}\n"
+             for _ in range(BLOCK)]
+    cli = CalculatorCLI()
+    cases = [
+        ("per-token float()", per_token),
+        ("parse_block", parse_block),
+        ("stream (full)", lambda block: cli.stream(block, StringIO())),
+    ]
+    print(f"{'case':<20} {'ns/line':>10}")
+    for name, func in cases:
+        print(f"{name:<20} {time_per_line(func, lines):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Speed and accuracy of summing a long column of values.
+
+Compares a chain of ``Calculator.add`` calls (what summing a column took
+before the reductions existed) with ``calculator.reductions.total`` on a
+list and on a generator, and with the builtin ``sum``. The error column is
+the distance from the correctly rounded sum (``math.fsum``). Run with:
+
+    uv run python benchmarks/bench_reductions.py
+"""
+import math
+import random
+import time
+
+from calculator import Calculator
+from calculator.reductions import running_total, total
+
+SIZE = 1_000_000
+
+
+def chained(values: list) -> float:
+    result = 0.0
+    add = Calculator.add
+    for value in values:
+        result = add(result, value)
+    return result
+
+
+def last_running_total(values: list) -> float:
+    result = 0.0
+    for result in running_total(values):
+        pass
+    return result
+
+
+def main() -> None:
+    rng = random.Random(42)
+    values = [rng.uniform(-1.0, 1.0) * 10.0 ** rng.randint(-8, 8) for _ in range(SIZE)]
+    exact = math.fsum(values)
+    cases = [
+        ("Calculator.add chain", lambda: chained(values)),
+        ("builtin sum", lambda: sum(values)),
+        ("total(list)", lambda: total(values)),
+        ("total(generator)", lambda: total(value for value in values)),
+        ("running_total", lambda: last_running_total(values)),
+    ]
+    print(f"{SIZE:,} values")
+    print(f"{'method':<22} {'time':>9} {'abs error':>12}")
+    for name, function in cases:
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22} {elapsed * 1e3:>7.1f}ms {abs(result - exact):>12.3g}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Scaling of the thread-pool batch executor with the number of workers.
+
+Runs ``ThreadedBatch.add_many`` and ``divide_many`` from several caller
+threads at once, as a threaded server would, for 1, 2, 4... up to N
+workers (default: the CPU count), and prints the speed-up over running
+``Calculator.*_many`` in the same caller threads. With NumPy the chunks
+release the GIL; without it, only a free-threaded build can run them in
+parallel. On a single CPU expect no speed-up, only the pool's overhead.
+Run with:
+
+    uv run python benchmarks/bench_threads.py
+    uv run python benchmarks/bench_threads.py --size 4000000 --callers 8
+"""
+import argparse
+import os
+import threading
+import time
+from array import array
+
+from calculator import Calculator
+from calculator.threads import DEFAULT_CHUNK_SIZE, ThreadedBatch
+
+
+def worker_counts(limit: int) -> list:
+    """1, 2, 4... up to and including ``limit``."""
+    counts = []
+    count = 1
+    while count < limit:
+        counts.append(count)
+        count *= 2
+    counts.append(limit)
+    return counts
+
+
+def time_callers(target, a, b, callers: int, repeat: int) -> float:
+    """Best wall-clock time for ``callers`` threads to each run add and divide."""
+    def work() -> None:
+        target.add_many(a, b)
+        target.divide_many(a, b)
+
+    best = float("inf")
+    for _ in range(repeat):
+        threads = [threading.Thread(target=work) for _ in range(callers)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1_000_000, help="elements per operand")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="largest worker count to try")
+    parser.add_argument("--callers", type=int, default=4, help="threads submitting batches")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    a = array("d", range(args.size))
+    b = array("d", [1.5]) * args.size
+    operations = 2 * args.callers * args.size
+
+    print(f"{args.callers} caller threads x (add + divide) of {args.size:,} elements, "
+          f"chunk size {args.chunk_size:,}")
+    print(f"{'executor':>12} {'seconds':>10} {'M ops/s':>10} {'speed-up':>10}")
+    baseline = time_callers(Calculator, a, b, args.callers, args.repeat)
+    print(f"{'Calculator':>12} {baseline:>10.3f} {operations / baseline / 1e6:>10.1f} "
+          f"{1:>9.2f}x")
+    for workers in worker_counts(args.workers):
+        with ThreadedBatch(workers, args.chunk_size) as executor:
+            executor.add_many(a, b)  # start the pool before timing
+            seconds = time_callers(executor, a, b, args.callers, args.repeat)
+        print(f"{f'{workers} workers':>12} {seconds:>10.3f} "
+              f"{operations / seconds / 1e6:>10.1f} {baseline / seconds:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
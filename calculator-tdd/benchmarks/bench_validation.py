@@ -0,0 +1,37 @@
+"""
+Per-call cost of the input validation in Calculator.
+
+Compares each validated ``Calculator`` method with the unchecked
+``Calculator(validate=False)`` version on float operands, as the CLI
+calls them. Run with:
+
+    uv run python benchmarks/bench_validation.py
+"""
+import timeit
+
+from calculator import Calculator
+
+OPERATIONS = ['add', 'subtract', 'multiply', 'divide']
+NUMBER = 1_000_000
+
+
+def time_call(func, a: float, b: float, number: int = NUMBER) -> float:
+    """Return the best per-call time of ``func(a, b)`` in nanoseconds."""
+    timer = timeit.Timer('func(a, b)', globals={'func': func, 'a': a, 'b': b})
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e9
+
+
+def main() -> None:
+    checked = Calculator()
+    unchecked = Calculator(validate=False)
+    baseline = time_call(lambda a, b: a, 1.5, 2.5)
+    print(f"{'operation':<10} {'checked':>10} {'unchecked':>10} {'overhead':>10}")
+    for name in OPERATIONS:
+        slow = time_call(getattr(checked, name), 1.5, 2.5)
+        quick = time_call(getattr(unchecked, name), 1.5, 2.5)
+        print(f"{name:<10} {slow:>8.1f}ns {quick:>8.1f}ns {slow - quick:>8.1f}ns")
+    print(f"(empty call baseline: {baseline:.1f}ns)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Benchmark suite for the calculator entry points.
+
+Times every ``Calculator`` method, the module-level ``add``/``subtract``/
+``multiply``/``divide`` functions, ``CalculatorCLI.calculate`` and a full
+``python -m calculator`` process, over several input distributions
+(ints, floats, huge ints near the float limit, and error-raising inputs).
+
+    uv run python benchmarks/run.py                      # print results
+    uv run python benchmarks/run.py -o baseline.json     # save results
+    uv run python benchmarks/run.py --compare baseline.json --threshold 0.10
+
+With ``--compare``, each case is checked against the saved baseline and
+the exit status is 1 if any case got slower by more than the threshold.
+"""
+import argparse
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from typing import Callable, Dict, List, Optional, Tuple
+
+import calculator
+from calculator import Calculator
+from calculator.__main__ import CalculatorCLI
+
+OPERATIONS = ['add', 'subtract', 'multiply', 'divide']
+
+# name -> (a, b) operands for each input distribution
+DISTRIBUTIONS: Dict[str, Tuple[object, object]] = {
+    'ints': (12345, 678),
+    'floats': (1.5, 2.25),
+    'huge_ints': (10**308, 10**307),
+}
+
+# operation -> (a, b) operands that make the Calculator method raise
+ERROR_INPUTS: Dict[str, Tuple[object, object]] = {
+    'add': ('5', 3),
+    'subtract': (math.nan, 1.0),
+    'multiply': (math.inf, 0.0),
+    'divide': (10, 0),
+}
+
+CALL = "func(a, b)"
+CALL_CATCHING = "try:\n    func(a, b)\nexcept Exception:\n    pass"
+
+
+def time_call(func: Callable, args: tuple, catch: bool = False,
+              number: int = 200_000, repeat: int = 5) -> float:
+    """Return the best per-call time of ``func(*args)`` in nanoseconds."""
+    stmt = CALL_CATCHING if catch else CALL
+    if len(args) == 1:
+        stmt = stmt.replace("func(a, b)", "func(a)")
+    names = {'func': func, 'a': args[0], 'b': args[-1]}
+    timer = timeit.Timer(stmt, globals=names)
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def _raises(func: Callable, args: tuple) -> bool:
+    try:
+        func(*args)
+    except Exception:
+        return True
+    return False
+
+
+def scalar_cases() -> List[Tuple[str, Callable, tuple]]:
+    """(name, function, args) for the Calculator methods and module functions."""
+    cases = []
+    for op in OPERATIONS:
+        for label, func in (('Calculator', getattr(Calculator, op)),
+                            ('function', getattr(calculator, op))):
+            for dist, args in DISTRIBUTIONS.items():
+                cases.append((f"{label}.{op}[{dist}]", func, args))
+            cases.append((f"{label}.{op}[errors]", func, ERROR_INPUTS[op]))
+    return cases
+
+
+def cli_cases() -> List[Tuple[str, Callable, tuple]]:
+    """(name, function, args) for CalculatorCLI.calculate."""
+    calculate = CalculatorCLI().calculate
+    cases = []
+    for op in OPERATIONS:
+        cases.append((f"CLI.calculate.{op}[ints]", calculate, ([op, '12345', '678'],)))
+        cases.append((f"CLI.calculate.{op}[floats]", calculate, ([op, '1.5', '2.25'],)))
+    cases.append(("CLI.calculate.divide[errors]", calculate, (['divide', '10', '0'],)))
+    cases.append(("CLI.calculate.add[errors]", calculate, (['add', 'abc', '1'],)))
+    return cases
+
+
+def time_process(runs: int = 20) -> Dict[str, float]:
+    """Wall-clock time of a full ``python -m calculator add 5 3`` process."""
+    command = [sys.executable, '-m', 'calculator', 'add', '5', '3']
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return {'ns_per_call': min(samples) * 1e9, 'median_ns': statistics.median(samples) * 1e9}
+
+
+def run_benchmarks(number: int = 200_000, repeat: int = 5, process_runs: int = 20,
+                   selected: Optional[str] = None) -> dict:
+    """Run every case (or those whose name contains ``selected``)."""
+    results: Dict[str, Dict[str, float]] = {}
+    for name, func, args in scalar_cases() + cli_cases():
+        if selected and selected not in name:
+            continue
+        catch = _raises(func, args)
+        results[name] = {'ns_per_call': time_call(func, args, catch, number, repeat)}
+    if process_runs and (not selected or selected in 'process.startup'):
+        results['process.startup'] = time_process(process_runs)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'number': number,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[Tuple[str, float, float, float]]:
+    """Return (name, baseline_ns, current_ns, change) for every regressed case.
+
+    ``change`` is the relative slowdown, e.g. 0.25 for 25% slower. Cases
+    missing from either side are ignored.
+    """
+    regressions = []
+    for name, result in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None or before['ns_per_call'] <= 0:
+            continue
+        change = result['ns_per_call'] / before['ns_per_call'] - 1.0
+        if change > threshold:
+            regressions.append((name, before['ns_per_call'], result['ns_per_call'], change))
+    return regressions
+
+
+def _format_ns(ns: float) -> str:
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f}ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.2f}us"
+    return f"{ns:.1f}ns"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('-o', '--output', help="write results as JSON to this file")
+    parser.add_argument('--compare', metavar='BASELINE', help="baseline JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="allowed relative slowdown before flagging (default 0.10)")
+    parser.add_argument('--quick', action='store_true', help="fewer iterations, noisier")
+    parser.add_argument('--filter', help="only run cases whose name contains this text")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        report = run_benchmarks(20_000, 3, 5, args.filter)
+    else:
+        report = run_benchmarks(selected=args.filter)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as handle:
+            baseline = json.load(handle)
+
+    for name, result in report['results'].items():
+        line = f"{name:<40} {_format_ns(result['ns_per_call']):>10}"
+        if baseline and name in baseline['results']:
+            before = baseline['results'][name]['ns_per_call']
+            line += f"  (baseline {_format_ns(before)}, {result['ns_per_call'] / before - 1:+.1%})"
+        print(line)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2)
+            handle.write("\n")
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for name, before, after, change in regressions:
+                print(f"  {name}: {_format_ns(before)} -> {_format_ns(after)} ({change:+.1%})")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
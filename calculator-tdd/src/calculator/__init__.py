@@ -1,150 +1,69 @@
-import math
+from . import registry
 
 
 class Calculator:
-    """A basic calculator class with arithmetic operations."""
+    """A basic calculator class with arithmetic operations.
     
+    ``Calculator(validate=False)`` gives an instance whose operations skip
+    input validation, for callers that already know both operands are
+    floats and not NaN. See ``calculator.fast``.
+    
+    NaN operands and results, zero divisors and overflow are handled as
+    described in ``calculator.engines``, the same way as by the batch
+    operations.
+    """
+
+    # Element-wise versions of the operations below, see ``calculator.batch``;
+    # errors='collect' returns a BatchResult instead of raising. The batch
+    # module is imported on first use to keep CLI startup fast.
     @staticmethod
-    def add(a: float, b: float) -> float:
-        """Add two numbers."""
-        # Validate inputs
-        if not isinstance(a, (int, float)) or not isinstance(b, (int, float)):
-            raise TypeError(f"Cannot add {type(a).__name__} and {type(b).__name__}")
-        
-        # Check for special float values
-        if math.isnan(a) or math.isnan(b):
-            raise ValueError("Cannot perform operation with NaN value")
-        
-        # Perform the calculation
-        result = a + b
-        
-        # Convert result to float, handling very large numbers gracefully
-        try:
-            return float(result)
-        except OverflowError:
-            # If the result is too large to represent as a finite float, return infinity
-            return float('inf')
-        return a + b
+    def add_many(a, b, errors='raise'):
+        """Add two sequences of numbers element-wise."""
+        from .batch import add_many
+        return add_many(a, b, errors)
     
     @staticmethod
-    def subtract(a: float, b: float) -> float:
-        """Subtract second number from first number."""
-        # Validate inputs
-        if not isinstance(a, (int, float)) or not isinstance(b, (int, float)):
-            raise TypeError(f"Cannot subtract {type(b).__name__} from {type(a).__name__}")
-        
-        # Check for special float values
-        if math.isnan(a) or math.isnan(b):
-            raise ValueError("Cannot perform operation with NaN value")
-        
-        # Perform the calculation
-        result = a - b
-        
-        # Convert result to float, handling very large numbers gracefully
-        try:
-            return float(result)
-        except OverflowError:
-            # If the result is too large to represent as a finite float, return infinity
-            return float('inf')
-        return a - b
+    def subtract_many(a, b, errors='raise'):
+        """Subtract the second sequence from the first element-wise."""
+        from .batch import subtract_many
+        return subtract_many(a, b, errors)
     
     @staticmethod
-    def multiply(a: float, b: float) -> float:
-        """Multiply two numbers."""
-        # Validate inputs
-        if not isinstance(a, (int, float)) or not isinstance(b, (int, float)):
-            raise TypeError(f"Cannot multiply {type(a).__name__} and {type(b).__name__}")
-        
-        # Check for special float values
-        if math.isnan(a) or math.isnan(b):
-            raise ValueError("Cannot perform operation with NaN value")
-        
-        # Convert inputs to float first to avoid integer overflow during operations
-        try:
-            float_a = float(a)
-            float_b = float(b)
-        except OverflowError:
-            raise OverflowError("Input value too large to convert to float")
-        
-        # Perform the calculation with floats
-        result = float_a * float_b
-        
-        # Check for NaN in result
-        if math.isnan(result):
-            raise ValueError("Result is not a number (NaN)")
-        
-        return result
-        return a * b
+    def multiply_many(a, b, errors='raise'):
+        """Multiply two sequences of numbers element-wise."""
+        from .batch import multiply_many
+        return multiply_many(a, b, errors)
     
     @staticmethod
-    def divide(a: float, b: float) -> float:
-        """Divide first number by second number."""
-        # Validate inputs
-        if not isinstance(a, (int, float)) or not isinstance(b, (int, float)):
-            raise TypeError(f"Cannot divide {type(a).__name__} by {type(b).__name__}")
-        
-        # Check for special float values
-        if math.isnan(a) or math.isnan(b):
-            raise ValueError("Cannot perform operation with NaN value")
-        
-        if b == 0:
-            raise ZeroDivisionError("Cannot divide by zero")
-        
-        # Perform the calculation
-        result = a / b
-        
-        # Convert result to float (this should typically work since division of floats returns float)
-        # But handle any edge cases
-        try:
-            return float(result)
-        except OverflowError:
-            # If the result is too large to represent as a finite float, return infinity
-            return float('inf')
-        if b == 0:
-            raise ZeroDivisionError("Cannot divide by zero")
-        return a / b
+    def divide_many(a, b, errors='raise'):
+        """Divide the first sequence by the second element-wise."""
+        from .batch import divide_many
+        return divide_many(a, b, errors)
+    
+    def __init__(self, validate: bool = True) -> None:
+        self.validate = validate
+        if not validate:
+            # Instance attributes take precedence over the static methods
+            for name in registry.BUILTINS:
+                setattr(self, name, registry.get(name).unchecked)
+    
+    def calculate(self, operation: str, *operands: float) -> float:
+        """Apply a registered operation by name, e.g. ``calculate('add', 1, 2)``."""
+        return registry.get(operation).bind(self.validate)(*operands)
+    
+    # The checked implementations in the operation table (see ``calculator.registry``)
+    add = staticmethod(registry.get('add').checked)
+    subtract = staticmethod(registry.get('subtract').checked)
+    multiply = staticmethod(registry.get('multiply').checked)
+    divide = staticmethod(registry.get('divide').checked)
 
 
 def hello() -> str:
     return "Hello from calculator!"
 
 
-def divide(a: int | float, b: int | float) -> float:
-    """Divide a by b and return the result.
-    
-    Args:
-        a: Numerator (int or float)
-        b: Denominator (int or float)
-        
-    Returns:
-        Quotient of a and b (always float)
-    """
-    return a / b
-def multiply(a: int | float, b: int | float) -> int | float:
-    """
-    Multiply two numbers and return the result.
-    
-    Args:
-        a: The first number
-        b: The second number
-        
-    Returns:
-        The product of a and b
-    """
-    return a * b
-def add(a: int | float, b: int | float) -> int | float:
-    """Add two numbers and return the result."""
-    return a + b
-
-
-def subtract(a: int | float, b: int | float) -> int | float:
-    """Subtract b from a and return the result.
-    
-    Args:
-        a: First number (int or float)
-        b: Second number (int or float)
-        
-    Returns:
-        Difference of a and b (int or float)
-    """
-    return a - b
+# The plain functions, whose results keep the operands' type
+add = registry.get('add').function
+subtract = registry.get('subtract').function
+multiply = registry.get('multiply').function
+divide = registry.get('divide').function
@@ -0,0 +1,249 @@
+"""
+asyncio front end for the calculator server.
+
+Speaks the same newline-delimited protocol as ``calculator.server`` but
+handles every connection on one event loop:
+
+- Each read from a connection (all the complete request lines it
+  contains) goes into one bounded queue shared by all connections. A
+  single worker takes everything that is queued at that moment and
+  evaluates it in one ``CalculatorCLI.stream`` pass.
+- When the shared queue holds ``max_queue`` reads, readers stop reading
+  from their sockets. The same happens when a connection has
+  ``max_pending`` unanswered reads, or when its responses are not being
+  drained (the writer waits on ``drain()``). Either way the client is
+  slowed down instead of the server buffering without limit.
+- Connections beyond ``max_connections`` get an error line and are closed,
+  and so does a connection that sends more than ``MAX_LINE`` bytes
+  without a newline.
+- As in ``calculator.server``, TCP hosts must be loopback addresses and
+  only a stale socket file is replaced at the socket path.
+- Latency from enqueue to answer is sampled per operation; the
+  ``stats`` request returns the percentiles as one JSON line.
+- A request that raises something the CLI does not report (a failing
+  registered operation, say) gets an error line; the other requests of
+  its pass are evaluated again one by one and the worker keeps running.
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import deque
+from io import StringIO
+from typing import Dict, List, Optional
+
+from .cli import CalculatorCLI, format_error
+from .registry import names
+from .server import MAX_LINE, check_host, remove_stale_socket
+
+LATENCY_SAMPLES = 10000
+READ_SIZE = 65536
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(fraction * len(sorted_values) + 0.5), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class AsyncCalculatorServer:
+    """Calculator server running on an asyncio event loop."""
+
+    def __init__(self, cli: Optional[CalculatorCLI] = None, max_connections: int = 1024,
+                 max_queue: int = 65536, max_pending: int = 1024) -> None:
+        # asyncio.Queue(0) has no limit at all
+        for name, limit in (('Connection', max_connections), ('Queue', max_queue),
+                            ('Pending', max_pending)):
+            if limit < 1:
+                raise ValueError(f"{name} limit must be at least 1")
+        self.cli = cli if cli is not None else CalculatorCLI()
+        self.max_connections = max_connections
+        self.max_queue = max_queue
+        self.max_pending = max_pending
+        self.connections = 0
+        operations = names()
+        self._latencies: Dict[str, deque] = {op: deque(maxlen=LATENCY_SAMPLES) for op in operations}
+        self._counts: Dict[str, int] = dict.fromkeys(operations, 0)
+        self._handlers: set = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._socket_path: Optional[str] = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0,
+                    socket_path: Optional[str] = None) -> None:
+        """Start listening on a Unix socket path, or on host/port over TCP."""
+        if socket_path is not None:
+            remove_stale_socket(socket_path)
+        else:
+            check_host(host)
+        self._queue: asyncio.Queue = asyncio.Queue(self.max_queue)
+        self._closed = asyncio.Event()
+        self._worker = asyncio.create_task(self._process())
+        if socket_path is not None:
+            self._socket_path = socket_path
+            self._server = await asyncio.start_unix_server(self._handle, path=socket_path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+
+    @property
+    def address(self):
+        """The bound address: a socket path or a (host, port) tuple."""
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self) -> None:
+        """Wait until the server is closed.
+
+        ``asyncio.Server.serve_forever`` is not used because, when
+        cancelled, it waits for every client to disconnect before
+        ``close()`` gets the chance to close them.
+        """
+        await self._closed.wait()
+
+    async def close(self) -> None:
+        """Stop accepting connections and stop the worker."""
+        self._closed.set()
+        self._server.close()
+        for task in list(self._handlers):
+            task.cancel()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        await self._server.wait_closed()
+        if self._socket_path is not None and os.path.exists(self._socket_path):
+            os.unlink(self._socket_path)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Return count and p50/p90/p99/max latency (seconds) per operation."""
+        report = {}
+        for op in self._counts:
+            samples = sorted(self._latencies[op])
+            report[op] = {
+                'count': self._counts[op],
+                'p50': percentile(samples, 0.50),
+                'p90': percentile(samples, 0.90),
+                'p99': percentile(samples, 0.99),
+                'max': samples[-1] if samples else 0.0,
+            }
+        return report
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if self.connections >= self.max_connections:
+            writer.write(b"Error: Too many connections\n")
+            await writer.drain()
+            writer.close()
+            return
+        self.connections += 1
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        loop = asyncio.get_running_loop()
+        pending: asyncio.Queue = asyncio.Queue(self.max_pending)
+        responder = asyncio.create_task(self._respond(pending, writer))
+        # If the client stops accepting responses, stop reading its requests
+        responder.add_done_callback(
+            lambda done: task.cancel() if not done.cancelled() and done.exception() else None)
+        partial = b""
+        try:
+            while True:
+                data = await reader.read(READ_SIZE)
+                if not data:
+                    break
+                data = partial + data
+                end = data.rfind(b"\n")
+                if end < 0:
+                    if len(data) > MAX_LINE:
+                        # Answered after the requests before it, then the connection closes
+                        future = loop.create_future()
+                        future.set_result(b"Error: Request line too long\n")
+                        await pending.put(future)
+                        break
+                    partial = data
+                    continue
+                partial = data[end + 1:]
+                lines = data[:end].decode('utf-8', errors='replace').split("\n")
+                future = loop.create_future()
+                await pending.put(future)
+                await self._queue.put((lines, future, time.perf_counter()))
+            await pending.put(None)
+            await responder
+        except ConnectionError:
+            pass
+        finally:
+            responder.cancel()
+            self._handlers.discard(task)
+            self.connections -= 1
+            writer.close()
+
+    async def _respond(self, pending: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        """Write answers in request order, draining when caught up."""
+        while True:
+            future = await pending.get()
+            if future is None:
+                break
+            writer.write(await future)
+            if pending.empty():
+                await writer.drain()
+
+    def _answer(self, lines: List[str]) -> List[str]:
+        """Evaluate lines in one stream pass; isolate the failing line if that raises."""
+        out = StringIO()
+        try:
+            self.cli.stream(lines, out)
+        except Exception:
+            answers = []
+            for line in lines:
+                out = StringIO()
+                try:
+                    self.cli.stream([line], out)
+                except Exception as error:
+                    answers.append(format_error(error))
+                else:
+                    answers.append(out.getvalue().rstrip("\n"))
+            return answers
+        return out.getvalue().split("\n")
+
+    async def _process(self) -> None:
+        """Evaluate everything queued so far in one pass, then repeat."""
+        queue = self._queue
+        latencies = self._latencies
+        counts = self._counts
+        while True:
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            lines = [line for item in batch for line in item[0]]
+            responses = self._answer(lines)
+            now = time.perf_counter()
+            start = 0
+            for item_lines, future, started in batch:
+                stop = start + len(item_lines)
+                answers = responses[start:stop]
+                elapsed = now - started
+                for index, line in enumerate(item_lines):
+                    parts = line.split(None, 1)
+                    op = parts[0] if parts else ''
+                    if op in counts:
+                        counts[op] += 1
+                        latencies[op].append(elapsed)
+                    elif op == 'stats' and len(parts) == 1:
+                        answers[index] = json.dumps(self.stats())
+                answers.append("")
+                if not future.done():
+                    future.set_result("\n".join(answers).encode('utf-8'))
+                start = stop
+
+
+async def serve(host: str = '127.0.0.1', port: int = 0, socket_path: Optional[str] = None,
+                cli: Optional[CalculatorCLI] = None, **limits: int) -> None:
+    """Run an asyncio calculator server until cancelled."""
+    server = AsyncCalculatorServer(cli, **limits)
+    await server.start(host=host, port=port, socket_path=socket_path)
+    print(f"Serving on {server.address}", file=sys.stderr, flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
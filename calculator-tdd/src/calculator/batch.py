@@ -0,0 +1,323 @@
+"""
+Batch arithmetic over sequences of operands.
+
+The ``*_many`` functions apply one of the ``Calculator`` operations element
+by element and return the results as a buffer: an ``array('d')`` for plain
+Python sequences, ``array.array`` and ``memoryview`` inputs, or a float64
+``numpy.ndarray`` when either operand is a NumPy array. ``apply_many`` does
+the same for any registered two-operand operation (see
+``calculator.registry``); operations without a C-level kernel run through
+their checked implementation element by element.
+
+Validation follows the scalar methods exactly. Operands that convert to
+float64 without changing any result (floats, and ints up to 2**53) are
+computed a whole batch at a time by an engine, pure Python or NumPy (see
+``calculator.engines``), which applies the special-value policy to every
+element at once; ints reach the engine as ints, so ``0 * -1`` is ``0.0``
+there as it is for the scalar method. Other operands, and registered
+operations, run through the scalar method element by element. Either
+way, the first offending element raises the same exception it would
+raise on its own, with its position appended to the message and stored
+on the exception as ``index``.
+
+With ``errors='collect'`` a batch never stops: the result is a
+``BatchResult`` holding the values in an ``array('d')`` and one
+``ErrorCode`` byte per element, about 9 bytes per element, and an
+element's exception is only built when it is asked for.
+"""
+import math
+from array import array
+
+from .engines import ErrorCode, _is_ndarray, engine_for, first_failure
+from .registry import BUILTINS, OPERATIONS, get
+
+_NUMERIC_TYPES = frozenset((int, float, bool))
+_EXACT_TYPECODES = frozenset("bBhHiIfd")  # Every value converts to float64 exactly
+_WIDE_TYPECODES = frozenset("lLqQ")  # Integers that may not
+_CAUGHT = (TypeError, ValueError, ArithmeticError)
+_LARGEST_EXACT = 2 ** 53  # Every int up to this size is exactly a float
+
+
+# The exceptions that codes stand for, when their message is always the same
+_EXCEPTIONS = {
+    ErrorCode.NAN_INPUT: (ValueError, "Cannot perform operation with NaN value"),
+    ErrorCode.ZERO_DIVISION: (ZeroDivisionError, "Cannot divide by zero"),
+    ErrorCode.NAN_RESULT: (ValueError, "Result is not a number (NaN)"),
+    ErrorCode.INPUT_OVERFLOW: (OverflowError, "int too large to convert to float"),
+}
+_CODES = {exception: code for code, exception in _EXCEPTIONS.items()}
+
+
+def _at_index(error: BaseException, index: int) -> BaseException:
+    """Return a copy of ``error`` that reports the failing ``index``."""
+    located = type(error)(f"{error} (at index {index})")
+    located.index = index
+    return located
+
+
+def _replay(operation: str, x, y, index: int) -> None:
+    """Raise the scalar method's error for ``x`` and ``y``, located at ``index``."""
+    try:
+        OPERATIONS[operation].checked(x, y)
+    except _CAUGHT as error:
+        raise _at_index(error, index) from None
+
+
+def _exact_ints(low, high) -> bool:
+    return -_LARGEST_EXACT <= low and high <= _LARGEST_EXACT
+
+
+def _float64(values):
+    """Return ``values`` in a form an engine takes, or None if converting could change a result.
+
+    That is anything but floats and ints up to 2**53: other types and
+    larger ints follow the scalar rules instead (TypeError, exact int
+    arithmetic, OverflowError).
+    """
+    if _is_ndarray(values):
+        kind = values.dtype.kind
+        if kind == "f" or (kind in "biu" and (values.dtype.itemsize < 8 or not len(values)
+                                               or _exact_ints(int(values.min()),
+                                                              int(values.max())))):
+            return values
+        return None
+    if isinstance(values, (array, memoryview)):
+        typecode = values.typecode if isinstance(values, array) else values.format
+        if typecode in _EXACT_TYPECODES:
+            return values
+        if typecode in _WIDE_TYPECODES and (not len(values)
+                                            or _exact_ints(min(values), max(values))):
+            return values
+        return None
+    types = set(map(type, values))
+    if types <= {float}:
+        return values
+    if types <= _NUMERIC_TYPES and all(-_LARGEST_EXACT <= value <= _LARGEST_EXACT
+                                       for value in values if type(value) is not float):
+        return values
+    return None
+
+
+def _engine_operands(operation: str, a, b):
+    """Return ``(engine, a, b)`` to compute a batch with, or None for the scalar path."""
+    if operation not in BUILTINS:
+        return None
+    fa = _float64(a)
+    fb = _float64(b) if fa is not None else None
+    if fb is None:
+        return None
+    return engine_for(_is_ndarray(a) or _is_ndarray(b)), fa, fb
+
+
+def _as_result(values, ndarray: bool):
+    """Return engine results as a NumPy array or an ``array('d')``, as the operands ask."""
+    if ndarray == _is_ndarray(values):
+        return values
+    if ndarray:
+        import numpy as np
+
+        return np.frombuffer(values, dtype=np.float64)
+    result = array("d")
+    result.frombytes(memoryview(values).cast("B"))
+    return result
+
+
+def _evaluate_each(operation: str, a, b) -> array:
+    """Apply the scalar method element by element, locating the first error."""
+    method = OPERATIONS[operation].checked
+    out = array("d")
+    append = out.append
+    for index, (x, y) in enumerate(zip(a, b)):
+        try:
+            append(method(x, y))
+        except _CAUGHT as error:
+            raise _at_index(error, index) from None
+    return out
+
+
+def _evaluate(operation: str, a, b):
+    """Evaluate a batch with an engine, or the scalar method where an engine cannot."""
+    if len(a) != len(b):
+        raise ValueError(
+            f"Operand sequences must have the same length (got {len(a)} and {len(b)})"
+        )
+    found = _engine_operands(operation, a, b)
+    if found is not None:
+        engine, fa, fb = found
+        values, codes, failed = engine.compute(operation, fa, fb)
+        if failed:
+            index = first_failure(codes)
+            _replay(operation, float(fa[index]), float(fb[index]), index)
+        return _as_result(values, _is_ndarray(a) or _is_ndarray(b))
+    if _is_ndarray(a) or _is_ndarray(b):
+        a, b = _tolist(a), _tolist(b)
+    # Something needs the scalar rules (bad types, huge ints, registered
+    # operations): evaluate element by element to raise the right error.
+    return _evaluate_each(operation, a, b)
+
+
+def _tolist(values) -> list:
+    return values.tolist() if _is_ndarray(values) else list(values)
+
+
+def _code_for(error: BaseException) -> ErrorCode:
+    """Return the code that stands for a scalar method's exception."""
+    if type(error) is TypeError:
+        return ErrorCode.TYPE_ERROR
+    return _CODES.get((type(error), str(error)), ErrorCode.OTHER)
+
+
+def _is_finite(value) -> bool:
+    """Check an int or float for finiteness (ints of any size are finite)."""
+    return value - value == 0
+
+
+class BatchResult:
+    """Results of a batch operation that carried on past its errors.
+
+    ``values`` is a float64 memoryview of the results (NaN where an element
+    failed) and ``codes`` a memoryview with one ``ErrorCode`` per element.
+    Indexing returns an element's result or raises its exception, built on
+    access with ``(at index i)`` appended, as the raising batch does.
+    Slices are views on the same memory: nothing is copied.
+    """
+
+    __slots__ = ('values', 'codes', '_exceptions', '_positions')
+
+    def __init__(self, values, codes, exceptions=None, positions=None) -> None:
+        self.values = memoryview(values)
+        self.codes = memoryview(codes)
+        # Exceptions that a code cannot rebuild (TYPE_ERROR, OTHER), keyed
+        # by position in the original batch
+        self._exceptions = exceptions if exceptions is not None else {}
+        self._positions = positions if positions is not None else range(len(self.values))
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __repr__(self) -> str:
+        return f"<BatchResult: {len(self)} values, {self.failed} failed>"
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return BatchResult(self.values[index], self.codes[index], self._exceptions,
+                               self._positions[index])
+        code = self.codes[index]
+        if code and code != ErrorCode.OVERFLOW:
+            raise self.error(index)
+        return self.values[index]
+
+    def __iter__(self):
+        if not self.failed:
+            return iter(self.values)
+        return map(self.__getitem__, range(len(self)))
+
+    @property
+    def failed(self) -> int:
+        """Number of elements whose operation raised."""
+        codes = self.codes.tobytes()
+        return len(codes) - codes.count(ErrorCode.OK) - codes.count(ErrorCode.OVERFLOW)
+
+    def error(self, index: int):
+        """Return the exception of element ``index``, or None if it succeeded."""
+        index = range(len(self))[index]
+        code = ErrorCode(self.codes[index])
+        if code is ErrorCode.OK or code is ErrorCode.OVERFLOW:
+            return None
+        if code in _EXCEPTIONS:
+            exception_type, message = _EXCEPTIONS[code]
+            error = exception_type(message)
+        else:
+            error = self._exceptions[self._positions[index]]
+        return _at_index(error, index)
+
+    def errors(self):
+        """Yield ``(index, exception)`` for each element that failed."""
+        for index, code in enumerate(self.codes):
+            if code and code != ErrorCode.OVERFLOW:
+                yield index, self.error(index)
+
+    def unwrap(self) -> memoryview:
+        """Return the values, or raise the first element's exception."""
+        for _, error in self.errors():
+            raise error
+        return self.values
+
+
+def _collect_each(operation: str, a, b) -> BatchResult:
+    """Apply the scalar method element by element, recording each error."""
+    method = OPERATIONS[operation].checked
+    values = array("d")
+    append = values.append
+    codes = array("B", bytes(len(a)))
+    exceptions = {}
+    for index, (x, y) in enumerate(zip(a, b)):
+        try:
+            result = method(x, y)
+        except _CAUGHT as error:
+            code = _code_for(error)
+            codes[index] = code
+            if code not in _EXCEPTIONS:
+                exceptions[index] = error
+            append(math.nan)
+            continue
+        if result - result != 0 and result == result and _is_finite(x) and _is_finite(y):
+            codes[index] = ErrorCode.OVERFLOW
+        append(result)
+    return BatchResult(values, codes, exceptions)
+
+
+def _collect(operation: str, a, b) -> BatchResult:
+    """Evaluate a batch to a ``BatchResult``, with an engine when possible."""
+    if len(a) != len(b):
+        raise ValueError(
+            f"Operand sequences must have the same length (got {len(a)} and {len(b)})"
+        )
+    found = _engine_operands(operation, a, b)
+    if found is not None:
+        engine, fa, fb = found
+        values, codes, _ = engine.compute(operation, fa, fb)
+        return BatchResult(values, codes)
+    if _is_ndarray(a) or _is_ndarray(b):
+        a, b = _tolist(a), _tolist(b)
+    return _collect_each(operation, a, b)
+
+
+def _dispatch(operation: str, a, b, errors: str):
+    """Evaluate a batch, raising at the first error or collecting every one."""
+    if errors == "raise":
+        return _evaluate(operation, a, b)
+    if errors == "collect":
+        return _collect(operation, a, b)
+    raise ValueError(f"Unknown errors mode: {errors} (use 'raise' or 'collect')")
+
+
+def add_many(a, b, errors: str = "raise"):
+    """Add two sequences of numbers element-wise."""
+    return _dispatch("add", a, b, errors)
+
+
+def subtract_many(a, b, errors: str = "raise"):
+    """Subtract the second sequence from the first element-wise."""
+    return _dispatch("subtract", a, b, errors)
+
+
+def multiply_many(a, b, errors: str = "raise"):
+    """Multiply two sequences of numbers element-wise."""
+    return _dispatch("multiply", a, b, errors)
+
+
+def divide_many(a, b, errors: str = "raise"):
+    """Divide the first sequence by the second element-wise."""
+    return _dispatch("divide", a, b, errors)
+
+
+def apply_many(operation: str, a, b, errors: str = "raise"):
+    """Apply any registered two-operand operation element-wise.
+
+    ``errors='raise'`` stops at the first failing element and raises its
+    exception; ``errors='collect'`` returns a ``BatchResult`` instead.
+    """
+    if get(operation).arity != 2:
+        raise ValueError(f"Operation {operation} does not take two operands")
+    return _dispatch(operation, a, b, errors)
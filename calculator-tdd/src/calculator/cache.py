@@ -0,0 +1,252 @@
+"""
+Opt-in result cache for the Calculator operations.
+
+``CachedCalculator`` wraps any object with ``add``/``subtract``/
+``multiply``/``divide`` methods (a ``Calculator``, an unchecked
+``Calculator(validate=False)``...), plus any other registered two-operand
+operation the object has (see ``calculator.registry``), and remembers the result of each
+``(operation, a, b)`` call. Errors are cached too: a repeated
+``divide(x, 0)`` raises a fresh ZeroDivisionError with the same message
+without calling the operation again.
+
+Keys keep ``int`` and ``float`` apart, and ``0.0`` and ``-0.0`` apart,
+so values that compare equal but can give different results never share
+an entry. Unhashable operands bypass the cache.
+"""
+import math
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+from .registry import names
+
+# Errors the Calculator operations raise for bad input; these are cached
+CACHEABLE_ERRORS = (ValueError, ZeroDivisionError, TypeError, OverflowError)
+
+_MISSING = object()
+
+
+class _Raised:
+    """A cached exception, re-created on every hit."""
+    __slots__ = ('error_type', 'args')
+
+    def __init__(self, error: BaseException) -> None:
+        self.error_type = type(error)
+        self.args = error.args
+
+
+def _operand_key(value: object) -> tuple:
+    """Key for one operand that keeps int/float and 0.0/-0.0 apart."""
+    kind = value.__class__
+    if kind is float and value == 0.0:
+        return (kind, value, math.copysign(1.0, value))
+    return (kind, value)
+
+
+def _entry_size(key: tuple, value: object) -> int:
+    """Approximate memory held by one cache entry, in bytes."""
+    size = sys.getsizeof(key) + sys.getsizeof(value)
+    for part in key[1:]:
+        size += sys.getsizeof(part) + sys.getsizeof(part[1])
+    return size
+
+
+class _BaseCache:
+    """Counters and limits shared by the eviction policies."""
+
+    policy = ''
+
+    def __init__(self, maxsize: int = 4096, max_bytes: Optional[int] = None) -> None:
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._sizes: Dict[Hashable, int] = {}
+        self.lock = threading.Lock()
+
+    def _over_limit(self) -> bool:
+        return len(self) > self.maxsize or (
+            self.max_bytes is not None and self.bytes > self.max_bytes and len(self) > 1)
+
+    def _track(self, key: Hashable, value: object) -> None:
+        if self.max_bytes is not None:
+            size = _entry_size(key, value)
+            self._sizes[key] = size
+            self.bytes += size
+
+    def _untrack(self, key: Hashable) -> None:
+        if self.max_bytes is not None:
+            self.bytes -= self._sizes.pop(key)
+        self.evictions += 1
+
+    def stats(self) -> Dict[str, object]:
+        """Return the hit/miss/eviction counters and current size."""
+        return {
+            'policy': self.policy,
+            'entries': len(self),
+            'maxsize': self.maxsize,
+            'bytes': self.bytes if self.max_bytes is not None else None,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+class LRUCache(_BaseCache):
+    """Evicts the least recently used entry."""
+
+    policy = 'lru'
+
+    def __init__(self, maxsize: int = 4096, max_bytes: Optional[int] = None) -> None:
+        super().__init__(maxsize, max_bytes)
+        self._data: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: object = None) -> object:
+        value = self._data.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: object) -> None:
+        data = self._data
+        if key in data:
+            return
+        data[key] = value
+        self._track(key, value)
+        while self._over_limit():
+            oldest, _ = data.popitem(last=False)
+            self._untrack(oldest)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._sizes.clear()
+        self.bytes = 0
+
+
+class LFUCache(_BaseCache):
+    """Evicts the least frequently used entry (least recent among ties)."""
+
+    policy = 'lfu'
+
+    def __init__(self, maxsize: int = 4096, max_bytes: Optional[int] = None) -> None:
+        super().__init__(maxsize, max_bytes)
+        self._data: Dict[Hashable, list] = {}  # key -> [value, frequency]
+        self._buckets: Dict[int, OrderedDict] = {}  # frequency -> keys, oldest first
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: object = None) -> object:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        frequency = entry[1]
+        bucket = self._buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[frequency]
+        entry[1] = frequency + 1
+        self._buckets.setdefault(frequency + 1, OrderedDict())[key] = None
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value: object) -> None:
+        if key in self._data:
+            return
+        self._data[key] = [value, 1]
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._track(key, value)
+        while self._over_limit():
+            self._evict()
+
+    def _evict(self) -> None:
+        # The entry just inserted is the newest key with frequency 1, so
+        # take the oldest other key at frequency 1, or else the lowest one.
+        frequency = 1
+        if len(self._buckets[1]) == 1:
+            frequency = min(f for f in self._buckets if f != 1)
+        bucket = self._buckets[frequency]
+        victim = next(iter(bucket))
+        del bucket[victim]
+        if not bucket:
+            del self._buckets[frequency]
+        del self._data[victim]
+        self._untrack(victim)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._buckets.clear()
+        self._sizes.clear()
+        self.bytes = 0
+
+
+POLICIES = {'lru': LRUCache, 'lfu': LFUCache}
+
+
+class CachedCalculator:
+    """Calculator wrapper that caches results (and errors) per operand pair."""
+
+    def __init__(self, calc: Optional[object] = None, maxsize: int = 4096,
+                 policy: str = 'lru', max_bytes: Optional[int] = None) -> None:
+        if calc is None:
+            from . import Calculator
+            calc = Calculator()
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown cache policy: {policy}")
+        self.calc = calc
+        self.cache = POLICIES[policy](maxsize, max_bytes)
+        for name in names(2):
+            method = getattr(calc, name, None)
+            if method is not None:
+                setattr(self, name, self._wrap(name, method))
+
+    def _wrap(self, name: str, method):
+        cache = self.cache
+        lock = cache.lock
+
+        def cached(a, b):
+            key = (name, _operand_key(a), _operand_key(b))
+            try:
+                with lock:
+                    found = cache.get(key, _MISSING)
+            except TypeError:  # unhashable operand
+                return method(a, b)
+            if found is not _MISSING:
+                if found.__class__ is _Raised:
+                    raise found.error_type(*found.args)
+                return found
+            try:
+                result = method(a, b)
+            except CACHEABLE_ERRORS as error:
+                with lock:
+                    cache.put(key, _Raised(error))
+                raise
+            with lock:
+                cache.put(key, result)
+            return result
+
+        cached.__name__ = name
+        cached.__doc__ = method.__doc__
+        return cached
+
+    def stats(self) -> Dict[str, object]:
+        """Return the cache counters."""
+        return self.cache.stats()
+
+    def clear(self) -> None:
+        """Drop every cached entry (the counters are kept)."""
+        with self.cache.lock:
+            self.cache.clear()
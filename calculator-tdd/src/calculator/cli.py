@@ -1,34 +1,848 @@
 """
-CLI interface for the calculator.
+Command Line Interface for the calculator.
+
+Startup time matters when the CLI runs once per calculation, so this
+module only imports what a plain ``<operation> <num1> <num2>`` call needs.
+argparse, the help text and the stream/server/expression support are
+imported when they are first used.
 """
+from __future__ import annotations
+
+import os
 import sys
-import argparse
+
 from . import Calculator
+from .registry import OPERATIONS
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # Only needed by type checkers; too slow to import at startup
+    import argparse
+    from typing import (BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, TextIO,
+                        Union)
+    from .registry import Operation
+
+# Exceptions that the CLI reports as "Error: ..." lines instead of crashing
+CLI_ERRORS = (ValueError, ZeroDivisionError, TypeError, OverflowError)
+
+# Operations that take any number of operands (see calculator.reductions)
+REDUCTIONS = ('sum', 'product', 'mean')
+
+# Reductions --stream --aggregate applies to one number per line
+AGGREGATIONS = REDUCTIONS + ('running-sum',)
+
+
+def pop_option(args: List[str], name: str) -> Optional[str]:
+    """Remove ``name VALUE`` from ``args`` and return VALUE (None if absent)."""
+    if name not in args:
+        return None
+    index = args.index(name)
+    if index + 1 >= len(args):
+        raise ValueError(f"Option {name} requires a value")
+    value = args[index + 1]
+    del args[index:index + 2]
+    return value
+
+
+def format_error(error: Exception) -> str:
+    """Format a calculation error the way the CLI reports it."""
+    if isinstance(error, ZeroDivisionError):
+        if hasattr(error, 'index'):  # Raised by a batch operation
+            return f"Error: Cannot divide by zero (at index {error.index})"
+        return "Error: Cannot divide by zero"
+    if isinstance(error, TypeError):
+        return f"Error: Type error - {error}"
+    if isinstance(error, OverflowError):
+        return f"Error: Calculation overflow - {error}"
+    return f"Error: {error}"
+
+
+def read_blocks(stream: BinaryIO) -> Iterator[List[str]]:
+    """Yield the complete lines of a binary stream, one list per read.
+    
+    Unlike iterating over a text stream, this never waits for more input
+    while complete lines are at hand, so a caller can wait for the
+    response to one request before it sends the next.
+    """
+    rest = b""
+    while True:
+        chunk = stream.read1(65536)
+        if not chunk:
+            break
+        data = rest + chunk
+        end = data.rfind(b"\n") + 1
+        rest = data[end:]
+        if end:
+            yield data[:end].decode('utf-8', 'replace').split("\n")[:-1]
+    if rest:
+        yield [rest.decode('utf-8', 'replace')]
 
 
 class CalculatorCLI:
     """Command Line Interface for the calculator."""
     
-    def __init__(self):
-        self.calc = Calculator()
+    def __init__(self, calc: Optional[Calculator] = None) -> None:
+        # calculate() parses operands with float() and rejects NaN itself,
+        # so the per-call validation in Calculator would be redundant.
+        self.calc = calc if calc is not None else Calculator(validate=False)
+        # Parses operands; --exact swaps in a parser that keeps ints and decimals exact
+        self.to_number = float
+        # Set by --stats to the InstrumentedCalculator wrapping self.calc
+        self.instrumentation = None
+        # Set by --log to the LoggedCalculator wrapping self.calc
+        self.operation_log = None
+        self.stats_format = 'json'
     
-    def calculate(self, args):
+    def parse_arguments(self) -> argparse.Namespace:
+        """Parse command line arguments."""
+        import argparse
+        
+        parser = argparse.ArgumentParser(
+            description="A command line calculator"
+        )
+        parser.add_argument(
+            'operation',
+            choices=list(OPERATIONS),
+            help='Operation to perform'
+        )
+        parser.add_argument(
+            'numbers',
+            nargs='*',
+            help='Numbers to perform operation on (2 required)'
+        )
+        
+        return parser.parse_args()
+    
+    def calculate(self, args: List[str]) -> Union[float, str]:
         """Perform calculation based on provided arguments."""
-        # This method will be implemented to handle calculations
-        pass
+        if len(args) == 0:
+            # If no arguments provided, return help text
+            return self._get_help_text()
+        
+        operation = args[0]
+        
+        if operation in ['--help', '-h']:
+            return self._get_help_text()
+        
+        if operation == 'eval':
+            return self._evaluate_expression(args[1:])
+        
+        if operation in REDUCTIONS:
+            return self._reduce(operation, args[1:])
+        
+        found = OPERATIONS.get(operation)
+        arity = 2 if found is None else found.arity
+        if len(args) != arity + 1:
+            noun = "number" if arity == 1 else "numbers"
+            raise ValueError(f"Operation {operation} requires exactly {arity} {noun}")
+        
+        to_number = self.to_number
+        try:
+            if arity == 2:
+                num1 = to_number(args[1])
+                num2 = to_number(args[2])
+            else:
+                numbers = list(map(to_number, args[1:]))
+        except ValueError:
+            raise ValueError("Invalid number format provided")
+        
+        if arity == 2:
+            if num1 != num1 or num2 != num2:
+                raise ValueError("Cannot perform operation with NaN value")
+            if found is None:
+                raise ValueError(f"Unknown operation: {operation}")
+            return (getattr(self.calc, operation, None) or found.unchecked)(num1, num2)
+        if any(number != number for number in numbers):
+            raise ValueError("Cannot perform operation with NaN value")
+        return self._method(found)(*numbers)
+    
+    def _method(self, operation: Operation) -> Callable:
+        """Return ``self.calc``'s implementation of a registered operation.
+        
+        Calculators without a method of that name (an ``ExactCalculator``
+        and an operation added at runtime...) get the registry's unchecked
+        implementation, since the operands have already been parsed.
+        """
+        method = getattr(self.calc, operation.name, None)
+        return method if method is not None else operation.unchecked
+    
+    def _reduce(self, operation: str, args: List[str]) -> float:
+        """Apply ``sum``, ``product`` or ``mean`` to any number of operands."""
+        if not args:
+            raise ValueError(f"Operation {operation} requires at least 1 number")
+        try:
+            numbers = [self.to_number(arg) for arg in args]
+        except ValueError:
+            raise ValueError("Invalid number format provided")
+        if any(number != number for number in numbers):
+            raise ValueError("Cannot perform operation with NaN value")
+        if self.to_number is not float:
+            # --exact: fold with the exact calculator instead of summing floats
+            from functools import reduce
+            
+            method = self.calc.multiply if operation == 'product' else self.calc.add
+            result = reduce(method, numbers)
+            if operation == 'mean':
+                result = self.calc.divide(result, len(numbers))
+            return result
+        from .reductions import REDUCTIONS as reductions
+        
+        return reductions[operation](numbers)
+    
+    def _evaluate_expression(self, args: List[str]) -> float:
+        """Evaluate ``eval <expression> [name=value ...]`` arguments."""
+        from .expression import evaluate
+        
+        variables = {}
+        parts = []
+        for arg in args:
+            name, separator, value = arg.partition('=')
+            if not separator:
+                parts.append(arg)
+                continue
+            try:
+                variables[name.strip()] = float(value)
+            except ValueError:
+                raise ValueError("Invalid number format provided")
+        if not parts:
+            raise ValueError("Operation eval requires an expression")
+        return evaluate(" ".join(parts), variables)
+    
+    def _get_help_text(self) -> str:
+        """Return help text."""
+        from .usage import USAGE
+        
+        return USAGE
+    
+    def _format_error(self, error: Exception) -> str:
+        """Format a calculation error the way the CLI reports it."""
+        return format_error(error)
+    
+    def stream(self, lines: Iterable[str], out: Optional[TextIO] = None) -> int:
+        """Evaluate one calculation per line, writing one output line per input.
+        
+        A line that fails produces an "Error: ..." line and the stream
+        carries on. Lines are handled in blocks: a block made only of valid
+        ``<operation> <num1> <num2>`` lines is parsed and computed column by
+        column; any other block is evaluated line by line. Returns the
+        number of lines processed.
+        """
+        from itertools import islice
+        from math import nan
+        from .parsing import parse_block
+        
+        if out is None:
+            out = sys.stdout
+        calculate = self.calculate
+        format_error = self._format_error
+        methods = {name: self._method(operation)
+                   for name, operation in OPERATIONS.items() if operation.arity == 2}
+        # With --log and nothing wrapping it, columns are computed unlogged
+        # and logged a block of lines at a time
+        logged = self.calc if self.calc is self.operation_log else None
+        unlogged = dict(methods, **logged.unlogged) if logged is not None else methods
+        # Whether every block that parses can be logged, or each block must be checked
+        log_all = logged is not None and methods.keys() <= logged.unlogged.keys()
+        
+        def apply(operation: str, a: float, b: float) -> float:
+            return methods[operation](a, b)
+        
+        def apply_unlogged(operation: str, a: float, b: float) -> float:
+            return unlogged[operation](a, b)
+        
+        result_line = "Result: {}\n".format
+        buffer: List[str] = []
+        append = buffer.append
+        count = 0
+        lines = iter(lines)
+        while True:
+            block = list(islice(lines, 4096))
+            if not block:
+                break
+            count += len(block)
+            columns = parse_block(block, operations=methods) if self.to_number is float else None
+            if columns is not None:
+                size = len(block)
+                position = 0
+                bulk = log_all or (logged is not None
+                                   and set(columns[0]) <= logged.unlogged.keys())
+                # The results of the block, NaN where a line failed, for the log
+                block_results: List[float] = []
+                block_errors: Dict[int, Exception] = {}
+                while position < size:
+                    results: List[float] = []
+                    error = None
+                    try:
+                        # extend() keeps the results computed before an error
+                        results.extend(map(apply_unlogged if bulk else apply,
+                                           *(islice(column, position, None)
+                                             for column in columns)))
+                    except CLI_ERRORS as e:
+                        error = e
+                    append("".join(map(result_line, results)))
+                    position += len(results)
+                    if bulk:
+                        block_results += results
+                    if error is not None:
+                        append(format_error(error) + "\n")
+                        if bulk:
+                            block_errors[position] = error
+                            block_results.append(nan)
+                        position += 1
+                if bulk:
+                    logged.log.extend(*columns, block_results, block_errors)
+                out.write("".join(buffer))
+                buffer.clear()
+                continue
+            for line in block:
+                args = line.split()
+                if not args:
+                    append("Error: Empty input line\n")
+                    continue
+                if args == ['metrics']:  # The servers' way to export --stats
+                    append(self._metrics_line())
+                    continue
+                try:
+                    result = calculate(args)
+                    if isinstance(result, str):  # Help text would span many lines
+                        raise ValueError("Help is not available in stream mode")
+                    append(f"Result: {result}\n")
+                except CLI_ERRORS as e:
+                    append(format_error(e) + "\n")
+            out.write("".join(buffer))
+            buffer.clear()
+        out.flush()
+        return count
     
-    def run(self, args=None):
+    def aggregate(self, lines: Iterable[str], name: str,
+                  out: Optional[TextIO] = None) -> int:
+        """Reduce one number per line, writing a single "Result: ..." line.
+        
+        ``name`` is ``sum``, ``product``, ``mean`` or ``running-sum``; the
+        last writes the sum so far after every line. Lines are parsed and
+        reduced a block at a time, so the input is never held in memory.
+        The first bad line ends the stream with an "Error: ... (at index i)"
+        line, ``i`` being the 0-based line number. Returns the number of
+        lines reduced.
+        """
+        from itertools import islice
+        from .batch import _at_index
+        from .parsing import parse_number, parse_numbers
+        from .reductions import REDUCTIONS as reductions, running_total
+        
+        if name not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation: {name}")
+        if out is None:
+            out = sys.stdout
+        lines = iter(lines)
+        count = 0
+        
+        def numbers():
+            nonlocal count
+            while True:
+                block = list(islice(lines, 4096))
+                if not block:
+                    return
+                try:
+                    values = parse_numbers(block)
+                except ValueError:
+                    # Reduce the lines before the bad one, then report it
+                    for index, line in enumerate(block):
+                        try:
+                            parse_number(line)
+                        except ValueError as e:
+                            error = _at_index(e, count + index)
+                            break
+                    yield from parse_numbers(block[:index])
+                    count += index
+                    raise error
+                count += len(block)
+                yield from values
+        
+        try:
+            if name == 'running-sum':
+                result_line = "Result: {}\n".format
+                buffer: List[str] = []
+                try:
+                    for value in running_total(numbers()):
+                        buffer.append(result_line(value))
+                        if len(buffer) >= 4096:
+                            out.write("".join(buffer))
+                            buffer.clear()
+                finally:
+                    out.write("".join(buffer))
+            else:
+                out.write(f"Result: {reductions[name](numbers())}\n")
+        except CLI_ERRORS as e:
+            out.write(self._format_error(e) + "\n")
+        out.flush()
+        return count
+    
+    def jsonl(self, lines: Iterable[str], out: Optional[TextIO] = None) -> int:
+        """Evaluate one JSON request per line, writing one JSON response line per input.
+        
+        A request is an object such as ``{"op": "divide", "a": 1, "b": 0}``
+        (only ``a`` for one-operand operations). The response is
+        ``{"result": ...}``, or ``{"error": "..."}`` with the text of the
+        "Error: ..." line stream mode would write, and the stream carries
+        on. Operands reach ``calculate`` as the text they have in the
+        request, so results are those of stream mode, exact ones included.
+        Finite float and int results are JSON numbers; others (``inf``,
+        ``--exact`` fractions) are strings holding the CLI's text. Returns
+        the number of lines processed.
+        """
+        from itertools import islice
+        
+        lines = iter(lines)
+        return self._jsonl_blocks(iter(lambda: list(islice(lines, 4096)), []), out)
+    
+    def _jsonl_blocks(self, blocks: Iterable[List[str]], out: Optional[TextIO] = None) -> int:
+        """Run ``jsonl`` over blocks of lines, writing the responses after each block."""
+        import json
+        
+        if out is None:
+            out = sys.stdout
+        # Numbers keep their text: calculate parses them like CLI arguments
+        decode = json.JSONDecoder(parse_float=str, parse_int=str, parse_constant=str).raw_decode
+        encode = json.JSONEncoder().encode
+        calculate = self.calculate
+        format_error = self._format_error
+        prefix = len("Error: ")
+        
+        def request_args(line: str) -> List[str]:
+            text = line.strip(" \t\r\n")
+            if not text:
+                raise ValueError("Empty input line")
+            try:
+                request, end = decode(text)
+            except ValueError:
+                end = -1
+            if end != len(text):
+                raise ValueError("Invalid JSON request")
+            if type(request) is not dict or type(request.get('op')) is not str:
+                raise ValueError('Invalid JSON request: expected {"op": ..., "a": ..., "b": ...}')
+            args = [request['op']]
+            for key in ('a', 'b'):
+                if key in request:
+                    value = request[key]
+                    if type(value) is not str:  # true, false, null, arrays, objects
+                        raise ValueError("Invalid number format provided")
+                    args.append(value)
+            return args
+        
+        buffer: List[str] = []
+        append = buffer.append
+        count = 0
+        for block in blocks:
+            count += len(block)
+            for line in block:
+                try:
+                    result = calculate(request_args(line))
+                except CLI_ERRORS as e:
+                    append(f'{{"error": {encode(format_error(e)[prefix:])}}}\n')
+                    continue
+                if type(result) is float:
+                    if result - result == 0:  # Finite: repr() is valid JSON
+                        append(f'{{"result": {result!r}}}\n')
+                        continue
+                elif type(result) is int:
+                    append(f'{{"result": {result}}}\n')
+                    continue
+                elif isinstance(result, str):  # Help text
+                    append('{"error": "Help is not available in JSON lines mode"}\n')
+                    continue
+                # JSON has no infinity: inf and exact results keep the CLI's text
+                append(f'{{"result": {encode(str(result))}}}\n')
+            out.write("".join(buffer))
+            buffer.clear()
+            out.flush()
+        return count
+    
+    def _metrics_line(self) -> str:
+        """Return the instrumentation counters as one JSON line, or an error line."""
+        if self.instrumentation is None:
+            return "Error: Instrumentation is off (use --stats)\n"
+        from .stats import format_json
+        
+        return format_json(self.instrumentation.stats()) + "\n"
+    
+    def _write_stats(self) -> None:
+        """Write the --stats export to stderr."""
+        from .stats import FORMATS
+        
+        report = FORMATS[self.stats_format](self.instrumentation.stats())
+        sys.stderr.write(report if report.endswith("\n") else report + "\n")
+    
+    def _run_stream(self, args: List[str]) -> None:
+        """Run stream mode over a file argument or stdin."""
+        args = list(args)
+        aggregation = pop_option(args, '--aggregate')
+        if len(args) > 1:
+            raise ValueError("Stream mode takes at most one input file")
+        
+        def process(lines: Iterable[str]) -> None:
+            if aggregation is None:
+                self.stream(lines)
+            else:
+                self.aggregate(lines, aggregation)
+        
+        self._process_input(args[0] if args else '-', process)
+    
+    def _run_jsonl(self, args: List[str]) -> None:
+        """Run JSON lines mode over a file argument or stdin."""
+        if len(args) > 1:
+            raise ValueError("JSON lines mode takes at most one input file")
+        path = args[0] if args else '-'
+        if path == '-' and hasattr(sys.stdin, 'buffer'):
+            # Respond to whatever each read returns: a pipe may be a
+            # program waiting for the response to its last request
+            self._jsonl_blocks(read_blocks(sys.stdin.buffer))
+            return
+        self._process_input(path, self.jsonl)
+    
+    def _process_input(self, path: str, process: Callable) -> None:
+        """Call ``process`` with the lines of ``path`` ('-' for stdin)."""
+        if path == '-':
+            process(sys.stdin)
+            return
+        try:
+            with open(path, encoding='utf-8') as handle:
+                process(handle)
+        except OSError as e:
+            raise ValueError(f"Cannot read {path}: {e.strerror}")
+    
+    def _run_server(self, args: List[str]) -> None:
+        """Serve calculations over a local socket until interrupted."""
+        from .server import create_server, parse_address
+        
+        args = list(args)
+        use_asyncio = '--async' in args
+        if use_asyncio:
+            args.remove('--async')
+        limits = {}
+        for option in ('--max-connections', '--max-queue'):
+            value = pop_option(args, option)
+            if value is not None:
+                try:
+                    limit = int(value)
+                except ValueError:
+                    limit = 0
+                if limit < 1:
+                    raise ValueError(f"Invalid value for {option}: {value}")
+                limits[option[2:].replace('-', '_')] = limit
+        options = parse_address(args)
+        if args:
+            raise ValueError(f"Unexpected arguments: {' '.join(args)}")
+        if use_asyncio:
+            import asyncio
+            from .async_server import serve
+            try:
+                asyncio.run(serve(cli=self, **options, **limits))
+            except KeyboardInterrupt:
+                pass
+            return
+        if limits:
+            raise ValueError("--max-connections and --max-queue require --async")
+        server = create_server(cli=self, **options)
+        print(f"Serving on {server.server_address}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if options.get('socket_path'):
+                try:
+                    os.unlink(options['socket_path'])
+                except OSError:
+                    pass  # Already removed
+    
+    def _run_client(self, args: List[str]) -> None:
+        """Send one request (or stdin lines) to a running server."""
+        from .server import CalculatorClient, parse_address
+        
+        args = list(args)
+        options = parse_address(args)
+        if args[:1] == ['metrics']:
+            return self._fetch_metrics(options, args[1:])
+        try:
+            with CalculatorClient(**options) as client:
+                if args:
+                    print(client.calculate(*args))
+                else:
+                    requests = (line.rstrip("\n") for line in sys.stdin)
+                    for response in client.calculate_many(requests):
+                        print(response)
+        except OSError as e:
+            raise ValueError(f"Cannot connect to calculator server: {e}")
+    
+    def _fetch_metrics(self, options: dict, args: List[str]) -> None:
+        """Print a server's instrumentation counters as JSON or Prometheus text."""
+        import json
+        from .server import CalculatorClient
+        from .stats import FORMATS
+        
+        if len(args) > 1 or (args and args[0] not in FORMATS):
+            raise ValueError(f"Usage: client ... metrics [{'|'.join(FORMATS)}]")
+        try:
+            with CalculatorClient(**options) as client:
+                response = client.calculate('metrics')
+        except OSError as e:
+            raise ValueError(f"Cannot connect to calculator server: {e}")
+        if response.startswith("Error:") or not args or args[0] == 'json':
+            print(response)
+            return
+        print(FORMATS[args[0]](json.loads(response)['operations']), end="")
+    
+    def _run_batch(self, args: List[str]) -> None:
+        """Apply an operation to two float64 files (see ``calculator.files``)."""
+        from .files import DEFAULT_CHUNK_SIZE, evaluate_files
+        
+        args = list(args)
+        options = {name: pop_option(args, f'--{name}') for name in ('op', 'a', 'b', 'out')}
+        errors_path = pop_option(args, '--errors')
+        chunk_size = pop_option(args, '--chunk-size')
+        if args:
+            raise ValueError(f"Unexpected arguments: {' '.join(args)}")
+        if None in options.values():
+            raise ValueError("Batch mode requires --op, --a, --b and --out")
+        try:
+            chunk_size = int(chunk_size) if chunk_size is not None else DEFAULT_CHUNK_SIZE
+        except ValueError:
+            raise ValueError(f"Invalid value for --chunk-size: {chunk_size}")
+        try:
+            report = evaluate_files(options['op'], options['a'], options['b'], options['out'],
+                                    errors_path, chunk_size)
+        except OSError as e:
+            raise ValueError(f"Cannot access {e.filename}: {e.strerror}")
+        print(f"Result: {report['count']} values written to {options['out']}")
+        if errors_path:
+            counts = " ".join(f"{name}={count}" for name, count in report['errors'].items())
+            print(f"Errors: {counts}")
+    
+    def _run_csv(self, args: List[str]) -> None:
+        """Append a computed column to CSV/TSV input (see ``calculator.table``)."""
+        import time
+        from .table import calculate_columns
+        
+        args = list(args)
+        tsv = '--tsv' in args
+        if tsv:
+            args.remove('--tsv')
+        options = {
+            'operation': pop_option(args, '--op'),
+            'a': pop_option(args, '--a'),
+            'b': pop_option(args, '--b'),
+            'expression': pop_option(args, '--expr'),
+            'result_column': pop_option(args, '--result') or 'result',
+            'delimiter': pop_option(args, '--delimiter') or ('\t' if tsv else ','),
+        }
+        if len(options['delimiter']) != 1:
+            raise ValueError("The delimiter must be a single character")
+        if len(args) > 1:
+            raise ValueError(f"Unexpected arguments: {' '.join(args[1:])}")
+        path = args[0] if args else '-'
+        start = time.perf_counter()
+        try:
+            if path == '-':
+                rows = calculate_columns(sys.stdin, sys.stdout, calc=self.calc, **options)
+            else:
+                with open(path, encoding='utf-8', newline='') as handle:
+                    rows = calculate_columns(handle, sys.stdout, calc=self.calc, **options)
+        except OSError as e:
+            raise ValueError(f"Cannot read {path}: {e.strerror}")
+        elapsed = time.perf_counter() - start
+        rate = rows / elapsed if elapsed > 0 else 0.0
+        print(f"Processed {rows} rows in {elapsed:.3f}s ({rate:,.0f} rows/s)", file=sys.stderr)
+    
+    def _run_repl(self, args: List[str]) -> None:
+        """Run an interactive session on this CLI (see ``calculator.repl``)."""
+        from .repl import Session, default_history_path
+        
+        args = list(args)
+        history_path = pop_option(args, '--history')
+        if args:
+            raise ValueError(f"Unexpected arguments: {' '.join(args)}")
+        if history_path is None:
+            history_path = default_history_path()
+        Session(self, history_path or None).run()
+    
+    def _run_daemon(self, args: List[str]) -> None:
+        """Answer forwarded CLI calls until idle (see ``calculator.daemon``)."""
+        from .daemon import IDLE_TIMEOUT, create_daemon, serve, socket_path
+        
+        args = list(args)
+        path = pop_option(args, '--socket') or socket_path()
+        idle = pop_option(args, '--idle') or os.environ.get('CALCULATOR_DAEMON_IDLE')
+        if args:
+            raise ValueError(f"Unexpected arguments: {' '.join(args)}")
+        try:
+            idle = float(idle) if idle is not None else IDLE_TIMEOUT
+        except ValueError:
+            raise ValueError(f"Invalid idle timeout: {idle}")
+        try:
+            server = create_daemon(path, idle)
+        except OSError as e:
+            raise ValueError(f"Cannot listen on {path}: {e.strerror}")
+        serve(server)
+    
+    def _run_replay(self, args: List[str]) -> None:
+        """Re-evaluate an operation log and report divergences (see ``calculator.oplog``)."""
+        from .batch import _EXCEPTIONS, ErrorCode
+        from .oplog import replay
+        
+        args = list(args)
+        limit = pop_option(args, '--max-divergences')
+        if len(args) != 1:
+            raise ValueError("Replay mode requires exactly one log file")
+        try:
+            limit = int(limit) if limit is not None else 10
+        except ValueError:
+            raise ValueError(f"Invalid value for --max-divergences: {limit}")
+        
+        def outcome(code: ErrorCode, value: float) -> str:
+            if code == ErrorCode.OK:
+                return f"Result: {value}"
+            if code in _EXCEPTIONS:
+                error_type, message = _EXCEPTIONS[code]
+                return self._format_error(error_type(message))
+            return f"Error: {code.name}"
+        
+        try:
+            report = replay(args[0], limit)
+        except OSError as e:
+            raise ValueError(f"Cannot read {args[0]}: {e.strerror}")
+        for divergence in report['divergences']:
+            operands = " ".join(map(str, divergence['operands']))
+            print(f"Divergence at record {divergence['record']}: "
+                  f"{divergence['operation']} {operands}: logged {outcome(*divergence['logged'])}, "
+                  f"replayed {outcome(*divergence['replayed'])}")
+        print(f"Replayed {report['replayed']} calculations ({report['skipped']} skipped): "
+              f"{report['divergent']} divergent")
+    
+    def _apply_options(self, args: List[str]) -> List[str]:
+        """Apply options that work in every mode and return the other arguments."""
+        args = list(args)
+        exact = '--exact' in args
+        if exact:
+            args.remove('--exact')
+        precision = pop_option(args, '--precision')
+        if precision is not None and not exact:
+            raise ValueError("--precision requires --exact")
+        if exact:
+            from .exact import ExactCalculator
+            
+            try:
+                digits = int(precision) if precision is not None else None
+            except ValueError:
+                raise ValueError(f"Invalid precision: {precision}")
+            self.calc = ExactCalculator('decimal' if digits else 'fraction', digits)
+            self.to_number = self.calc.parse
+        cache_size = pop_option(args, '--cache')
+        cache_policy = pop_option(args, '--cache-policy')
+        if cache_size is not None or cache_policy is not None:
+            from .cache import CachedCalculator
+            
+            try:
+                maxsize = int(cache_size) if cache_size is not None else 4096
+            except ValueError:
+                raise ValueError(f"Invalid cache size: {cache_size}")
+            self.calc = CachedCalculator(self.calc, maxsize, cache_policy or 'lru')
+        log_path = pop_option(args, '--log')
+        if log_path is not None:
+            from .oplog import LoggedCalculator
+            
+            if exact:
+                raise ValueError("--log cannot be combined with --exact")
+            try:
+                self.operation_log = self.calc = LoggedCalculator(self.calc, log_path)
+            except OSError as e:
+                raise ValueError(f"Cannot open log {log_path}: {e.strerror}")
+        stats_format = pop_option(args, '--stats')
+        if stats_format is not None:
+            from .stats import FORMATS, InstrumentedCalculator
+            
+            if stats_format not in FORMATS:
+                raise ValueError(f"Unknown stats format: {stats_format}")
+            self.stats_format = stats_format
+            self.instrumentation = self.calc = InstrumentedCalculator(self.calc)
+        return args
+    
+    def _show_help(self) -> None:
+        """Display help information."""
+        print(self._get_help_text())
+    
+    def run(self, args: Optional[List[str]] = None) -> None:
         """Run the calculator CLI with given arguments."""
-        # This method will be implemented to run the CLI
-        pass
+        if args is None:
+            args = sys.argv[1:]
+        
+        try:
+            if '--help' in args or '-h' in args:
+                self._show_help()
+                return
+            
+            args = self._apply_options(args)
+            try:
+                self._run_mode(args)
+            finally:
+                if self.instrumentation is not None:
+                    self._write_stats()
+                if self.operation_log is not None:
+                    self.operation_log.close()
+        except CLI_ERRORS as e:
+            print(self._format_error(e))
+    
+    def _run_mode(self, args: List[str]) -> None:
+        """Run the mode named by the first argument, or a single calculation."""
+        if len(args) == 0:
+            # Show help if no arguments provided
+            self._show_help()
+            return
+        
+        if args[0] == '--stream':
+            self._run_stream(args[1:])
+            return
+        
+        if args[0] == '--jsonl':
+            self._run_jsonl(args[1:])
+            return
+        
+        if args[0] == 'serve':
+            self._run_server(args[1:])
+            return
+        
+        if args[0] == 'client':
+            self._run_client(args[1:])
+            return
+        
+        if args[0] == 'batch':
+            self._run_batch(args[1:])
+            return
+        
+        if args[0] == 'csv':
+            self._run_csv(args[1:])
+            return
+        
+        if args[0] == 'repl':
+            self._run_repl(args[1:])
+            return
+        
+        if args[0] == 'daemon':
+            self._run_daemon(args[1:])
+            return
+        
+        if args[0] == 'replay':
+            self._run_replay(args[1:])
+            return
+        
+        result = self.calculate(args)
+        if isinstance(result, str):  # Help text
+            print(result)
+        else:  # Numeric result
+            print(f"Result: {result}")
 
 
-def main():
+def main() -> None:
     """Main entry point for the calculator CLI."""
     cli = CalculatorCLI()
-    args = sys.argv[1:]  # Get command line arguments excluding script name
-    cli.run(args)
-
-
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+    cli.run()
@@ -0,0 +1,228 @@
+"""
+Background daemon for ``python -m calculator`` calls.
+
+With ``CALCULATOR_DAEMON=1`` in the environment, ``main()`` forwards its
+arguments to a daemon listening on a Unix socket instead of running them
+itself. The daemon runs each call with a fresh ``CalculatorCLI`` in a
+process where every module the call needs is already imported, and sends
+back exactly what the call printed to stdout and stderr.
+
+The first call finds no daemon: it starts one in the background and runs
+in-process. Later calls reuse the daemon, which exits after
+``CALCULATOR_DAEMON_IDLE`` seconds (default ``IDLE_TIMEOUT``) without a
+call. Calls that use stdin or files, or that run their own long-lived
+mode, always run in-process, as does any call the daemon cannot answer
+the way ``CalculatorCLI.run`` would. Output and exit status therefore do
+not depend on the daemon.
+
+Protocol, one call per connection: the client sends the package
+directory and the arguments separated by NUL bytes, then shuts down its
+side. The daemon answers ``"0"`` followed by the stdout text, a NUL byte
+and the stderr text, or ``"L"`` to have the client run the call itself.
+
+The socket lives in a directory only the user can enter: their
+``$XDG_RUNTIME_DIR``, or a ``calculator-<uid>`` directory created with
+mode 0700 in ``/tmp``. Calls are not forwarded when that directory is not
+a private directory owned by the user, nor (where the platform tells)
+when the process listening on the socket runs as another user, so no
+other user can answer or intercept the calls.
+
+The daemon is opt-in: a plain operation costs about the same with it,
+since starting the interpreter dominates; calls that import more (``sum``,
+``eval``, ``--exact``) are faster through it.
+
+Only ``os``, ``sys`` and the C ``_socket`` module are imported at module
+level: this is the path every forwarded call takes.
+"""
+import os
+import sys
+
+import _socket  # socket would import enum and selectors for nothing here
+
+# Seconds without a call after which the daemon exits
+IDLE_TIMEOUT = 300.0
+
+# Seconds a forwarded call may take before the client runs it itself
+CALL_TIMEOUT = 10.0
+
+# Arguments that make a call run in the caller's process
+LOCAL_MODES = frozenset(('--stream', '--jsonl', 'serve', 'client', 'batch', 'csv', 'repl',
+                         'daemon', 'replay', '--log'))
+
+_OK = b"0"
+_LOCAL = b"L"
+_PACKAGE = os.path.dirname(os.path.abspath(__file__))
+
+
+def socket_path() -> str:
+    """Return the daemon socket path (``$CALCULATOR_DAEMON_SOCKET`` or per user)."""
+    path = os.environ.get('CALCULATOR_DAEMON_SOCKET')
+    if path:
+        return path
+    runtime = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime:
+        return os.path.join(runtime, f"calculator-{os.getuid()}.sock")
+    return os.path.join('/tmp', f"calculator-{os.getuid()}", "daemon.sock")
+
+
+def private_directory(path: str) -> bool:
+    """Create the directory of ``path`` if needed and check that only this user can use it."""
+    import stat  # Already loaded by os
+
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    except OSError:
+        return False
+    try:
+        info = os.lstat(directory)
+    except OSError:
+        return False
+    return (stat.S_ISDIR(info.st_mode) and info.st_uid == os.getuid()
+            and not info.st_mode & 0o077)
+
+
+def _peer_is_user(sock) -> bool:
+    """Check that the process at the other end of ``sock`` runs as this user, where we can."""
+    if not hasattr(_socket, 'SO_PEERCRED'):
+        return True  # The private directory is the only check
+    credentials = sock.getsockopt(_socket.SOL_SOCKET, _socket.SO_PEERCRED, 12)
+    return int.from_bytes(credentials[4:8], sys.byteorder) == os.getuid()  # pid, uid, gid
+
+
+def forward(args: list) -> bool:
+    """Run a CLI call in the daemon and print its output.
+
+    Returns False when the caller must run the call itself, after starting
+    a daemon if none was listening.
+    """
+    if not hasattr(_socket, 'AF_UNIX') or LOCAL_MODES.intersection(args):
+        return False
+    path = socket_path()
+    if not private_directory(path):
+        return False
+    request = "\0".join([_PACKAGE, *args]).encode('utf-8', 'surrogateescape')
+    chunks = []
+    try:
+        sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+        try:
+            sock.settimeout(CALL_TIMEOUT)
+            try:
+                sock.connect(path)
+            except (FileNotFoundError, ConnectionRefusedError):
+                spawn(path)
+                return False
+            if not _peer_is_user(sock):
+                return False
+            sock.sendall(request)
+            sock.shutdown(_socket.SHUT_WR)
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        finally:
+            sock.close()
+    except OSError:
+        return False
+    response = b"".join(chunks)
+    if response[:1] != _OK:
+        return False
+    out, _, err = response[1:].decode('utf-8').partition("\0")
+    if out:
+        sys.stdout.write(out)
+    if err:
+        sys.stderr.write(err)
+    return True
+
+
+def spawn(path: str) -> None:
+    """Start a detached daemon on ``path``."""
+    import subprocess
+
+    try:
+        subprocess.Popen([sys.executable, '-m', 'calculator', 'daemon', '--socket', path],
+                         stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL, start_new_session=True)
+    except OSError:
+        pass  # No daemon: calls keep running in-process
+
+
+def _answer(request: bytes) -> bytes:
+    """Run one forwarded call and return the response."""
+    from io import StringIO
+    from .cli import CalculatorCLI
+
+    package, *args = request.decode('utf-8', 'surrogateescape').split("\0")
+    if package != _PACKAGE:  # The caller runs another copy of the package
+        return _LOCAL
+    out = StringIO()
+    err = StringIO()
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = out, err
+    try:
+        CalculatorCLI().run(args)
+    except (Exception, SystemExit):
+        # An uncaught error: the caller reproduces it, traceback and all
+        return _LOCAL
+    finally:
+        sys.stdout, sys.stderr = stdout, stderr
+    return _OK + out.getvalue().encode('utf-8') + b"\0" + err.getvalue().encode('utf-8')
+
+
+def create_daemon(path: str, idle: float = IDLE_TIMEOUT):
+    """Bind a daemon server to ``path``; run it with ``serve(server)``.
+
+    Raises ValueError unless the socket's directory is private to the user
+    (see ``private_directory``). The socket is bound under a temporary name
+    and renamed into place, so two daemons started together never fail: calls go to the one renamed
+    last, and the other exits when it has been idle for ``idle`` seconds.
+    """
+    import socketserver
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            try:
+                self.wfile.write(_answer(self.rfile.read()))
+            except ConnectionError:
+                pass  # The caller hung up, e.g. on finding it does not trust this daemon
+
+    class Server(socketserver.UnixStreamServer):
+        request_queue_size = 128  # Calls wait their turn instead of failing
+        idle_exit = False
+
+        def handle_timeout(self) -> None:
+            self.idle_exit = True
+
+    if not private_directory(path):
+        raise ValueError(f"{os.path.dirname(os.path.abspath(path))} is not a directory "
+                         "only this user can use")
+    temporary = f"{path}.{os.getpid()}"
+    if os.path.exists(temporary):
+        os.unlink(temporary)
+    mask = os.umask(0o177)  # The socket is created owner-only, not chmod'ed afterwards
+    try:
+        server = Server(temporary, Handler)
+    finally:
+        os.umask(mask)
+    os.replace(temporary, path)
+    server.timeout = idle
+    server.path = path
+    server.inode = os.stat(path).st_ino
+    return server
+
+
+def serve(server) -> None:
+    """Answer calls one at a time until the daemon has been idle long enough."""
+    try:
+        while not server.idle_exit:
+            server.handle_request()
+    finally:
+        server.server_close()
+        try:
+            if os.stat(server.path).st_ino == server.inode:  # Still ours
+                os.unlink(server.path)
+        except OSError:
+            pass
@@ -0,0 +1,318 @@
+"""
+Engines computing the built-in operations element-wise, and the
+special-value policy they share with the ``Calculator`` methods.
+
+Special-value policy. For int and float operands, ``add``, ``subtract``,
+``multiply`` and ``divide`` (the methods, the batch operations and the
+file, thread and process batch modes) check, in this order:
+
+1. NaN operand: ValueError("Cannot perform operation with NaN value")
+2. Zero divisor (0, 0.0 or -0.0): ZeroDivisionError("Cannot divide by zero")
+3. NaN result (``inf - inf``, ``inf * 0``, ``inf / inf``):
+   ValueError("Result is not a number (NaN)")
+4. A result too large for a float is infinity with the result's sign:
+   no error, but batches with ``errors='collect'`` mark it ``OVERFLOW``
+   when both operands are finite
+
+Otherwise the result is the exact result rounded to the nearest float:
+two ints are combined exactly before rounding, anything else in float64
+arithmetic. The scalar methods also raise TypeError for operands that
+are not int or float, and OverflowError("int too large to convert to
+float") for ints no float can hold.
+
+An engine applies the float64 part of the policy, rules 1 to 4, to
+whole buffers: ``compute(operation, a, b)`` takes float operands, or
+ints a float holds exactly, and returns the results (NaN where an
+element failed) and one ``ErrorCode`` byte per element. The batch
+operations only hand operands to an engine when converting them to
+float64 cannot change a result (floats, and ints up to 2**53); the
+others are evaluated by the scalar methods. Ints are handed over as
+ints: a product of two ints is exact, so a zero product is ``0.0``, never
+the ``-0.0`` that float64 multiplication gives for ``0 * -1``.
+
+    ``python``  pure Python: C-level ``map`` loops over ``array('d')``
+    ``numpy``   NumPy ufuncs and masks, which release the GIL
+
+``set_engine('python')`` or ``set_engine('numpy')`` makes every batch use
+one engine; ``set_engine('auto')``, the default, uses NumPy for NumPy
+operands and pure Python for the others. The ``CALCULATOR_ENGINE``
+environment variable sets the choice at import, including in the worker
+processes of ``calculator.parallel``; an unknown or unavailable engine
+there gives a RuntimeWarning and ``'auto'``. Results come back as a NumPy
+array for NumPy operands and as an ``array('d')`` otherwise, whichever
+engine computed them.
+"""
+import math
+import operator
+import os
+import warnings
+from abc import ABC, abstractmethod
+from array import array
+from enum import IntEnum
+from typing import Dict, Optional, Tuple
+
+
+class ErrorCode(IntEnum):
+    """Per-element outcome codes, stored one byte per element.
+
+    Each code but ``OK`` and ``OVERFLOW`` stands for one exception of the
+    scalar methods. ``OVERFLOW`` marks finite operands whose result is
+    infinite; the methods return ``inf`` there, so it is not an error.
+    """
+
+    OK = 0
+    NAN_INPUT = 1  # ValueError: Cannot perform operation with NaN value
+    ZERO_DIVISION = 2  # ZeroDivisionError: Cannot divide by zero
+    NAN_RESULT = 3  # ValueError: Result is not a number (NaN)
+    OVERFLOW = 4
+    TYPE_ERROR = 5  # TypeError: Cannot add str and int...
+    INPUT_OVERFLOW = 6  # OverflowError: int too large to convert to float
+    OTHER = 7  # Any other error raised by a registered operation
+
+
+# bytes.translate table that clears OVERFLOW codes, which are not failures
+_NOT_FAILED = bytes.maketrans(bytes([ErrorCode.OVERFLOW]), b"\0")
+
+
+def _is_ndarray(value: object) -> bool:
+    """Check for a NumPy array without importing NumPy."""
+    return type(value).__module__ == "numpy" and hasattr(value, "dtype")
+
+
+def first_failure(codes) -> Optional[int]:
+    """Return the index of the first failed element of a codes buffer, or None."""
+    data = memoryview(codes).tobytes().translate(_NOT_FAILED)
+    rest = data.lstrip(b"\0")
+    return len(data) - len(rest) if rest else None
+
+
+class Engine(ABC):
+    """Computes the built-in operations element-wise over float64 operands.
+
+    Subclasses implement ``compute`` following the special-value policy
+    above; the conformance tests in ``tests/test_engines.py`` run against
+    every engine in ``ENGINES``.
+    """
+
+    name = ""
+
+    def available(self) -> bool:
+        """Check whether the engine can run here."""
+        return True
+
+    @abstractmethod
+    def compute(self, operation: str, a, b, out=None, codes=None) -> Tuple[object, object, int]:
+        """Apply a built-in operation to two float64 buffers of the same length.
+
+        ``a`` and ``b`` are sequences of floats (or ints a float holds
+        exactly): lists, ``array('d')``, memoryviews or NumPy arrays.
+        Results are written into ``out`` and codes into ``codes`` when
+        given (writable float64 and uint8 buffers of the same length),
+        else into new buffers of the engine's own type. Returns
+        ``(out, codes, failed)``, ``failed`` being the number of elements
+        whose code is neither ``OK`` nor ``OVERFLOW``.
+        """
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name!r}>"
+
+
+_FUNCTIONS = {'add': operator.add, 'subtract': operator.sub,
+              'multiply': operator.mul, 'divide': operator.truediv}
+
+
+def _find_all(values, target) -> list:
+    """Return the positions of ``target`` in ``values``, searching at C speed."""
+    found = []
+    index = -1
+    try:
+        while True:
+            index = values.index(target, index + 1)
+            found.append(index)
+    except ValueError:
+        return found
+
+
+def _searchable(values):
+    """Return ``values`` as a list or array, which ``_find_all`` can search."""
+    if isinstance(values, (list, array)):
+        return values
+    if _is_ndarray(values):
+        return values.tolist()
+    try:
+        view = memoryview(values)
+    except TypeError:
+        return list(values)
+    if view.format == "d" and view.c_contiguous:
+        result = array("d")
+        result.frombytes(view.cast("B"))
+        return result
+    return view.tolist()
+
+
+class PythonEngine(Engine):
+    """Pure-Python engine: one ``map`` over the operands, then scans for special values.
+
+    NaN operands give NaN results and zero divisors raise, so only the
+    results are checked: the common case (no NaN, no zero divisor, no
+    infinity) costs the operation plus one ``sum``, which is finite unless
+    some result is not. Special values are then found at C speed, without
+    a Python loop over every element.
+    """
+
+    name = "python"
+
+    def compute(self, operation: str, a, b, out=None, codes=None) -> Tuple[object, object, int]:
+        function = _FUNCTIONS[operation]
+        a = _searchable(a)
+        b = _searchable(b)
+        failed: Dict[int, int] = {}
+        try:
+            values = array("d", map(function, a, b))
+        except ZeroDivisionError:
+            # Replace the failed elements' operands by ones that cannot fail
+            a = array("d", a)
+            b = array("d", b)
+            for index in _find_all(b, 0):
+                nan = a[index] != a[index]
+                failed[index] = ErrorCode.NAN_INPUT if nan else ErrorCode.ZERO_DIVISION
+                a[index] = b[index] = 1.0
+            values = array("d", map(function, a, b))
+        result_codes = array("B", bytes(len(values)))
+        if not math.isfinite(sum(values)):  # Also when a sum of finite results overflows
+            finite = bytes(map(math.isfinite, values))
+            index = finite.find(0)
+            while index >= 0:
+                x, y = a[index], b[index]
+                if values[index] != values[index]:
+                    nan = x != x or y != y
+                    failed[index] = ErrorCode.NAN_INPUT if nan else ErrorCode.NAN_RESULT
+                elif math.isfinite(x) and math.isfinite(y):
+                    result_codes[index] = ErrorCode.OVERFLOW
+                index = finite.find(0, index + 1)
+        for index, code in failed.items():
+            values[index] = math.nan
+            result_codes[index] = code
+        if out is None:
+            out = values
+        else:
+            memoryview(out).cast("B")[:] = memoryview(values).cast("B")
+        if codes is None:
+            codes = result_codes
+        else:
+            memoryview(codes).cast("B")[:] = result_codes
+        return out, codes, len(failed)
+
+
+def _int_mask(values):
+    """Return which elements of ``values`` are ints: a bool for the whole buffer, or a mask."""
+    import numpy as np
+
+    if _is_ndarray(values):
+        return values.dtype.kind in "biu"
+    if isinstance(values, array):
+        return values.typecode not in "fd"
+    if isinstance(values, memoryview):
+        return values.format not in ("f", "d")
+    return np.fromiter((type(value) is not float for value in values), dtype=bool,
+                       count=len(values))
+
+
+class NumpyEngine(Engine):
+    """NumPy engine: one ufunc call, then masks for the special values."""
+
+    name = "numpy"
+
+    def available(self) -> bool:
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def compute(self, operation: str, a, b, out=None, codes=None) -> Tuple[object, object, int]:
+        import numpy as np
+
+        ufunc = {'add': np.add, 'subtract': np.subtract,
+                 'multiply': np.multiply, 'divide': np.divide}[operation]
+        # Products of two ints are exact: their zeros are +0.0 (see the policy above)
+        ints = _int_mask(a) & _int_mask(b) if operation == 'multiply' else False
+        a = np.asarray(a, dtype=np.float64)
+        b = np.asarray(b, dtype=np.float64)
+        out = np.empty(len(a), dtype=np.float64) if out is None else out
+        codes = np.empty(len(a), dtype=np.uint8) if codes is None else codes
+        # Buffers such as array('d') or mmap views: write through NumPy views of them
+        values = out if _is_ndarray(out) else np.frombuffer(out, dtype=np.float64)
+        code_view = codes if _is_ndarray(codes) else np.frombuffer(codes, dtype=np.uint8)
+        with np.errstate(all='ignore'):
+            ufunc(a, b, out=values)
+        if ints is not False:
+            values[(values == 0) & ints] = 0.0
+        nan_input = np.isnan(a) | np.isnan(b)
+        bad = nan_input.copy()
+        zero = None
+        if operation == 'divide':
+            zero = (b == 0) & ~nan_input
+            bad |= zero
+        nan_result = np.isnan(values) & ~bad
+        bad |= nan_result
+        overflow = np.isinf(values) & np.isfinite(a) & np.isfinite(b) & ~bad
+        values[bad] = np.nan
+        code_view[:] = ErrorCode.OK
+        for code, mask in ((ErrorCode.NAN_INPUT, nan_input), (ErrorCode.ZERO_DIVISION, zero),
+                           (ErrorCode.NAN_RESULT, nan_result), (ErrorCode.OVERFLOW, overflow)):
+            if mask is not None:
+                code_view[mask] = code
+        return out, codes, int(np.count_nonzero(bad))
+
+
+ENGINES: Dict[str, Engine] = {engine.name: engine for engine in (PythonEngine(), NumpyEngine())}
+
+AUTO = "auto"
+
+_selected = AUTO
+
+
+def set_engine(name: str) -> None:
+    """Use the engine called ``name`` for every batch, or ``'auto'``."""
+    global _selected
+    if name != AUTO:
+        engine = ENGINES.get(name)
+        if engine is None:
+            raise ValueError(f"Unknown engine: {name} (use {', '.join((AUTO, *ENGINES))})")
+        if not engine.available():
+            raise ValueError(f"Engine {name} is not available (is it installed?)")
+    _selected = name
+
+
+def get_engine() -> str:
+    """Return the name set with ``set_engine``: an engine name or ``'auto'``."""
+    return _selected
+
+
+def engine_for(prefer_numpy: bool) -> Engine:
+    """Return the engine to use for a batch.
+
+    That is the engine set with ``set_engine``, or in ``'auto'`` mode the
+    NumPy engine when ``prefer_numpy`` is true (NumPy operands, say) and
+    NumPy is installed, else the pure-Python engine.
+    """
+    if _selected != AUTO:
+        return ENGINES[_selected]
+    if prefer_numpy and ENGINES["numpy"].available():
+        return ENGINES["numpy"]
+    return ENGINES["python"]
+
+
+def _select_from_environment() -> None:
+    """Apply ``CALCULATOR_ENGINE``, falling back to ``'auto'`` with a warning."""
+    name = os.environ.get("CALCULATOR_ENGINE", AUTO)
+    try:
+        set_engine(name)
+    except ValueError as error:
+        warnings.warn(f"Ignoring CALCULATOR_ENGINE: {error}; using {AUTO}", RuntimeWarning,
+                      stacklevel=2)
+        set_engine(AUTO)
+
+
+_select_from_environment()
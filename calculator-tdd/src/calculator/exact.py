@@ -0,0 +1,142 @@
+"""
+Exact arithmetic without float round-tripping.
+
+``ExactCalculator`` has the same ``add``/``subtract``/``multiply``/
+``divide`` methods as ``Calculator`` but never converts results to float:
+
+- ``int`` operands give ``int`` results for ``add``, ``subtract`` and
+  ``multiply`` however large they get (two plain ints take a fast path
+  that skips all conversion), and ``divide`` gives an ``int`` when the
+  division is exact.
+- With the default ``'fraction'`` backend every other result is a
+  ``fractions.Fraction``: ``divide(1, 3)`` is exactly ``1/3``.
+- With the ``'decimal'`` backend every other result is a
+  ``decimal.Decimal`` rounded to ``precision`` significant digits.
+
+Float operands are taken at their shortest repr, so ``0.1`` means exactly
+one tenth. NaN is rejected with the ``Calculator`` message, and infinities,
+which have no exact value, raise ValueError.
+"""
+import decimal
+from fractions import Fraction
+from typing import Optional, Union
+
+from .parsing import NAN_INPUT, _is_int
+from .registry import _type_error
+
+BACKENDS = ('fraction', 'decimal')
+
+DEFAULT_PRECISION = 50
+
+Exact = Union[int, Fraction, decimal.Decimal]
+
+_EXACT_TYPES = (int, float, Fraction, decimal.Decimal)
+
+
+class ExactCalculator:
+    """Calculator whose results are ints, Fractions or Decimals, never floats."""
+
+    def __init__(self, backend: str = 'fraction', precision: Optional[int] = None) -> None:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown exact backend: {backend}")
+        if precision is not None and backend != 'decimal':
+            raise ValueError("precision only applies to the decimal backend")
+        self.backend = backend
+        self.context = decimal.Context(prec=precision or DEFAULT_PRECISION,
+                                       Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+
+    def _convert(self, value: object) -> Exact:
+        """Convert one validated operand to the backend's exact type."""
+        if value.__class__ is float:
+            if value != value:
+                raise ValueError(NAN_INPUT)
+            if value in (float('inf'), float('-inf')):
+                raise ValueError("Infinity has no exact value")
+            # Shortest repr: 0.1 means one tenth (Decimal parses it faster than Fraction)
+            value = decimal.Decimal(repr(value))
+        elif isinstance(value, decimal.Decimal):
+            if value.is_nan():
+                raise ValueError(NAN_INPUT)
+            if value.is_infinite():
+                raise ValueError("Infinity has no exact value")
+        if self.backend == 'decimal':
+            if isinstance(value, Fraction):
+                return self.context.divide(decimal.Decimal(value.numerator),
+                                           decimal.Decimal(value.denominator))
+            return decimal.Decimal(value)
+        if isinstance(value, int):
+            return int(value)  # bool -> int
+        return Fraction(value)
+
+    def _operands(self, operation: str, a: object, b: object) -> tuple:
+        if not isinstance(a, _EXACT_TYPES) or not isinstance(b, _EXACT_TYPES):
+            raise _type_error(operation, (a, b))  # Worded as in Calculator
+        return self._convert(a), self._convert(b)
+
+    def _result(self, value: Exact) -> Exact:
+        """Normalise a result: whole Fractions become ints."""
+        if value.__class__ is Fraction and value.denominator == 1:
+            return value.numerator
+        return value
+
+    def add(self, a: Exact, b: Exact) -> Exact:
+        """Add two numbers exactly."""
+        if a.__class__ is int and b.__class__ is int:
+            return a + b
+        a, b = self._operands('add', a, b)
+        if self.backend == 'decimal':
+            return self.context.add(a, b)
+        return self._result(a + b)
+
+    def subtract(self, a: Exact, b: Exact) -> Exact:
+        """Subtract the second number from the first exactly."""
+        if a.__class__ is int and b.__class__ is int:
+            return a - b
+        a, b = self._operands('subtract', a, b)
+        if self.backend == 'decimal':
+            return self.context.subtract(a, b)
+        return self._result(a - b)
+
+    def multiply(self, a: Exact, b: Exact) -> Exact:
+        """Multiply two numbers exactly."""
+        if a.__class__ is int and b.__class__ is int:
+            return a * b
+        a, b = self._operands('multiply', a, b)
+        if self.backend == 'decimal':
+            return self.context.multiply(a, b)
+        return self._result(a * b)
+
+    def divide(self, a: Exact, b: Exact) -> Exact:
+        """Divide the first number by the second, exactly when the backend allows."""
+        if a.__class__ is int and b.__class__ is int and b:
+            quotient, remainder = divmod(a, b)
+            if not remainder:
+                return quotient
+            if self.backend == 'fraction':
+                return Fraction(a, b)
+        a, b = self._operands('divide', a, b)
+        if not b:
+            raise ZeroDivisionError("Cannot divide by zero")
+        if self.backend == 'decimal':
+            return self.context.divide(a, b)
+        return self._result(Fraction(a) / b)
+
+    def parse(self, token: str) -> Union[Exact, float]:
+        """Parse a CLI token without going through float.
+
+        Integer tokens become ints. Other tokens become the backend's type,
+        except NaN and infinity, which are returned as floats so the usual
+        checks reject them. Raises ValueError for anything else.
+        """
+        if _is_int(token):
+            return int(token)
+        try:
+            if self.backend == 'decimal':
+                value = decimal.Decimal(token)
+                if value.is_finite():
+                    return value
+            else:
+                return Fraction(token)
+        except (ValueError, decimal.InvalidOperation):
+            pass
+        return float(token)
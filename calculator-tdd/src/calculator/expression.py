@@ -0,0 +1,296 @@
+"""
+Arithmetic expressions built on the Calculator operations.
+
+An expression such as ``(a + b) * c / d`` is parsed into a small syntax
+tree, which is then compiled into a Python function that calls the
+``Calculator`` methods directly. Compiled expressions are cached by their
+source text, so evaluating the same formula with new variable values does
+not parse it again.
+
+Grammar (usual precedence, left-associative)::
+
+    expression := term (('+' | '-') term)*
+    term       := unary (('*' | '/') unary)*
+    unary      := ('+' | '-') unary | primary
+    primary    := NUMBER | NAME | '(' expression ')'
+
+Chains of operators and unary signs of any length are parsed and compiled
+without recursion; parentheses may nest up to ``MAX_DEPTH`` levels.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Union
+
+from .registry import BUILTINS, OPERATIONS
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+      | (?P<name>[A-Za-z_]\w*)
+      | (?P<op>[-+*/()])
+    )""", re.VERBOSE)
+
+# Deepest nesting of parentheses accepted, well inside the recursion limit
+MAX_DEPTH = 100
+
+_OPERATORS = {
+    '+': 'add',
+    '-': 'subtract',
+    '*': 'multiply',
+    '/': 'divide',
+}
+
+
+class Number:
+    """A numeric literal."""
+    __slots__ = ('value',)
+
+    def __init__(self, value: float) -> None:
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f"Number({self.value!r})"
+
+
+class Variable:
+    """A reference to a variable supplied at evaluation time."""
+    __slots__ = ('name',)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"Variable({self.name!r})"
+
+
+class BinaryOp:
+    """One of the four Calculator operations applied to two sub-expressions."""
+    __slots__ = ('operation', 'left', 'right')
+
+    def __init__(self, operation: str, left, right) -> None:
+        self.operation = operation
+        self.left = left
+        self.right = right
+
+    def __repr__(self) -> str:
+        return f"BinaryOp({self.operation!r}, {self.left!r}, {self.right!r})"
+
+
+class Negate:
+    """Unary minus."""
+    __slots__ = ('operand',)
+
+    def __init__(self, operand) -> None:
+        self.operand = operand
+
+    def __repr__(self) -> str:
+        return f"Negate({self.operand!r})"
+
+
+Node = Union[Number, Variable, BinaryOp, Negate]
+
+
+def _tokenize(source: str) -> list:
+    """Split an expression into (kind, text, position) tokens."""
+    tokens = []
+    position = 0
+    end = len(source.rstrip())
+    while position < end:
+        match = _TOKEN.match(source, position)
+        if match is None:
+            bad = source[position:].lstrip()[0]
+            raise ValueError(f"Invalid expression: unexpected '{bad}' in {source!r}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind), match.start(kind)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing a syntax tree."""
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.tokens = _tokenize(source)
+        self.index = 0
+        self.depth = 0
+
+    def _peek(self) -> Optional[str]:
+        if self.index < len(self.tokens):
+            return self.tokens[self.index][1]
+        return None
+
+    def _error(self) -> ValueError:
+        if self.index < len(self.tokens):
+            text = self.tokens[self.index][1]
+            return ValueError(f"Invalid expression: unexpected '{text}' in {self.source!r}")
+        return ValueError(f"Invalid expression: unexpected end of {self.source!r}")
+
+    def parse(self) -> Node:
+        if not self.tokens:
+            raise ValueError("Invalid expression: expression is empty")
+        node = self._expression()
+        if self.index != len(self.tokens):
+            raise self._error()
+        return node
+
+    def _expression(self) -> Node:
+        node = self._term()
+        while self._peek() in ('+', '-'):
+            operation = _OPERATORS[self.tokens[self.index][1]]
+            self.index += 1
+            node = BinaryOp(operation, node, self._term())
+        return node
+
+    def _term(self) -> Node:
+        node = self._unary()
+        while self._peek() in ('*', '/'):
+            operation = _OPERATORS[self.tokens[self.index][1]]
+            self.index += 1
+            node = BinaryOp(operation, node, self._unary())
+        return node
+
+    def _unary(self) -> Node:
+        negations = 0
+        while self._peek() in ('+', '-'):
+            if self._peek() == '-':
+                negations += 1
+            self.index += 1
+        node = self._primary()
+        for _ in range(negations):
+            if isinstance(node, Number):
+                node = Number(-node.value)
+            else:
+                node = Negate(node)
+        return node
+
+    def _primary(self) -> Node:
+        if self.index >= len(self.tokens):
+            raise self._error()
+        kind, text, _ = self.tokens[self.index]
+        if kind == 'number':
+            self.index += 1
+            return Number(float(text))
+        if kind == 'name':
+            self.index += 1
+            return Variable(text)
+        if text == '(':
+            if self.depth == MAX_DEPTH:
+                raise ValueError(f"Invalid expression: parentheses nested more than "
+                                 f"{MAX_DEPTH} deep in {self.source!r}")
+            self.index += 1
+            self.depth += 1
+            node = self._expression()
+            self.depth -= 1
+            if self._peek() != ')':
+                raise self._error()
+            self.index += 1
+            return node
+        raise self._error()
+
+
+def parse(source: str) -> Node:
+    """Parse an expression into a syntax tree."""
+    return _Parser(source).parse()
+
+
+class CompiledExpression:
+    """An expression compiled to a function over the Calculator operations."""
+
+    def __init__(self, source: str, tree: Node) -> None:
+        self.source = source
+        self.tree = tree
+        self.variables = frozenset(_variables(tree))
+        namespace: Dict[str, object] = {
+            f'_{name}': OPERATIONS[name].checked for name in BUILTINS
+        }
+        lines, result = _generate(tree, namespace)
+        body = "".join(f"    {line}\n" for line in lines)
+        try:
+            code = compile(f"def _expression(env):\n{body}    return {result}\n",
+                           f"<expression {source!r}>", "exec")
+        except (SyntaxError, RecursionError) as error:
+            raise ValueError(f"Invalid expression: cannot compile {source!r}: {error}") from None
+        exec(code, namespace)
+        self._function = namespace['_expression']
+
+    def evaluate(self, variables: Optional[Mapping[str, float]] = None) -> float:
+        """Evaluate the expression with the given variable values."""
+        if variables is None:
+            variables = {}
+        if self.variables:
+            missing = self.variables.difference(variables)
+            if missing:
+                raise ValueError(f"Undefined variable: {', '.join(sorted(missing))}")
+        return self._function(variables)
+
+    def __call__(self, **variables: float) -> float:
+        return self.evaluate(variables)
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.source!r})"
+
+
+def _variables(node: Node):
+    """Yield the names of the variables used in a syntax tree."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Variable):
+            yield node.name
+        elif isinstance(node, BinaryOp):
+            stack.append(node.right)
+            stack.append(node.left)
+        elif isinstance(node, Negate):
+            stack.append(node.operand)
+
+
+def _generate(tree: Node, namespace: Dict[str, object]) -> tuple:
+    """Return Python statements for a syntax tree and the name of its result.
+
+    Each operation becomes one ``tN = _op(x, y)`` line, in evaluation order
+    (left operand first), so the generated code never nests and any tree
+    depth compiles. Constants are stored in namespace.
+    """
+    lines: List[str] = []
+    values: List[str] = []
+    stack = [(tree, False)]
+    while stack:
+        node, ready = stack.pop()
+        if isinstance(node, Number):
+            name = f"_c{len(namespace)}"
+            namespace[name] = node.value
+            values.append(name)
+        elif isinstance(node, Variable):
+            values.append(f"env[{node.name!r}]")
+        elif not ready:
+            stack.append((node, True))
+            if isinstance(node, Negate):
+                stack.append((node.operand, False))
+            else:
+                stack.append((node.right, False))
+                stack.append((node.left, False))
+        else:
+            if isinstance(node, Negate):
+                call = f"_multiply(-1.0, {values.pop()})"
+            else:
+                right = values.pop()
+                call = f"_{node.operation}({values.pop()}, {right})"
+            name = f"t{len(lines)}"
+            lines.append(f"{name} = {call}")
+            values.append(name)
+    return lines, values.pop()
+
+
+@lru_cache(maxsize=256)
+def compile_expression(source: str) -> CompiledExpression:
+    """Parse and compile an expression, caching the result by source text."""
+    return CompiledExpression(source, parse(source))
+
+
+def evaluate(source: str, variables: Optional[Mapping[str, float]] = None,
+             **kwargs: float) -> float:
+    """Evaluate an expression, e.g. ``evaluate("(a + b) * 2", a=1, b=2)``."""
+    if kwargs:
+        variables = {**(variables or {}), **kwargs}
+    return compile_expression(source).evaluate(variables)
@@ -0,0 +1,22 @@
+"""
+Unchecked arithmetic for trusted float operands.
+
+These functions give the same results as the ``Calculator`` methods when
+both operands are already floats that are not NaN (for example after the
+CLI has parsed them with ``float()`` and rejected NaN), but skip the type
+and NaN checks and the ``float()`` conversion of the result.
+
+The special cases that can still arise from finite or infinite floats are
+kept, following the policy in ``calculator.engines``: float overflow
+gives infinity, division by zero raises ZeroDivisionError and a NaN
+result (``inf - inf``, ``inf * 0``, ``inf / inf``) raises ValueError.
+
+These are the ``unchecked`` implementations of the built-in operations in
+``calculator.registry``, which ``Calculator(validate=False)`` instances use.
+"""
+from .registry import get
+
+add = get('add').unchecked
+subtract = get('subtract').unchecked
+multiply = get('multiply').unchecked
+divide = get('divide').unchecked
@@ -0,0 +1,194 @@
+"""
+Batch arithmetic over memory-mapped binary operand files.
+
+``evaluate_files`` reads two raw float64 files (native byte order, no
+header), applies one of the ``Calculator`` operations element by element
+and writes the results to a float64 output file of the same length. All
+three files are memory-mapped and processed ``chunk_size`` elements at a
+time, so memory use does not grow with the file size. Results are written
+straight into the mapped output file.
+
+Without an error file, the run stops at the first element the scalar
+method rejects, raising its exception with ``(at index i)`` appended, as
+``Calculator.*_many`` does. With an error file, the run never stops: the
+error file gets one ``ErrorCode`` byte per element, and each rejected
+element's result is NaN. ``ErrorCode.OVERFLOW`` marks finite operands
+whose result is infinite; ``Calculator`` returns ``inf`` there, so the
+result is kept.
+"""
+import math
+import mmap
+import os
+from typing import Dict, Optional
+
+from .batch import _CAUGHT, ErrorCode, _collect_each, _evaluate, _replay
+from .engines import Engine, engine_for, first_failure
+from .registry import BUILTINS, get
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+_ITEMSIZE = 8  # bytes per float64
+
+
+def _map(path: str, size: int = -1) -> Optional[mmap.mmap]:
+    """Map ``path`` read-only, or create it with ``size`` bytes and map it writable.
+
+    Returns None for an empty file, which cannot be mapped.
+    """
+    if size < 0:
+        with open(path, 'rb') as handle:
+            if os.fstat(handle.fileno()).st_size == 0:
+                return None
+            return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    with open(path, 'w+b') as handle:
+        handle.truncate(size)
+        if size == 0:
+            return None
+        return mmap.mmap(handle.fileno(), size)
+
+
+def _same_file(path: str, other: str) -> bool:
+    """Check whether two paths name the same existing file."""
+    try:
+        return os.path.samefile(path, other)
+    except OSError:  # One of them does not exist yet
+        return False
+
+
+def _element_count(mapped: Optional[mmap.mmap], path: str) -> int:
+    size = len(mapped) if mapped is not None else 0
+    if size % _ITEMSIZE:
+        raise ValueError(f"{path} is not a float64 file (size {size} is not a multiple of 8)")
+    return size // _ITEMSIZE
+
+
+def _chunk_python(operation: str, a, b, out, codes, counts: Dict[str, int]) -> Optional[int]:
+    """Evaluate one chunk of memoryviews with the pure-Python batch code.
+
+    Without ``codes``, returns the index of the first rejected element (or None).
+    """
+    try:
+        out[:] = _evaluate(operation, a, b)
+    except _CAUGHT as error:
+        if codes is None:
+            return error.index
+    else:
+        if codes is None or not any(map(math.isinf, out)):
+            return None
+
+    # Slow path, only for chunks that contain an error or an infinity: the
+    # codes Calculator.*_many(errors='collect') gives
+    result = _collect_each(operation, a, b)
+    out[:] = result.values
+    found = result.codes.tobytes()
+    codes[:] = found
+    for code in set(found) - {ErrorCode.OK}:
+        name = ErrorCode(code).name
+        counts[name] = counts.get(name, 0) + found.count(code)
+    return None
+
+
+def _chunk_engine(engine: Engine, operation: str, a, b, out, codes,
+                  counts: Dict[str, int]) -> Optional[int]:
+    """Evaluate one chunk of a built-in operation with an engine, writing into ``out``.
+
+    Without ``codes``, returns the index of the first rejected element (or None).
+    """
+    _, chunk_codes, failed = engine.compute(operation, a, b, out, codes)
+    if codes is None:
+        return first_failure(chunk_codes) if failed else None
+    found = codes.tobytes()
+    for name in counts:
+        counts[name] += found.count(ErrorCode[name])
+    return None
+
+
+def _views(maps, size: int, chunk_size: int):
+    """Yield ``(start, views)`` with one float64/uint8 memoryview per map for each chunk.
+
+    The views are released before the next chunk, so the maps can be closed
+    as soon as the caller stops iterating.
+    """
+    formats = ['d'] * 3 + ['B']
+    for start in range(0, size, chunk_size):
+        stop = min(start + chunk_size, size)
+        views = []
+        try:
+            for mapped, kind in zip(maps, formats):
+                if mapped is None:
+                    views.append(None)
+                else:
+                    itemsize = 8 if kind == 'd' else 1
+                    with memoryview(mapped) as raw:
+                        views.append(raw[start * itemsize:stop * itemsize].cast(kind))
+            yield start, views
+        finally:
+            for view in views:
+                if view is not None:
+                    view.release()
+            del views
+
+
+def evaluate_files(operation: str, a_path: str, b_path: str, out_path: str,
+                   errors_path: Optional[str] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, object]:
+    """Apply ``operation`` to two float64 files, writing a float64 result file.
+
+    ``operation`` is any registered two-operand operation. The built-in
+    ones run through an engine (see ``calculator.engines``): NumPy when it
+    is installed, unless ``set_engine`` says otherwise. Returns the number
+    of elements and, when ``errors_path`` is given, the count of each error
+    code.
+    """
+    if get(operation).arity != 2:
+        raise ValueError(f"Operation {operation} does not take two operands")
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    # Engines compute the built-in operations only
+    engine = engine_for(prefer_numpy=True) if operation in BUILTINS else None
+
+    # Float64 operands can only give the codes up to OVERFLOW, and OTHER for
+    # a registered operation's own errors (counted when they occur)
+    counts = {code.name: 0 for code in ErrorCode if 0 < code <= ErrorCode.OVERFLOW}
+    failure = None
+    maps = []
+    try:
+        maps.append(_map(a_path))
+        maps.append(_map(b_path))
+        size = _element_count(maps[0], a_path)
+        other = _element_count(maps[1], b_path)
+        if other != size:
+            raise ValueError(f"Operand files must have the same length (got {size} and {other})")
+        # Mapping the output truncates it: it must not be one of the inputs
+        for path in filter(None, (out_path, errors_path)):
+            for operand in (a_path, b_path):
+                if _same_file(path, operand):
+                    raise ValueError(f"Output file {path} is also the operand file {operand}")
+        if errors_path and (os.path.realpath(errors_path) == os.path.realpath(out_path)
+                            or _same_file(errors_path, out_path)):
+            raise ValueError(f"Error file {errors_path} is also the output file")
+        maps.append(_map(out_path, size * _ITEMSIZE))
+        maps.append(_map(errors_path, size) if errors_path else None)
+
+        for start, views in _views(maps, size, chunk_size):
+            if engine is not None:
+                index = _chunk_engine(engine, operation, *views, counts)
+            else:
+                index = _chunk_python(operation, *views, counts)
+            if index is not None:
+                failure = (start + index, float(views[0][index]), float(views[1][index]))
+            if failure is not None:
+                break
+    finally:
+        for mapped in maps:
+            if mapped is not None:
+                mapped.close()
+
+    if failure is not None:
+        index, x, y = failure
+        _replay(operation, x, y, index)
+
+    report: Dict[str, object] = {'count': size}
+    if errors_path:
+        report['errors'] = counts
+    return report
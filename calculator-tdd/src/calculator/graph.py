@@ -0,0 +1,229 @@
+"""
+Dependency graph of calculations with incremental recomputation.
+
+A ``Graph`` holds named inputs and nodes, each node being a two-operand
+operation (``add``, ``divide``, any registered one) over other nodes or
+constants, like cells of a spreadsheet. Every node's result is kept.
+Changing inputs recomputes only the nodes downstream of them, each once,
+in dependency order, and stops wherever a result does not change:
+
+    graph = Graph()
+    graph.input('price', 20.0)
+    graph.input('count', 3)
+    graph.node('total', 'multiply', 'price', 'count')
+    graph.node('each', 'divide', 'total', 'count')
+    graph.set('count', 0)
+    graph.error('each')  # ZeroDivisionError('Cannot divide by zero (at node each)')
+
+Operations run their checked implementation, so results and errors are
+those of the ``Calculator`` methods. A failing node does not stop the
+graph: it keeps the error, located at the node that raised it, as its
+state, and the nodes that depend on it take the same error until an
+update clears it. ``value`` raises a node's error, ``error`` returns it.
+
+A node can only use nodes that already exist, so a graph has no cycles
+and creation order is a dependency order. Nodes are stored by number in
+flat lists, with names looked up once, to keep million-node graphs small.
+A graph is not meant to be updated from several threads at once.
+"""
+import math
+from heapq import heappop, heappush
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .registry import get
+
+_CAUGHT = (TypeError, ValueError, ArithmeticError)
+
+
+def _at_node(error: BaseException, name: str) -> BaseException:
+    """Return a copy of ``error`` that reports the failing node."""
+    located = type(error)(f"{error} (at node {name})")
+    located.node = name
+    return located
+
+
+def _fresh(error: BaseException) -> BaseException:
+    """Copy a stored error, so raising it never grows the stored traceback."""
+    copy = type(error)(*error.args)
+    copy.node = error.node
+    return copy
+
+
+def _same(old: object, new: object) -> bool:
+    """Check whether a new result can leave the dependent nodes as they are."""
+    # 0.0 and -0.0 compare equal but can give different results downstream
+    return type(old) is type(new) and old == new and (
+        new != 0 or math.copysign(1.0, old) == math.copysign(1.0, new))
+
+
+def _same_error(old: Optional[BaseException], new: BaseException) -> bool:
+    return old is new or (type(old) is type(new) and old.args == new.args)
+
+
+class Graph:
+    """Named inputs and operation nodes whose results update incrementally."""
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        # Per node number; inputs and constants have no function and operands -1
+        self._names: List[Optional[str]] = []
+        self._functions: List[Optional[Callable]] = []
+        self._left: List[int] = []
+        self._right: List[int] = []
+        self._values: List[object] = []
+        self._dependents: List[Optional[List[int]]] = []
+        # Node number -> error, for the failing nodes only
+        self._failed: Dict[int, BaseException] = {}
+
+    def __len__(self) -> int:
+        """Number of named inputs and nodes."""
+        return len(self._ids)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ids
+
+    def __getitem__(self, name: str) -> object:
+        return self.value(name)
+
+    def _add(self, name: Optional[str], function: Optional[Callable],
+             left: int, right: int, value: object) -> int:
+        number = len(self._values)
+        self._names.append(name)
+        self._functions.append(function)
+        self._left.append(left)
+        self._right.append(right)
+        self._values.append(value)
+        self._dependents.append(None)
+        if name is not None:
+            self._ids[name] = number
+        return number
+
+    def _new_name(self, name: str) -> None:
+        if not isinstance(name, str):
+            raise TypeError(f"Node names must be strings, not {type(name).__name__}")
+        if name in self._ids:
+            raise ValueError(f"Node {name} already exists")
+
+    def _operand(self, operand: object) -> int:
+        """Return the number of a node name, or of a new constant node."""
+        if isinstance(operand, str):
+            number = self._ids.get(operand)
+            if number is None:
+                raise ValueError(f"Unknown node: {operand}")
+            return number
+        return self._add(None, None, -1, -1, operand)
+
+    def input(self, name: str, value: object) -> None:
+        """Add an input node holding ``value``."""
+        self._new_name(name)
+        self._add(name, None, -1, -1, value)
+
+    def node(self, name: str, operation: str, left: object, right: object) -> None:
+        """Add a node applying ``operation`` to two node names or constants."""
+        self._new_name(name)
+        implementation = get(operation)
+        if implementation.arity != 2:
+            raise ValueError(f"Operation {operation} does not take two operands")
+        function = implementation.checked
+        left = self._operand(left)
+        right = self._operand(right)
+        number = self._add(name, function, left, right, None)
+        for operand in {left, right}:
+            dependents = self._dependents[operand]
+            if dependents is None:
+                self._dependents[operand] = [number]
+            else:
+                dependents.append(number)
+        self._compute(number)
+
+    def _compute(self, number: int) -> bool:
+        """Recompute one node; return whether its dependents must follow."""
+        failed = self._failed
+        values = self._values
+        left = self._left[number]
+        right = self._right[number]
+        old_error = failed.get(number)
+        if failed and (left in failed or right in failed):
+            error = failed[left] if left in failed else failed[right]
+        else:
+            try:
+                value = self._functions[number](values[left], values[right])
+            except _CAUGHT as e:
+                error = _at_node(e, self._names[number])
+            else:
+                if old_error is not None:
+                    del failed[number]
+                elif _same(values[number], value):
+                    return False
+                values[number] = value
+                return True
+        if _same_error(old_error, error):
+            return False
+        failed[number] = error
+        values[number] = None
+        return True
+
+    def set(self, name: str, value: object) -> int:
+        """Change one input; return the number of nodes recomputed."""
+        return self.update({name: value})
+
+    def update(self, inputs: Dict[str, object]) -> int:
+        """Change several inputs at once; return the number of nodes recomputed.
+
+        Each affected node is recomputed once, after all of its operands.
+        """
+        values = self._values
+        dependents = self._dependents
+        pending: List[int] = []
+        queued = set()
+        changes = []
+        for name, value in inputs.items():  # Check every name before changing any
+            number = self._number(name)
+            if self._functions[number] is not None:
+                raise ValueError(f"Node {name} is not an input")
+            changes.append((number, value))
+        for number, value in changes:
+            if _same(values[number], value):
+                continue
+            values[number] = value
+            for dependent in dependents[number] or ():
+                if dependent not in queued:
+                    queued.add(dependent)
+                    heappush(pending, dependent)
+        computed = 0
+        # A node's dependents all come after it, so popping the lowest
+        # number first recomputes every node after all of its operands
+        while pending:
+            number = heappop(pending)
+            computed += 1
+            if self._compute(number):
+                for dependent in dependents[number] or ():
+                    if dependent not in queued:
+                        queued.add(dependent)
+                        heappush(pending, dependent)
+        return computed
+
+    def value(self, name: str) -> object:
+        """Return a node's result, or raise its error."""
+        number = self._number(name)
+        error = self._failed.get(number)
+        if error is not None:
+            raise _fresh(error)
+        return self._values[number]
+
+    def error(self, name: str) -> Optional[BaseException]:
+        """Return a node's error, or None if it has a result."""
+        error = self._failed.get(self._number(name))
+        return _fresh(error) if error is not None else None
+
+    def errors(self) -> Iterator[Tuple[str, BaseException]]:
+        """Yield ``(name, error)`` for each failing node, in creation order."""
+        names = self._names
+        for number in sorted(self._failed):
+            yield names[number], _fresh(self._failed[number])
+
+    def _number(self, name: str) -> int:
+        number = self._ids.get(name)
+        if number is None:
+            raise ValueError(f"Unknown node: {name}")
+        return number
@@ -0,0 +1,477 @@
+"""
+Append-only binary log of calculations, and its replay.
+
+``LoggedCalculator`` wraps a calculator, like ``CachedCalculator`` and
+``InstrumentedCalculator`` do, and appends one fixed-width record per
+call of a one- or two-operand operation to an ``OperationLog``.
+``replay`` re-evaluates a log with the ``Calculator`` operations and
+reports the records whose logged outcome differs.
+
+Every record is ``RECORD_SIZE`` (32) little-endian bytes:
+
+    offset 0   op code (uint8)     0 for the special records below
+    offset 1   error code (uint8)  a ``calculator.batch.ErrorCode``
+    offset 2   flags (uint8)       ``INEXACT``: operands were not int/float
+                                   values a float64 holds, so the record
+                                   cannot be replayed
+    offset 8   a (float64)
+    offset 16  b (float64)         NaN for one-operand operations
+    offset 24  result (float64)    NaN when the call raised
+
+The built-in operations have fixed codes (``OP_CODES``). Each time a log
+is opened it appends a session record (op code 0, then ``MAGIC`` and the
+start time) followed by one definition record per other operation (op
+code 0, the code in byte 1, the UTF-8 name in bytes 8 to 31), so codes
+only have to stay the same within a session.
+
+Records are kept in memory as four floats each, the header bytes
+stored as the float64 with the same bits, and packed with one
+``struct.pack`` call per block: logging a call costs one ``list.extend``,
+and the CLI's columnar stream pass logs a whole block of lines with one
+``OperationLog.extend``. Blocks are written when ``buffer_records`` are
+pending, when a background thread wakes up every ``sync_interval``
+seconds (it also fsyncs the file, if anything was written since the last
+fsync), and on ``close()``. A crash loses at most the last interval.
+"""
+import math
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+from .batch import ErrorCode, _code_for, _dispatch
+from .registry import BUILTINS, OPERATIONS, names
+
+RECORD_SIZE = 32
+MAGIC = b"CALCLOG1"
+
+# Codes of the built-in operations; others get codes from SESSION_CODES on
+OP_CODES = {name: code for code, name in enumerate(BUILTINS, 1)}
+SESSION_CODES = 16
+
+INEXACT = 1
+
+# Operations whose results are floats for float operands
+_FLOAT_RESULTS = frozenset(BUILTINS)
+
+BUFFER_RECORDS = 4096
+SYNC_INTERVAL = 1.0
+
+_HEADER = struct.Struct("<BBB5x")
+_SPECIAL = struct.Struct("<BB6x24s")
+_SWAP = sys.byteorder == "big"  # Records read into arrays hold native doubles
+_NAN = math.nan
+_NAN_BYTES = struct.pack("<d", _NAN)
+_ZERO = array("d", [0.0])
+
+
+def _header(op: int, error: int = 0, flags: int = 0) -> float:
+    """Return a record header as the float64 whose little-endian bytes it is."""
+    return struct.unpack("<d", _HEADER.pack(op, error, flags))[0]
+
+
+@lru_cache(maxsize=8)
+def _floats(count: int) -> struct.Struct:
+    """Return the struct of ``count`` little-endian float64."""
+    return struct.Struct(f"<{count}d")
+
+
+def _as_float(value: object) -> tuple:
+    """Return (value as a float, whether that float is exactly the value)."""
+    if type(value) is float:
+        return value, True
+    if isinstance(value, int):
+        try:
+            converted = float(value)
+        except OverflowError:
+            return (math.inf if value > 0 else -math.inf), False
+        return converted, converted == value
+    try:
+        return float(value), False
+    except (TypeError, ValueError, OverflowError):
+        return _NAN, False
+
+
+class OperationLog:
+    """Buffered writer appending calculation records to a log file.
+
+    ``operations`` are the names that get codes in this session; the
+    built-in operations always have one. Use as a context manager or call
+    ``close()``, which writes the last records and fsyncs the file.
+    """
+
+    def __init__(self, path: str, operations: Sequence[str] = (),
+                 sync_interval: float = SYNC_INTERVAL,
+                 buffer_records: int = BUFFER_RECORDS) -> None:
+        self.path = path
+        self.codes: Dict[str, int] = dict(OP_CODES)
+        special = [_SPECIAL.pack(0, 0, MAGIC + struct.pack("<d", time.time()))]
+        for name in operations:
+            encoded = name.encode('utf-8')
+            code = SESSION_CODES + len(self.codes) - len(OP_CODES)
+            if name in self.codes or len(encoded) > 24 or code > 255:
+                continue  # Not logged: see LoggedCalculator
+            self.codes[name] = code
+            special.append(_SPECIAL.pack(0, code, encoded))
+        # Headers of successful calls with exact operands: just the op code
+        self._headers = {name: _header(code) for name, code in self.codes.items()}
+        # Single calls as four floats per record, packed into _buffer a
+        # block at a time, before anything else is added to it
+        self._pending: List[float] = []
+        self._buffer = bytearray()
+        # Scratch arrays of extend(), reused while blocks keep their size
+        self._column = array("d")
+        self._block = array("d")
+        self._limit = buffer_records * 4
+        self._lock = threading.Lock()
+        self._file = open(path, 'ab', buffering=0)
+        self._file.write(b"".join(special))
+        self._unsynced = True
+        self._closed = threading.Event()
+        self._syncer = threading.Thread(target=self._sync_periodically, args=(sync_interval,),
+                                        name="calculator-oplog", daemon=True)
+        self._syncer.start()
+
+    def __enter__(self) -> "OperationLog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def append(self, operation: str, operands: tuple, result: object = None,
+               error: Optional[BaseException] = None) -> None:
+        """Log one call: its result, or the error it raised."""
+        a, exact_a = _as_float(operands[0])
+        b, exact_b = _as_float(operands[1]) if len(operands) > 1 else (_NAN, True)
+        code = ErrorCode.OK if error is None else _code_for(error)
+        flags = 0 if exact_a and exact_b else INEXACT
+        if error is None:
+            result, exact = _as_float(result)
+            flags |= 0 if exact else INEXACT
+        else:
+            result = _NAN
+        self._pending.extend((_header(self.codes[operation], code, flags), a, b, result))
+        if len(self._pending) >= self._limit:
+            self.flush()
+
+    def extend(self, operations: Sequence[str], a: Sequence[float], b: Sequence[float],
+               results: Sequence[object],
+               errors: Optional[Dict[int, BaseException]] = None) -> None:
+        """Log calls of two float operands given as columns.
+
+        ``errors`` maps the positions of the calls that raised to their
+        exceptions; their results are ignored. Builds the records a column
+        at a time. The built-in operations give float results for float
+        operands (see ``calculator.engines``); if a result of another
+        operation is not a float, the calls are logged one by one.
+        """
+        errors = errors or {}
+        if not set(operations) <= _FLOAT_RESULTS and set(map(type, results)) - {float}:
+            for index, call in enumerate(zip(operations, a, b, results)):
+                self.append(call[0], call[1:3], call[3], errors.get(index))
+            return
+        count = len(results)
+        if count < 2:  # itemgetter() of one name returns the value, not a tuple
+            headers = tuple(map(self._headers.__getitem__, operations))
+        else:
+            headers = itemgetter(*operations)(self._headers)
+        pack_into = _floats(count).pack_into
+        with self._lock:
+            # The columns are packed as little-endian float64 and interleaved
+            # a column at a time, in arrays reused from one block to the next;
+            # the block's items are only moved, never read as numbers
+            if len(self._column) != count:
+                self._column = _ZERO * count
+                self._block = _ZERO * (4 * count)
+            column = self._column
+            block = self._block
+            for start, values in enumerate((headers, a, b, results)):
+                pack_into(column, 0, *values)
+                block[start::4] = column
+            if errors:
+                view = memoryview(block).cast("B")
+                for index, error in errors.items():
+                    offset = RECORD_SIZE * index
+                    view[offset:offset + 8] = _HEADER.pack(self.codes[operations[index]],
+                                                           _code_for(error), 0)
+                    view[offset + 24:offset + 32] = _NAN_BYTES
+                view.release()
+            self._pack_pending()
+            if not self._buffer and len(block) >= self._limit and not self._file.closed:
+                self._file.write(block)  # A whole buffer's worth: no need to copy it
+                self._unsynced = True
+                return
+            self._buffer += block
+            full = len(self._buffer) >= self._limit * 8
+        if full:
+            self.flush()
+
+    def _pack_pending(self) -> None:
+        """Move the records of single calls into the buffer; the lock must be held."""
+        pending = self._pending
+        if pending:
+            # A copy: other threads may add calls meanwhile
+            records = pending[:]
+            del pending[:len(records)]
+            self._buffer += _floats(len(records)).pack(*records)
+
+    def flush(self, sync: bool = False) -> None:
+        """Write the pending records, and fsync the file if ``sync`` is true."""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._pack_pending()
+            if self._buffer:
+                self._file.write(self._buffer)
+                del self._buffer[:]
+                self._unsynced = True
+            if not (sync and self._unsynced):
+                return
+            self._unsynced = False
+        # Outside the lock, so calls are not held up by the disk; only the
+        # sync thread and close(), once it has stopped, sync
+        try:
+            os.fsync(self._file.fileno())
+        except OSError:
+            self._unsynced = True
+            raise
+
+    def _sync_periodically(self, interval: float) -> None:
+        while not self._closed.wait(interval):
+            try:
+                self.flush(sync=True)
+            except OSError:
+                pass  # Retried next time and reported by close()
+
+    def close(self) -> None:
+        """Write the pending records, fsync and close the file."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._syncer.join()
+        try:
+            self.flush(sync=True)
+        finally:
+            with self._lock:
+                self._file.close()
+
+
+class LoggedCalculator:
+    """Calculator wrapper that logs every one- or two-operand call.
+
+    ``log`` is an ``OperationLog`` or the path of one to open; ``close()``
+    closes it. Results are logged as float64, so wrap calculators with
+    float results (not an ``ExactCalculator``). Operations with more than
+    two operands, or names longer than 24 bytes, are not logged.
+    ``unlogged`` maps the logged names to the wrapped calculator's methods,
+    for callers that log whole columns of calls with ``log.extend``.
+    """
+
+    def __init__(self, calc: Optional[object] = None, log: object = None) -> None:
+        if calc is None:
+            from . import Calculator
+            calc = Calculator()
+        if log is None:
+            raise ValueError("LoggedCalculator requires a log or a log path")
+        self.calc = calc
+        operations = [name for name in names()
+                      if getattr(calc, name, None) is not None and OPERATIONS[name].arity <= 2]
+        if not isinstance(log, OperationLog):
+            log = OperationLog(log, operations)
+        self.log = log
+        self.unlogged: Dict[str, Callable] = {}
+        for name in operations:
+            if name in log.codes:
+                method = getattr(calc, name)
+                self.unlogged[name] = method
+                wrap = self._wrap_binary if OPERATIONS[name].arity == 2 else self._wrap
+                setattr(self, name, wrap(name, method))
+
+    @property
+    def operations(self) -> List[str]:
+        """The names of the logged operations."""
+        return list(self.unlogged)
+
+    def _wrap_binary(self, name: str, method: Callable) -> Callable:
+        log = self.log
+        pending = log._pending
+        record = pending.extend
+        limit = log._limit
+        header = log._headers[name]
+
+        def logged(a, b):
+            try:
+                result = method(a, b)
+            except Exception as error:
+                log.append(name, (a, b), error=error)
+                raise
+            if type(a) is float and type(b) is float and type(result) is float:
+                record((header, a, b, result))
+            else:  # Ints a float64 may not hold, or other types
+                log.append(name, (a, b), result)
+            if len(pending) >= limit:
+                log.flush()
+            return result
+
+        logged.__name__ = name
+        logged.__doc__ = method.__doc__
+        return logged
+
+    def _wrap(self, name: str, method: Callable) -> Callable:
+        log = self.log
+        arity = OPERATIONS[name].arity
+
+        def logged(*operands):
+            try:
+                result = method(*operands)
+            except Exception as error:
+                if len(operands) == arity:  # Not a call with missing operands
+                    log.append(name, operands, error=error)
+                raise
+            log.append(name, operands, result)
+            return result
+
+        logged.__name__ = name
+        logged.__doc__ = method.__doc__
+        return logged
+
+    def close(self) -> None:
+        """Close the log."""
+        self.log.close()
+
+
+def read_records(path: str, chunk_records: int = 1 << 16) -> Iterator[bytes]:
+    """Yield the bytes of a log file, whole records at a time.
+
+    A torn record at the end (the process died while writing) is dropped.
+    """
+    with open(path, 'rb') as handle:
+        first = handle.read(RECORD_SIZE)
+        if len(first) < RECORD_SIZE or first[0] != 0 or first[8:16] != MAGIC:
+            raise ValueError(f"Not an operation log: {path}")
+        yield first
+        while True:
+            chunk = handle.read(RECORD_SIZE * chunk_records)
+            whole = len(chunk) - len(chunk) % RECORD_SIZE
+            if whole:
+                yield chunk[:whole]
+            if len(chunk) < RECORD_SIZE * chunk_records:
+                return
+
+
+def replay(path: str, max_divergences: int = 10) -> Dict[str, object]:
+    """Re-evaluate every record of a log and compare it with the logged outcome.
+
+    Records are grouped by operation and re-evaluated a chunk at a time
+    with the batch operations (``errors='collect'``), which give the
+    results and errors of the ``Calculator`` methods. Returns the counts
+    of ``records``, ``replayed``, ``skipped`` (inexact operands or an
+    operation unknown here) and ``divergent`` records, and the first
+    ``max_divergences`` divergent records under ``divergences``: dicts with
+    the ``record`` number (0-based, counting every record of the file),
+    the ``operation``, its ``operands`` and the ``logged`` and
+    ``replayed`` outcomes as (ErrorCode, result) pairs.
+    """
+    report = {'records': 0, 'replayed': 0, 'skipped': 0, 'divergent': 0, 'divergences': []}
+    names_by_code = {code: name for name, code in OP_CODES.items()}
+    start = 0
+    for chunk in read_records(path):
+        values = array("d")
+        values.frombytes(chunk)
+        if _SWAP:
+            values.byteswap()
+        groups: Dict[int, List[int]] = {}
+        for index, op in enumerate(chunk[0::RECORD_SIZE]):
+            if op:
+                group = groups.get(op)
+                if group is None:
+                    groups[op] = [index]
+                else:
+                    group.append(index)
+                continue
+            # Definitions apply to later records: replay the earlier ones first
+            _replay_groups(groups, names_by_code, chunk, values, start, report, max_divergences)
+            groups = {}
+            offset = index * RECORD_SIZE
+            if chunk[offset + 8:offset + 16] == MAGIC:  # A new session
+                names_by_code = {code: name for name, code in OP_CODES.items()}
+            else:
+                name = chunk[offset + 8:offset + RECORD_SIZE].rstrip(b"\0")
+                names_by_code[chunk[offset + 1]] = name.decode('utf-8', 'replace')
+        _replay_groups(groups, names_by_code, chunk, values, start, report, max_divergences)
+        count = len(chunk) // RECORD_SIZE
+        report['records'] += count
+        start += count
+    return report
+
+
+def _replay_groups(groups: Dict[int, List[int]], names_by_code: Dict[int, str], chunk: bytes,
+                   values: array, start: int, report: Dict[str, object],
+                   max_divergences: int) -> None:
+    """Replay the records of part of a chunk, one operation at a time."""
+    errors = chunk[1::RECORD_SIZE]
+    flags = chunk[2::RECORD_SIZE]
+    for op, indexes in groups.items():
+        operation = OPERATIONS.get(names_by_code.get(op))
+        if any(flags[index] & INEXACT for index in indexes):
+            report['skipped'] += len(indexes)
+            indexes = [index for index in indexes if not flags[index] & INEXACT]
+            report['skipped'] -= len(indexes)
+        if operation is None or operation.arity > 2:
+            report['skipped'] += len(indexes)
+            continue
+        if not indexes:
+            continue
+        a = array("d", [values[index * 4 + 1] for index in indexes])
+        b = array("d", [values[index * 4 + 2] for index in indexes])
+        if operation.arity == 2:
+            replayed = _dispatch(operation.name, a, b, "collect")
+            results, codes = replayed.values, bytes(replayed.codes)
+        else:
+            results, codes = _replay_unary(operation, a)
+        logged = array("d", [values[index * 4 + 3] for index in indexes])
+        logged_codes = bytes([errors[index] for index in indexes])
+        report['replayed'] += len(indexes)
+        if codes == logged_codes and memoryview(results).tobytes() == logged.tobytes():
+            continue
+        for position, index in enumerate(indexes):
+            code = codes[position]
+            if code == ErrorCode.OVERFLOW:
+                code = ErrorCode.OK  # An infinite result is a result, as logged
+            result = results[position] if code == ErrorCode.OK else _NAN
+            if code == logged_codes[position] and (
+                    code != ErrorCode.OK or _bits(result) == _bits(logged[position])):
+                continue
+            report['divergent'] += 1
+            if len(report['divergences']) < max_divergences:
+                operands = (a[position], b[position])[:operation.arity]
+                report['divergences'].append({
+                    'record': start + index,
+                    'operation': operation.name,
+                    'operands': operands,
+                    'logged': (ErrorCode(logged_codes[position]), logged[position]),
+                    'replayed': (ErrorCode(code), result),
+                })
+
+
+def _bits(value: float) -> bytes:
+    """A float's bytes: NaN equals NaN and 0.0 differs from -0.0."""
+    return struct.pack("<d", value)
+
+
+def _replay_unary(operation, a: array) -> tuple:
+    results = array("d")
+    codes = bytearray()
+    for value in a:
+        try:
+            results.append(operation.checked(value))
+            codes.append(ErrorCode.OK)
+        except (TypeError, ValueError, ArithmeticError) as error:
+            results.append(_NAN)
+            codes.append(_code_for(error))
+    return results, bytes(codes)
@@ -0,0 +1,180 @@
+"""
+Multi-core batch arithmetic on a process pool.
+
+``ParallelBatch`` runs the ``*_many`` operations over several processes.
+The operands are copied once into a shared-memory block as float64 values.
+The block is split into chunks of ``chunk_size`` elements, and each worker
+reads its slice of the operands and writes its slice of the results in place,
+so nothing but the block name and chunk bounds is pickled. Each chunk runs
+through the same code as ``Calculator.*_many`` (the NumPy path for NumPy
+operands), and the results come back in input order.
+
+Errors follow the batch rules: the element with the lowest global index that
+fails raises the scalar method's exception with ``(at index i)`` appended and
+``index`` set to ``i``. Operands that cannot be stored as float64 (strings,
+ints too large for a float...) are evaluated in this process instead, which
+reports the same errors.
+
+    with ParallelBatch(workers=4) as pool:
+        result = pool.add_many(a, b)
+"""
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional
+
+from .batch import _CAUGHT, _evaluate, _float64, _is_ndarray, _replay
+
+DEFAULT_CHUNK_SIZE = 1 << 18
+
+_ITEMSIZE = 8  # bytes per float64
+
+
+def _run_chunk(name: str, size: int, operation: str, start: int, stop: int,
+               use_numpy: bool) -> Optional[int]:
+    """Evaluate elements ``start:stop`` of a shared block.
+
+    The block holds ``size`` operands ``a``, then ``size`` operands ``b``,
+    then ``size`` results. Returns None on success, or the global index of
+    the first failing element in the chunk.
+    """
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        if use_numpy:
+            import numpy as np
+
+            values = np.frombuffer(block.buf, dtype=np.float64, count=3 * size)
+            try:
+                values[2 * size + start:2 * size + stop] = _evaluate(
+                    operation, values[start:stop], values[size + start:size + stop])
+            except _CAUGHT as error:
+                return start + error.index
+            finally:
+                del values
+            return None
+
+        with block.buf.cast("d") as values, \
+                values[start:stop] as a, \
+                values[size + start:size + stop] as b, \
+                values[2 * size + start:2 * size + stop] as out:
+            try:
+                result = _evaluate(operation, a, b)
+            except _CAUGHT as error:
+                return start + error.index
+            out[:] = result
+        return None
+    finally:
+        block.close()
+
+
+def _as_doubles(values):
+    """Return ``values`` as a float64 buffer, or None if that could change a result."""
+    if _float64(values) is None:
+        return None
+    if _is_ndarray(values):
+        import numpy as np
+
+        return np.ascontiguousarray(values, dtype=np.float64)
+    if isinstance(values, array) and values.typecode == "d":
+        return values
+    return array("d", values)
+
+
+class ParallelBatch:
+    """Batch operations sharded across a pool of worker processes.
+
+    ``workers`` defaults to the number of CPUs. Inputs shorter than
+    ``chunk_size`` elements, or any input when ``workers`` is 1, are
+    evaluated in this process without starting the pool.
+    """
+
+    def __init__(self, workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("Worker count must be at least 1")
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1")
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ParallelBatch":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _chunks(self, size: int) -> List[tuple]:
+        step = self.chunk_size
+        return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+    def _evaluate(self, operation: str, a, b):
+        if len(a) != len(b):
+            raise ValueError(
+                f"Operand sequences must have the same length (got {len(a)} and {len(b)})"
+            )
+        size = len(a)
+        if self.workers == 1 or size <= self.chunk_size:
+            return _evaluate(operation, a, b)
+        fa = _as_doubles(a)
+        fb = _as_doubles(b)
+        if fa is None or fb is None:
+            return _evaluate(operation, a, b)
+
+        use_numpy = _is_ndarray(a) or _is_ndarray(b)
+        nbytes = size * _ITEMSIZE
+        block = shared_memory.SharedMemory(create=True, size=3 * nbytes)
+        try:
+            with memoryview(fa).cast("B") as src:
+                block.buf[:nbytes] = src
+            with memoryview(fb).cast("B") as src:
+                block.buf[nbytes:2 * nbytes] = src
+
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            futures = [
+                self._pool.submit(_run_chunk, block.name, size, operation, start, stop, use_numpy)
+                for start, stop in self._chunks(size)
+            ]
+            failures = [index for index in (f.result() for f in futures) if index is not None]
+            if failures:
+                index = min(failures)
+                _replay(operation, float(fa[index]), float(fb[index]), index)
+
+            if use_numpy:
+                import numpy as np
+
+                return np.frombuffer(block.buf, dtype=np.float64, count=size,
+                                     offset=2 * nbytes).copy()
+            result = array("d")
+            with block.buf[2 * nbytes:3 * nbytes] as out:
+                result.frombytes(out)
+            return result
+        finally:
+            block.close()
+            block.unlink()
+
+    def add_many(self, a, b):
+        """Add two sequences of numbers element-wise."""
+        return self._evaluate("add", a, b)
+
+    def subtract_many(self, a, b):
+        """Subtract the second sequence from the first element-wise."""
+        return self._evaluate("subtract", a, b)
+
+    def multiply_many(self, a, b):
+        """Multiply two sequences of numbers element-wise."""
+        return self._evaluate("multiply", a, b)
+
+    def divide_many(self, a, b):
+        """Divide the first sequence by the second element-wise."""
+        return self._evaluate("divide", a, b)
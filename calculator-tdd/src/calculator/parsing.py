@@ -0,0 +1,97 @@
+"""
+Number parsing for text inputs (CLI arguments, stream lines, requests).
+
+``parse_number`` converts one token. ``parse_numbers`` converts many
+tokens in one pass. ``parse_block`` splits a block of ``<operation> <num1>
+<num2>`` lines into columns and converts each operand column at once.
+
+Errors use the CLI messages: "Invalid number format provided" for tokens
+that are not numbers and "Cannot perform operation with NaN value" for NaN.
+
+By default every number becomes a float, as in ``CalculatorCLI.calculate``.
+With ``exact=True``, integer tokens become ``int`` instead, so the
+module-level ``add``/``subtract``/``multiply`` functions keep exact integer
+results (``10**20 + 1`` stays exact).
+"""
+import math
+from typing import Container, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .registry import names
+
+Number = Union[int, float]
+
+INVALID_NUMBER = "Invalid number format provided"
+NAN_INPUT = "Cannot perform operation with NaN value"
+
+
+def _is_int(token: str) -> bool:
+    """Check for an optionally signed run of decimal digits."""
+    if token[:1] in ('-', '+'):
+        token = token[1:]
+    return token.isdecimal()
+
+
+def _convert(token: str, exact: bool) -> Number:
+    if exact and _is_int(token):
+        return int(token)
+    return float(token)
+
+
+def parse_number(token: str, exact: bool = False) -> Number:
+    """Parse one number, rejecting NaN."""
+    try:
+        value = _convert(token, exact)
+    except ValueError:
+        raise ValueError(INVALID_NUMBER) from None
+    if value != value:
+        raise ValueError(NAN_INPUT)
+    return value
+
+
+def parse_numbers(tokens: Sequence[str], exact: bool = False) -> List[Number]:
+    """Parse a list of numbers in one pass, rejecting NaN.
+
+    As in ``CalculatorCLI.calculate``, a badly formatted token is reported
+    before a NaN one.
+    """
+    try:
+        if exact:
+            values = [int(token) if _is_int(token) else float(token) for token in tokens]
+        else:
+            values = list(map(float, tokens))
+    except ValueError:
+        raise ValueError(INVALID_NUMBER) from None
+    floats = values if not exact else [value for value in values if value.__class__ is float]
+    if any(map(math.isnan, floats)):
+        raise ValueError(NAN_INPUT)
+    return values
+
+
+def parse_block(lines: Iterable[str], exact: bool = False,
+                operations: Optional[Container[str]] = None) -> Optional[Tuple[list, list, list]]:
+    """Parse a block of ``<operation> <num1> <num2>`` lines into columns.
+
+    Returns ``(operations, first_operands, second_operands)`` when every
+    line is a well-formed request, or None when any line is not (blank
+    lines, other commands, wrong argument counts, bad numbers, NaN), in
+    which case the caller should handle the block line by line.
+    ``operations`` holds the accepted operation names and defaults to the
+    registered two-operand operations.
+    """
+    accepted = operations if operations is not None else names(2)
+    requested = []
+    first = []
+    second = []
+    for line in lines:
+        args = line.split()
+        if len(args) != 3:
+            return None
+        requested.append(args[0])
+        first.append(args[1])
+        second.append(args[2])
+    if not requested or not all(name in accepted for name in set(requested)):
+        return None
+    try:
+        return requested, parse_numbers(first, exact), parse_numbers(second, exact)
+    except ValueError:
+        return None
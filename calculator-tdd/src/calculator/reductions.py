@@ -0,0 +1,201 @@
+"""
+Reductions over any number of operands.
+
+``total``, ``product`` and ``mean`` consume any iterable (lists, arrays,
+generators, file lines already parsed...) lazily, ``CHUNK_SIZE`` values
+at a time, so memory use does not depend on the input length.
+``running_total`` yields the sum after each value as soon as it arrives.
+
+Summation is compensated: each chunk is summed with ``math.fsum`` and the
+chunk sums are combined with Neumaier's algorithm, so the result does not
+drift the way a chain of ``Calculator.add`` calls does. A sum whose
+partial results leave the float range overflows to infinity, as
+``Calculator.add`` does.
+
+Validation follows the ``Calculator`` methods and the special-value policy
+of ``calculator.engines``: TypeError for values that are not int or float,
+ValueError for NaN values and for a NaN result (adding infinities of both
+signs, or multiplying infinity by zero). As in the batch operations, the
+offending value raises with ``(at index i)`` appended and its position
+stored on the exception as ``index``.
+"""
+import math
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Union
+
+from .batch import _at_index
+
+Number = Union[int, float]
+
+CHUNK_SIZE = 4096
+
+_NUMERIC_TYPES = frozenset((int, float, bool))
+
+
+def _chunks(values: Iterable[Number]) -> Iterator[List[Number]]:
+    iterator = iter(values)
+    while True:
+        chunk = list(islice(iterator, CHUNK_SIZE))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _check(chunk: List[Number], offset: int, verb: str, types_only: bool = False) -> None:
+    """Validate a chunk like the Calculator methods, locating the first bad value.
+
+    ``types_only`` skips the NaN scan when every value is an int or float,
+    for callers that notice NaN from their result and check again.
+    """
+    try:
+        if set(map(type, chunk)) <= _NUMERIC_TYPES and (
+                types_only or not any(map(math.isnan, chunk))):
+            return
+    except OverflowError:  # an int too large for math.isnan
+        pass
+    for index, value in enumerate(chunk, offset):
+        if not isinstance(value, (int, float)):
+            raise _at_index(TypeError(f"Cannot {verb} {type(value).__name__}"), index)
+        if value != value:
+            raise _at_index(ValueError("Cannot perform operation with NaN value"), index)
+
+
+def _as_float(value: Number) -> float:
+    """Convert a value to float; ints beyond the float range become infinite."""
+    try:
+        return float(value)
+    except OverflowError:
+        return math.inf if value > 0 else -math.inf
+
+
+class _Sum:
+    """Neumaier compensated sum."""
+    __slots__ = ('total', 'compensation')
+
+    def __init__(self) -> None:
+        self.total = 0.0
+        self.compensation = 0.0
+
+    def add(self, value: float) -> None:
+        total = self.total
+        result = total + value
+        if abs(total) >= abs(value):
+            self.compensation += (total - result) + value
+        else:
+            self.compensation += (value - result) + total
+        self.total = result
+
+    def add_chunk(self, chunk: List[Number], offset: int, verb: str) -> None:
+        """Validate and add a chunk of values starting at index ``offset``."""
+        _check(chunk, offset, verb, types_only=True)
+        try:
+            chunk_sum = math.fsum(chunk)
+            combined = self.total + chunk_sum
+            if combined == combined:  # Not NaN: no infinities of both signs
+                self.add(chunk_sum)
+                return
+        except (OverflowError, ValueError):
+            pass
+        # A NaN value, overflow or opposite infinities: report any NaN, then
+        # add the floats one at a time and the ints exactly, reporting the
+        # value that makes the sum NaN
+        _check(chunk, offset, verb)
+        last_integer = None
+        for index, value in enumerate(chunk, offset):
+            if value.__class__ is float:
+                self.add(value)
+                if self.total != self.total:
+                    raise _at_index(ValueError("Result is not a number (NaN)"), index)
+            else:
+                last_integer = index
+        if last_integer is not None:
+            self.add(_as_float(sum(value for value in chunk if value.__class__ is not float)))
+            if self.total != self.total:
+                raise _at_index(ValueError("Result is not a number (NaN)"), last_integer)
+
+    def result(self) -> float:
+        total = self.total
+        if total - total != 0:  # infinite or NaN: the compensation is meaningless
+            return total
+        return total + self.compensation
+
+
+def total(values: Iterable[Number]) -> float:
+    """Return the compensated sum of ``values`` (0.0 for no values)."""
+    accumulator = _Sum()
+    offset = 0
+    for chunk in _chunks(values):
+        accumulator.add_chunk(chunk, offset, 'sum')
+        offset += len(chunk)
+    return accumulator.result()
+
+
+def product(values: Iterable[Number]) -> float:
+    """Return the product of ``values`` (1.0 for no values).
+
+    Values are multiplied as floats from left to right, as a chain of
+    ``Calculator.multiply`` calls would. A product beyond the float range
+    is infinite with its sign, ints included (``product([10**200,
+    -10**200])`` is ``-inf``, as ``multiply`` gives), while a value that is
+    itself an int too large for a float raises OverflowError, as it does
+    for ``multiply``. A NaN result (``inf * 0``) raises ValueError.
+    """
+    result = 1.0
+    offset = 0
+    for chunk in _chunks(values):
+        _check(chunk, offset, 'multiply')
+        try:
+            chunk_result = math.prod(chunk, start=result)
+        except OverflowError:
+            chunk_result = math.nan
+        if chunk_result != chunk_result:
+            # Replay the chunk to find the value that failed
+            for index, value in enumerate(chunk, offset):
+                try:
+                    result *= float(value)
+                except OverflowError:
+                    raise _at_index(OverflowError("int too large to convert to float"),
+                                    index) from None
+                if result != result:
+                    raise _at_index(ValueError("Result is not a number (NaN)"), index)
+        result = chunk_result
+        offset += len(chunk)
+    return result
+
+
+def mean(values: Iterable[Number]) -> float:
+    """Return the mean of ``values``, using the compensated sum."""
+    accumulator = _Sum()
+    count = 0
+    for chunk in _chunks(values):
+        accumulator.add_chunk(chunk, count, 'average')
+        count += len(chunk)
+    if not count:
+        raise ValueError("Cannot compute the mean of no values")
+    return accumulator.result() / count
+
+
+def running_total(values: Iterable[Number]) -> Iterator[float]:
+    """Yield the compensated sum of ``values`` after each value."""
+    accumulator = _Sum()
+    add = accumulator.add
+    result = accumulator.result
+    for index, value in enumerate(values):
+        if value.__class__ is not float:
+            _check([value], index, 'sum')
+            value = _as_float(value)
+        elif value != value:
+            _check([value], index, 'sum')
+        add(value)
+        value = result()
+        if value != value:
+            raise _at_index(ValueError("Result is not a number (NaN)"), index)
+        yield value
+
+
+# Reductions by CLI name
+REDUCTIONS: Dict[str, Callable[[Iterable[Number]], float]] = {
+    'sum': total,
+    'product': product,
+    'mean': mean,
+}
@@ -0,0 +1,353 @@
+"""
+The table of calculator operations.
+
+Every path that applies an operation by name (``CalculatorCLI.calculate``,
+stream and CSV mode, ``Calculator.calculate``, the batch and file
+operations, the cache) looks it up in ``OPERATIONS``, a dict from name to
+``Operation``. An ``Operation`` declares its arity and holds one
+implementation per policy:
+
+- ``checked`` validates like ``Calculator``: TypeError for operands that
+  are not int or float, ValueError for NaN, and a float result (infinity
+  when the result is too large for a float).
+- ``unchecked`` gives the same results for trusted float operands without
+  the checks (see ``calculator.fast``).
+- ``function`` is the plain function, whose result keeps the operands'
+  type (``add(10**20, 1)`` stays an exact int).
+
+The built-in operations are defined here; the ``Calculator`` methods, the
+module-level ``add``/``subtract``/``multiply``/``divide`` functions and
+``calculator.fast`` are their ``checked``, ``function`` and ``unchecked``
+implementations, so every path validates with the same code.
+
+``Operation.bind(validate, overflow, result)`` returns the implementation
+for a combination of policies and caches it, so choosing one costs a
+dict lookup. ``overflow='raise'`` turns an infinite result from finite
+operands into an OverflowError instead.
+
+New operations can be added at runtime and are picked up by the CLI, the
+stream, CSV and batch modes and ``Calculator`` instances:
+
+    register('power', operator.pow)
+    Calculator().power(2, 10)  # 1024.0
+
+The four built-in operations cannot be replaced or unregistered.
+"""
+from __future__ import annotations
+
+from math import isnan
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # Only needed by type checkers; too slow to import at startup
+    from typing import Callable, Dict, Optional, Tuple
+
+OVERFLOW_POLICIES = ('inf', 'raise')
+RESULT_POLICIES = ('float', 'native')
+
+# First words the CLI already gives another meaning
+RESERVED = frozenset(('eval', 'serve', 'client', 'batch', 'csv', 'sum', 'product', 'mean',
+                      'metrics', 'stats', 'repl', 'ans', 'daemon', 'replay'))
+
+BUILTINS = ('add', 'subtract', 'multiply', 'divide')
+
+_NUMBER_TYPES = (int, float)
+_INF = float('inf')
+
+# The words between the operand types in TypeError messages ("Cannot divide
+# str by int"), when not "and"; subtract names the second operand first
+_JOINERS = {'subtract': 'from', 'divide': 'by'}
+
+
+def _type_error(name: str, operands: tuple) -> TypeError:
+    """Return the TypeError of ``name`` for operands that are not all numbers."""
+    types = [type(operand).__name__ for operand in operands]
+    joiner = _JOINERS.get(name, 'and') if len(types) == 2 else 'and'
+    if joiner == 'from':
+        types.reverse()
+    return TypeError(f"Cannot {name} {f' {joiner} '.join(types)}")
+
+
+def _error(name: str, operands: tuple) -> Optional[Exception]:
+    """Return the Calculator error for operands that are not numbers or NaN, or None.
+
+    Raises OverflowError for an int too large for a float.
+    """
+    for value in operands:
+        if not isinstance(value, _NUMBER_TYPES):
+            return _type_error(name, operands)
+    for value in operands:
+        if isnan(value):
+            return ValueError("Cannot perform operation with NaN value")
+    return None
+
+
+def _check(name: str, operands: tuple) -> None:
+    """Validate operands the way the Calculator methods do."""
+    error = _error(name, operands)
+    if error is not None:
+        raise error
+
+
+def _float(exact: object) -> float:
+    """Round a result to a float: infinity, signed, for an int too large for one."""
+    try:
+        result = float(exact)
+    except OverflowError:
+        return _INF if exact > 0 else -_INF
+    if result != result:
+        raise ValueError("Result is not a number (NaN)")
+    return result
+
+
+def _named(implementation: Callable, name: str, function: Callable) -> Callable:
+    implementation.__name__ = name
+    implementation.__doc__ = getattr(function, '__doc__', None)
+    return implementation
+
+
+def _checked(name: str, function: Callable, arity: int = 2) -> Callable:
+    """Build a validating, float-returning version of ``function``."""
+    if arity != 2:
+        def checked(*operands):
+            _check(name, operands)
+            return _float(function(*operands))
+
+        return _named(checked, name, function)
+
+    def checked(a, b):
+        # The checks of _error in one test (isnan raises OverflowError for huge ints)
+        if not (isinstance(a, _NUMBER_TYPES) and isinstance(b, _NUMBER_TYPES)) \
+                or isnan(a) or isnan(b):
+            raise _error(name, (a, b))
+        exact = function(a, b)
+        if exact.__class__ is float and exact == exact:
+            return exact
+        return _float(exact)
+
+    return _named(checked, name, function)
+
+
+def _unchecked(name: str, function: Callable, arity: int = 2) -> Callable:
+    """Build a version of ``function`` for trusted float operands."""
+    if arity != 2:
+        def unchecked(*operands):
+            result = function(*operands)
+            if result != result:
+                raise ValueError("Result is not a number (NaN)")
+            return result
+
+        return _named(unchecked, name, function)
+
+    def unchecked(a, b):
+        result = function(a, b)
+        if result != result:
+            raise ValueError("Result is not a number (NaN)")
+        return result
+
+    return _named(unchecked, name, function)
+
+
+def _validated(name: str, function: Callable) -> Callable:
+    """Validate operands, then return ``function``'s own result."""
+
+    def validated(*operands):
+        _check(name, operands)
+        return function(*operands)
+
+    return validated
+
+
+def _raise_on_overflow(name: str, function: Callable) -> Callable:
+    """Raise OverflowError where ``function`` overflows to infinity."""
+
+    def strict(*operands):
+        result = function(*operands)
+        if (result == _INF or result == -_INF) and \
+                not any(value == _INF or value == -_INF for value in operands):
+            raise OverflowError(f"Result of {name} is too large for a float")
+        return result
+
+    return strict
+
+
+class Operation:
+    """A named operation with its arity and its implementations."""
+    __slots__ = ('name', 'arity', 'function', 'checked', 'unchecked', '_bound')
+
+    def __init__(self, name: str, function: Callable, arity: int = 2,
+                 checked: Optional[Callable] = None,
+                 unchecked: Optional[Callable] = None) -> None:
+        self.name = name
+        self.arity = arity
+        self.function = function
+        self.checked = checked if checked is not None else _checked(name, function, arity)
+        self.unchecked = (unchecked if unchecked is not None
+                          else _unchecked(name, function, arity))
+        self._bound: Dict[Tuple[bool, str, str], Callable] = {}
+
+    def bind(self, validate: bool = True, overflow: str = 'inf',
+             result: str = 'float') -> Callable:
+        """Return the implementation for a combination of policies."""
+        if overflow == 'inf' and result == 'float':
+            return self.checked if validate else self.unchecked
+        key = (validate, overflow, result)
+        function = self._bound.get(key)
+        if function is not None:
+            return function
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        if result not in RESULT_POLICIES:
+            raise ValueError(f"Unknown result policy: {result}")
+        if result == 'float':
+            function = self.checked if validate else self.unchecked
+        else:
+            function = _validated(self.name, self.function) if validate else self.function
+        if overflow == 'raise':
+            function = _raise_on_overflow(self.name, function)
+        self._bound[key] = function
+        return function
+
+    def __repr__(self) -> str:
+        return f"Operation({self.name!r}, arity={self.arity})"
+
+
+class _CalculatorMethod:
+    """``Calculator`` attribute for an operation added with ``register``.
+
+    Behaves like the built-in methods: the checked implementation on the
+    class and on validating instances, the unchecked one on
+    ``Calculator(validate=False)``.
+    """
+    __slots__ = ('operation',)
+
+    def __init__(self, operation: Operation) -> None:
+        self.operation = operation
+
+    def __get__(self, instance: object, owner: Optional[type] = None) -> Callable:
+        if instance is None:
+            return self.operation.checked
+        return self.operation.bind(instance.validate)
+
+
+OPERATIONS: Dict[str, Operation] = {}
+
+
+def register(name: str, function: Callable, arity: int = 2, *,
+             checked: Optional[Callable] = None,
+             unchecked: Optional[Callable] = None) -> Operation:
+    """Add an operation to the table and return it.
+
+    ``function`` takes ``arity`` numbers. ``checked`` and ``unchecked``
+    default to wrappers around ``function`` that follow the ``Calculator``
+    rules. Raises ValueError if the name is taken or not usable as a CLI
+    operation and ``Calculator`` attribute.
+    """
+    if name in OPERATIONS:
+        raise ValueError(f"Operation {name} is already registered")
+    if not name.isidentifier() or name.startswith('_') or name in RESERVED:
+        raise ValueError(f"Invalid operation name: {name}")
+    from . import Calculator
+
+    if hasattr(Calculator, name):
+        raise ValueError(f"Invalid operation name: {name}")
+    if arity < 1:
+        raise ValueError("Arity must be at least 1")
+    operation = Operation(name, function, arity, checked, unchecked)
+    OPERATIONS[name] = operation
+    setattr(Calculator, name, _CalculatorMethod(operation))
+    return operation
+
+
+def unregister(name: str) -> None:
+    """Remove an operation added with ``register``."""
+    if name in BUILTINS:
+        raise ValueError(f"Cannot unregister built-in operation {name}")
+    get(name)
+    del OPERATIONS[name]
+    from . import Calculator
+
+    delattr(Calculator, name)
+
+
+def get(name: str) -> Operation:
+    """Return the operation called ``name``, raising ValueError if there is none."""
+    operation = OPERATIONS.get(name)
+    if operation is None:
+        raise ValueError(f"Unknown operation: {name}")
+    return operation
+
+
+def resolve(name: str, validate: bool = True, overflow: str = 'inf',
+            result: str = 'float') -> Callable:
+    """Return the implementation of ``name`` for the given policies."""
+    return get(name).bind(validate, overflow, result)
+
+
+def names(arity: Optional[int] = None) -> Tuple[str, ...]:
+    """Return the registered operation names, optionally only those of one arity."""
+    return tuple(name for name, operation in OPERATIONS.items()
+                 if arity is None or operation.arity == arity)
+
+
+def add(a: int | float, b: int | float) -> int | float:
+    """Add two numbers and return the result."""
+    return a + b
+
+
+def subtract(a: int | float, b: int | float) -> int | float:
+    """Subtract b from a and return the result.
+
+    Args:
+        a: First number (int or float)
+        b: Second number (int or float)
+
+    Returns:
+        Difference of a and b (int or float)
+    """
+    return a - b
+
+
+def multiply(a: int | float, b: int | float) -> int | float:
+    """
+    Multiply two numbers and return the result.
+
+    Args:
+        a: The first number
+        b: The second number
+
+    Returns:
+        The product of a and b
+    """
+    return a * b
+
+
+def divide(a: int | float, b: int | float) -> float:
+    """Divide a by b and return the result.
+
+    Args:
+        a: Numerator (int or float)
+        b: Denominator (int or float)
+
+    Returns:
+        Quotient of a and b (always float)
+    """
+    return a / b
+
+
+def _divide(a: float, b: float) -> float:
+    """Divide first number by second number."""
+    if b == 0:
+        raise ZeroDivisionError("Cannot divide by zero")
+    return a / b
+
+
+def _register_builtins() -> None:
+    for function in (add, subtract, multiply, divide):
+        name = function.__name__
+        # Both policies raise the Calculator error for a zero divisor
+        computed = _divide if function is divide else function
+        OPERATIONS[name] = Operation(name, function, 2, _checked(name, computed),
+                                     _unchecked(name, computed))
+
+
+_register_builtins()
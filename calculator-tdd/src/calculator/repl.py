@@ -0,0 +1,229 @@
+"""
+Interactive calculator session.
+
+``python -m calculator repl`` keeps one ``CalculatorCLI`` warm and reads
+one calculation per line, so a run of calculations pays for interpreter
+startup once. Lines are the same as on the command line
+(``<operation> <num1> <num2>``, ``sum ...``, ``eval ...``) and results and
+errors are printed exactly as ``python -m calculator`` prints them.
+
+Results can be chained: ``ans`` is the last result, ``name = <calculation>``
+stores a result under a name, and names can be used wherever a number
+can. Lines starting with ``:`` are session commands (see ``HELP``).
+
+History is appended to ``HISTORY_FILE`` in the home directory (or to
+``$CALCULATOR_HISTORY``; set it empty to keep no history). Lines are
+written in batches and when the session ends, never once per line, and
+the file is only read when the session is attached to a terminal.
+"""
+import os
+import shlex
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from .cli import CLI_ERRORS, REDUCTIONS, CalculatorCLI, format_error
+from .registry import OPERATIONS
+
+HISTORY_FILE = '.calculator_history'
+
+# Lines kept in memory before they are appended to the history file
+HISTORY_BATCH = 100
+
+PROMPT = "calc> "
+
+HELP = """\
+Enter a calculation per line, as on the command line:
+    add 5 3
+    sum 1 2 3
+    eval "(a + b) / 2" a=1 b=2
+Use "ans" for the last result, and "name = <calculation>" to keep a result:
+    x = multiply ans 2
+    divide x 4
+Commands:
+    :time [on|off]  Show the time taken by each calculation
+    :vars           List the stored results
+    :history        Show this session's lines
+    :help           Show this help
+    :quit           End the session (or Ctrl-D)"""
+
+
+def default_history_path() -> Optional[str]:
+    """Return the history file path, or None when history is disabled."""
+    path = os.environ.get('CALCULATOR_HISTORY')
+    if path is None:
+        return os.path.join(os.path.expanduser('~'), HISTORY_FILE)
+    return path or None
+
+
+def _format_time(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"Time: {seconds * 1e6:.1f} us"
+    if seconds < 1:
+        return f"Time: {seconds * 1e3:.2f} ms"
+    return f"Time: {seconds:.3f} s"
+
+
+class Session:
+    """An interactive session keeping one ``CalculatorCLI`` and its results."""
+
+    def __init__(self, cli: Optional[CalculatorCLI] = None,
+                 history_path: Optional[str] = None) -> None:
+        self.cli = cli if cli is not None else CalculatorCLI()
+        self.variables: Dict[str, object] = {}
+        self.timing = False
+        self.history_path = history_path
+        self.history: List[str] = []
+        self._unsaved = 0
+        self.finished = False
+
+    def _substitute(self, args: List[str]) -> List[str]:
+        """Replace stored names among the operands by their values."""
+        variables = self.variables
+        if args[0] == 'eval':
+            # Expressions take values as name=value arguments; those given
+            # on the line come later and take precedence
+            stored = []
+            for name, value in variables.items():
+                try:
+                    stored.append(f"{name}={float(value)!r}")
+                except OverflowError:
+                    pass
+            return args[:1] + stored + args[1:]
+        return args[:1] + [str(variables[arg]) if arg in variables else arg
+                           for arg in args[1:]]
+
+    def calculate(self, args: List[str]) -> object:
+        """Evaluate one calculation, with stored names as operands."""
+        if len(args) == 1 and args[0] not in OPERATIONS and args[0] not in REDUCTIONS:
+            # A lone operand: recall a stored result or parse a number
+            token = args[0]
+            if token in self.variables:
+                return self.variables[token]
+            if token.isidentifier():
+                raise ValueError(f"Unknown name: {token}")
+            try:
+                value = self.cli.to_number(token)
+            except ValueError:
+                raise ValueError("Invalid number format provided")
+            if value != value:
+                raise ValueError("Cannot perform operation with NaN value")
+            return value
+        return self.cli.calculate(self._substitute(args))
+
+    def execute(self, line: str) -> str:
+        """Run one input line and return the text to print (may be empty)."""
+        line = line.strip()
+        if not line:
+            return ""
+        self._record(line)
+        if line.startswith(':'):
+            return self._command(line[1:].split())
+        if line in ('quit', 'exit'):
+            self.finished = True
+            return ""
+        name = None
+        target, separator, rest = line.partition('=')
+        if separator and target.strip().isidentifier():
+            name = target.strip()
+            if name in OPERATIONS or name in REDUCTIONS or name == 'eval':
+                return f"Error: Cannot assign to {name}"
+            line = rest
+        start = time.perf_counter()
+        try:
+            # Quotes group an expression into one argument, as in a shell
+            args = shlex.split(line) if '"' in line or "'" in line else line.split()
+            if not args:
+                return "Error: Empty input line"
+            if args == ['metrics']:
+                return self.cli._metrics_line().rstrip("\n")
+            result = self.calculate(args)
+            if isinstance(result, str):  # Help text for --help
+                return HELP
+        except CLI_ERRORS as e:
+            output = format_error(e)
+        else:
+            self.variables['ans'] = result
+            if name is not None:
+                self.variables[name] = result
+            output = f"Result: {result}"
+        if self.timing:
+            output += "\n" + _format_time(time.perf_counter() - start)
+        return output
+
+    def _command(self, args: List[str]) -> str:
+        command = args[0] if args else ''
+        if command in ('q', 'quit', 'exit'):
+            self.finished = True
+            return ""
+        if command == 'time':
+            if len(args) > 2 or args[1:] not in ([], ['on'], ['off']):
+                return "Error: Usage: :time [on|off]"
+            self.timing = not self.timing if len(args) == 1 else args[1] == 'on'
+            return f"Timing {'on' if self.timing else 'off'}"
+        if command == 'vars':
+            return "\n".join(f"{name} = {value}" for name, value in self.variables.items())
+        if command == 'history':
+            return "\n".join(f"{number:>4}  {line}"
+                             for number, line in enumerate(self.history, 1))
+        if command in ('help', 'h', '?'):
+            return HELP
+        return f"Error: Unknown command: :{command}"
+
+    def _record(self, line: str) -> None:
+        self.history.append(line)
+        self._unsaved += 1
+        if self._unsaved >= HISTORY_BATCH:
+            self.save_history()
+
+    def save_history(self) -> None:
+        """Append the lines not yet saved to the history file."""
+        if not self._unsaved:
+            return
+        lines = self.history[-self._unsaved:]
+        self._unsaved = 0
+        if self.history_path is None:
+            return
+        try:
+            with open(self.history_path, 'a', encoding='utf-8') as handle:
+                handle.write("".join(line + "\n" for line in lines))
+        except OSError:
+            pass  # History is a convenience; never fail a session over it
+
+    def run(self, lines: Optional[Iterable[str]] = None, out: Optional[TextIO] = None) -> None:
+        """Run the session over ``lines`` (or the terminal/stdin) until it ends."""
+        if out is None:
+            out = sys.stdout
+        if lines is None:
+            lines = self._prompt() if sys.stdin.isatty() else sys.stdin
+        try:
+            for line in lines:
+                output = self.execute(line)
+                if output:
+                    out.write(output + "\n")
+                    out.flush()
+                if self.finished:
+                    break
+        finally:
+            self.save_history()
+
+    def _prompt(self) -> Iterator[str]:
+        """Read lines from the terminal, with line editing when available."""
+        try:
+            import readline
+        except ImportError:
+            readline = None
+        if readline is not None and self.history_path is not None:
+            try:
+                readline.read_history_file(self.history_path)
+            except OSError:
+                pass
+        while True:
+            try:
+                yield input(PROMPT)
+            except EOFError:
+                print()
+                return
+            except KeyboardInterrupt:
+                print()  # Ctrl-C discards the current line
+
@@ -0,0 +1,190 @@
+"""
+Long-lived calculator server and client.
+
+The server keeps one ``CalculatorCLI`` warm and answers requests over a
+Unix-domain socket or a localhost TCP port, so callers do not pay for a
+new interpreter per calculation. The server has no authentication, so it
+only listens on loopback addresses, and it only replaces an existing
+socket file at its socket path, never any other kind of file.
+
+Protocol: newline-delimited UTF-8 text. Each request line is the same as
+a ``--stream`` input line (``<operation> <num1> <num2>`` or ``eval ...``)
+and each response line is exactly what ``python -m calculator`` would
+print for it (``Result: ...`` or ``Error: ...``). Requests may be
+pipelined: responses come back in request order, and every complete line
+received in one read is answered with a single send. A connection that
+sends more than ``MAX_LINE`` bytes without a newline gets an error line
+and is closed.
+"""
+import ipaddress
+import os
+import socket
+import socketserver
+import stat
+from io import StringIO
+from typing import Iterable, List, Optional
+
+from .cli import CalculatorCLI, pop_option
+
+DEFAULT_HOST = '127.0.0.1'
+RECV_SIZE = 65536
+MAX_LINE = 1 << 20  # Longest request line, in bytes
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    """Answer newline-delimited requests on one connection."""
+
+    def handle(self) -> None:
+        stream = self.server.cli.stream
+        connection = self.request
+        pending = b""
+        while True:
+            data = connection.recv(RECV_SIZE)
+            if not data:
+                break
+            pending += data
+            end = pending.rfind(b"\n")
+            if end < 0:
+                if len(pending) > MAX_LINE:
+                    # No newline in sight: answer with an error and hang up
+                    connection.sendall(b"Error: Request line too long\n")
+                    break
+                continue
+            lines = pending[:end].decode('utf-8', errors='replace').split("\n")
+            pending = pending[end + 1:]
+            out = StringIO()
+            stream(lines, out)
+            connection.sendall(out.getvalue().encode('utf-8'))
+
+
+class ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+    class ThreadingUnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+
+def check_host(host: str) -> None:
+    """Reject TCP hosts other than loopback addresses: anyone who can connect can calculate."""
+    if host == 'localhost':
+        return
+    try:
+        loopback = ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        loopback = False
+    if not loopback:
+        raise ValueError(f"Refusing to listen on {host}: the server only listens on "
+                         "loopback addresses such as 127.0.0.1")
+
+
+def remove_stale_socket(path: str) -> None:
+    """Remove a socket left at ``path`` by an earlier server; refuse any other file."""
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ValueError(f"{path} exists and is not a socket")
+    os.unlink(path)
+
+
+def create_server(socket_path: Optional[str] = None, host: str = DEFAULT_HOST,
+                  port: int = 0,
+                  cli: Optional[CalculatorCLI] = None) -> socketserver.BaseServer:
+    """Create a server on a Unix socket path, or on host/port over TCP.
+
+    Use port 0 to pick a free port; the bound address is available as
+    ``server.server_address``. Call ``serve_forever()`` to start it.
+    """
+    if socket_path is not None:
+        if not hasattr(socket, 'AF_UNIX'):
+            raise ValueError("Unix sockets are not supported on this platform")
+        remove_stale_socket(socket_path)
+        server = ThreadingUnixServer(socket_path, _RequestHandler)
+    else:
+        check_host(host)
+        server = ThreadingTCPServer((host, port), _RequestHandler)
+    server.cli = cli if cli is not None else CalculatorCLI()
+    return server
+
+
+class CalculatorClient:
+    """Thin client for a running calculator server."""
+
+    def __init__(self, socket_path: Optional[str] = None, host: str = DEFAULT_HOST,
+                 port: Optional[int] = None, timeout: Optional[float] = None) -> None:
+        if socket_path is not None:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(socket_path)
+        elif port is not None:
+            self.sock = socket.create_connection((host, port), timeout=timeout)
+        else:
+            raise ValueError("Either a socket path or a port is required")
+        self._reader = self.sock.makefile('rb')
+
+    def calculate(self, *args: object) -> str:
+        """Send one request, e.g. ``calculate('add', 5, 3)``, and return the response line."""
+        return self.calculate_many([" ".join(str(arg) for arg in args)])[0]
+
+    def calculate_many(self, requests: Iterable[str], window: int = 1024) -> List[str]:
+        """Pipeline many request lines, returning the response lines in order.
+
+        Up to ``window`` requests are sent before their responses are read.
+        """
+        responses: List[str] = []
+        batch: List[str] = []
+        for request in requests:
+            batch.append(request)
+            if len(batch) >= window:
+                responses.extend(self._exchange(batch))
+                batch = []
+        if batch:
+            responses.extend(self._exchange(batch))
+        return responses
+
+    def _exchange(self, batch: List[str]) -> List[str]:
+        payload = "".join(f"{request}\n" for request in batch)
+        self.sock.sendall(payload.encode('utf-8'))
+        readline = self._reader.readline
+        responses = []
+        for _ in batch:
+            line = readline()
+            if not line:
+                raise ConnectionError("Calculator server closed the connection")
+            responses.append(line.decode('utf-8').rstrip("\n"))
+        return responses
+
+    def close(self) -> None:
+        self._reader.close()
+        self.sock.close()
+
+    def __enter__(self) -> "CalculatorClient":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def parse_address(args: List[str]) -> dict:
+    """Parse ``--socket PATH`` or ``--port N [--host HOST]`` options.
+
+    Returns the keyword arguments for ``create_server``/``CalculatorClient``
+    and removes the options from ``args``.
+    """
+    options = {}
+    for option, name in (('--socket', 'socket_path'), ('--host', 'host'), ('--port', 'port')):
+        value = pop_option(args, option)
+        if value is not None:
+            options[name] = value
+    if 'port' in options:
+        try:
+            options['port'] = int(options['port'])
+        except ValueError:
+            raise ValueError("Invalid port number provided")
+    if 'socket_path' not in options and 'port' not in options:
+        raise ValueError("Either --socket PATH or --port N is required")
+    return options
@@ -0,0 +1,287 @@
+"""
+Opt-in instrumentation for the Calculator operations.
+
+``InstrumentedCalculator`` wraps any object with ``add``/``subtract``/
+``multiply``/``divide`` methods (and any other registered operation it
+has), like ``CachedCalculator`` does, and records for each operation:
+
+- the number of calls;
+- the number of errors by kind, the ``calculator.batch.ErrorCode`` name
+  also used by batch mode (``TYPE_ERROR``, ``NAN_INPUT``,
+  ``ZERO_DIVISION``, ``NAN_RESULT``, ``INPUT_OVERFLOW``, ``OTHER``);
+- the number of overflows to infinity (finite operands, infinite result,
+  which ``Calculator`` returns instead of raising);
+- a latency histogram with fixed bucket bounds, and the total time.
+
+Nothing is wrapped unless you ask for it, so an uninstrumented calculator
+runs exactly as fast as before. Counters are kept per thread (see
+``PerThread``), so threads sharing one instrumented calculator never wait
+for each other; ``stats()`` merges them.
+
+``format_json`` and ``format_prometheus`` export a ``stats()`` snapshot
+as one JSON line or in the Prometheus text exposition format.
+"""
+import itertools
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .batch import _code_for
+from .registry import names
+
+# Latency bucket upper bounds in seconds (the last bucket is unbounded)
+DEFAULT_BUCKETS = (1e-7, 2.5e-7, 5e-7, 1e-6, 2.5e-6, 5e-6, 1e-5, 1e-4, 1e-3)
+
+
+class OperationStats:
+    """Counters for one operation."""
+    __slots__ = ('calls', 'errors', 'overflows', 'seconds', 'counts')
+
+    def __init__(self, bucket_count: int) -> None:
+        self.calls = 0
+        self.errors: Dict[str, int] = {}
+        self.overflows = 0
+        self.seconds = 0.0
+        self.counts = [0] * (bucket_count + 1)
+
+
+class _ThreadExit:
+    """Stored in a thread's local data: collected when the thread exits."""
+    __slots__ = ('__weakref__',)
+
+
+def _retire(owner: "weakref.ref", key: int) -> None:
+    per_thread = owner()
+    if per_thread is not None:
+        per_thread._retire(key)
+
+
+class PerThread:
+    """One object per thread, made by ``factory`` on the thread's first use.
+
+    Each thread only writes to its own object, so counting needs no lock,
+    even without the GIL. When a thread exits, ``merge(total, value)``
+    folds its object into the total of finished threads and the object is
+    dropped, so memory does not grow with the number of threads that ever
+    used it (a threaded server starts one per connection). ``values()``
+    returns the objects of the running threads and that total, for merging.
+    """
+
+    def __init__(self, factory: Callable[[], object],
+                 merge: Callable[[object, object], None]) -> None:
+        self._factory = factory
+        self._merge = merge
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._values: Dict[int, object] = {}
+        self._keys = itertools.count()
+        self._retired = factory()
+
+    def get(self) -> object:
+        """Return the calling thread's object."""
+        try:
+            return self._local.value
+        except AttributeError:
+            value = self._factory()
+            key = next(self._keys)
+            with self._lock:
+                self._values[key] = value
+            sentinel = _ThreadExit()
+            weakref.finalize(sentinel, _retire, weakref.ref(self), key).atexit = False
+            self._local.sentinel = sentinel
+            self._local.value = value
+            return value
+
+    def _retire(self, key: int) -> None:
+        """Fold an exited thread's object into the total of finished threads."""
+        with self._lock:
+            value = self._values.pop(key)
+            # A new total, so a values() snapshot never sees a value counted twice
+            total = self._factory()
+            self._merge(total, self._retired)
+            self._merge(total, value)
+            self._retired = total
+
+    def values(self) -> List[object]:
+        """Return the objects of the running threads and the total of finished ones."""
+        with self._lock:
+            return [*self._values.values(), self._retired]
+
+    def reset(self, clear: Callable[[object], None]) -> None:
+        """Apply ``clear`` to the running threads' objects and drop the finished threads' total.
+
+        Holds the lock, so a thread exiting meanwhile cannot fold counts from
+        before the reset into the new total.
+        """
+        with self._lock:
+            for value in self._values.values():
+                clear(value)
+            self._retired = self._factory()
+
+
+def _is_overflow(result: object, operands: tuple) -> bool:
+    """Check for an infinite float result from finite operands."""
+    if result.__class__ is not float or result - result == 0:
+        return False
+    return result == result and all(value - value == 0 for value in operands)
+
+
+def _merge_records(total: Dict[str, OperationStats], records: Dict[str, OperationStats]) -> None:
+    """Add one thread's counters to ``total``."""
+    for name, record in records.items():
+        merged = total[name]
+        merged.calls += record.calls
+        for kind, count in list(record.errors.items()):
+            merged.errors[kind] = merged.errors.get(kind, 0) + count
+        merged.overflows += record.overflows
+        merged.seconds += record.seconds
+        merged.counts = [a + b for a, b in zip(merged.counts, record.counts)]
+
+
+def _clear_records(records: Dict[str, OperationStats]) -> None:
+    for record in records.values():
+        record.calls = 0
+        record.errors.clear()
+        record.overflows = 0
+        record.seconds = 0.0
+        record.counts[:] = [0] * len(record.counts)
+
+
+class InstrumentedCalculator:
+    """Calculator wrapper that counts calls, errors and latency per operation."""
+
+    def __init__(self, calc: Optional[object] = None,
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        if calc is None:
+            from . import Calculator
+            calc = Calculator()
+        self.calc = calc
+        self.buckets = tuple(sorted(buckets))
+        self.operations: List[str] = []
+        for name in names():
+            method = getattr(calc, name, None)
+            if method is not None:
+                self.operations.append(name)
+                setattr(self, name, self._wrap(name, method))
+        self._records = PerThread(self._new_records, _merge_records)
+
+    def _new_records(self) -> Dict[str, OperationStats]:
+        return {name: OperationStats(len(self.buckets)) for name in self.operations}
+
+    def _wrap(self, name: str, method: Callable) -> Callable:
+        bounds = self.buckets
+        counter = time.perf_counter
+
+        def instrumented(*operands):
+            start = counter()
+            try:
+                result = method(*operands)
+            except Exception as error:
+                elapsed = counter() - start
+                record = self._records.get()[name]
+                kind = _code_for(error).name
+                record.calls += 1
+                record.errors[kind] = record.errors.get(kind, 0) + 1
+                record.seconds += elapsed
+                record.counts[bisect_left(bounds, elapsed)] += 1
+                raise
+            elapsed = counter() - start
+            record = self._records.get()[name]
+            record.calls += 1
+            record.overflows += _is_overflow(result, operands)
+            record.seconds += elapsed
+            record.counts[bisect_left(bounds, elapsed)] += 1
+            return result
+
+        instrumented.__name__ = name
+        instrumented.__doc__ = method.__doc__
+        return instrumented
+
+    def stats(self) -> Dict[str, object]:
+        """Return a snapshot of the counters (histogram buckets are cumulative)."""
+        merged = self._new_records()
+        for records in self._records.values():
+            _merge_records(merged, records)
+        report = {}
+        for name, record in merged.items():
+            cumulative = 0
+            buckets: List[list] = []
+            for bound, count in zip(self.buckets + (float('inf'),), record.counts):
+                cumulative += count
+                buckets.append([bound, cumulative])
+            report[name] = {
+                'calls': record.calls,
+                'errors': record.errors,
+                'overflows': record.overflows,
+                'seconds': record.seconds,
+                'buckets': buckets,
+            }
+        return report
+
+    def reset(self) -> None:
+        """Set every counter back to zero.
+
+        Calls running in other threads at the same time may or may not be
+        counted.
+        """
+        self._records.reset(_clear_records)
+
+
+def format_json(report: Dict[str, object]) -> str:
+    """Export a ``stats()`` snapshot as one line of JSON."""
+    import json
+
+    # JSON has no infinity: the unbounded bucket is written as "+Inf"
+    operations = {
+        name: {**record, 'buckets': [[_bound(bound), count] for bound, count in record['buckets']]}
+        for name, record in report.items()
+    }
+    return json.dumps({'operations': operations}, separators=(',', ':'))
+
+
+def _bound(value: float) -> object:
+    return "+Inf" if value == float('inf') else value
+
+
+def format_prometheus(report: Dict[str, object]) -> str:
+    """Export a ``stats()`` snapshot in the Prometheus text format.
+
+    Also accepts the ``operations`` of a snapshot read back from
+    ``format_json`` output.
+    """
+    lines = [
+        "# HELP calculator_operations_total Calls per calculator operation.",
+        "# TYPE calculator_operations_total counter",
+    ]
+    lines += [f'calculator_operations_total{{operation="{name}"}} {record["calls"]}'
+              for name, record in report.items()]
+    lines += [
+        "# HELP calculator_errors_total Errors per operation and error kind.",
+        "# TYPE calculator_errors_total counter",
+    ]
+    for name, record in report.items():
+        for kind, count in sorted(record['errors'].items()):
+            lines.append(f'calculator_errors_total{{operation="{name}",error="{kind}"}} {count}')
+    lines += [
+        "# HELP calculator_overflows_total Results that overflowed to infinity.",
+        "# TYPE calculator_overflows_total counter",
+    ]
+    lines += [f'calculator_overflows_total{{operation="{name}"}} {record["overflows"]}'
+              for name, record in report.items()]
+    lines += [
+        "# HELP calculator_operation_seconds Time spent per operation call.",
+        "# TYPE calculator_operation_seconds histogram",
+    ]
+    for name, record in report.items():
+        for bound, count in record['buckets']:
+            le = "+Inf" if bound in (float('inf'), "+Inf") else repr(bound)
+            lines.append(f'calculator_operation_seconds_bucket{{operation="{name}",le="{le}"}} {count}')
+        lines.append(f'calculator_operation_seconds_sum{{operation="{name}"}} {record["seconds"]!r}')
+        lines.append(f'calculator_operation_seconds_count{{operation="{name}"}} {record["calls"]}')
+    return "\n".join(lines) + "\n"
+
+
+# Export formats by --stats name
+FORMATS = {'json': format_json, 'prometheus': format_prometheus}
@@ -0,0 +1,256 @@
+"""
+Multi-threaded batch arithmetic.
+
+``ThreadedBatch`` runs the ``*_many`` operations on a thread pool, for
+programs that already share one process between many threads (a request
+server, say) and cannot hand batches to worker processes. Each batch is
+split into chunks of ``chunk_size`` elements that run in parallel; the
+results are the same, in the same order, with the same first error, as
+``Calculator.*_many``, whatever order the chunks finish in.
+
+With NumPy installed, float operands run through the NumPy engine (see
+``calculator.engines``), whose ufuncs release the GIL, so the chunks run
+in parallel on any CPython; ``set_engine('python')`` turns that off. Other
+operands run through the pure-Python batch code, which only runs in
+parallel on free-threaded (no-GIL) builds; with the GIL, threads cannot
+help, and those batches run in the calling thread.
+
+Nothing mutable is shared on the hot path: each batch owns its buffers
+and each chunk writes a separate slice of them. The counters behind
+``stats()`` are kept per thread and merged when read.
+
+    with ThreadedBatch(workers=4) as pool:
+        result = pool.add_many(a, b)
+"""
+import os
+import sys
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from .batch import _CAUGHT, BatchResult, _dispatch, _is_ndarray, _replay
+from .batch import _float64 as _convertible
+from .engines import ENGINES, engine_for, first_failure
+from .registry import BUILTINS, get
+from .stats import PerThread
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+def _gil_enabled() -> bool:
+    """Check whether this interpreter runs with the GIL."""
+    check = getattr(sys, '_is_gil_enabled', None)
+    return True if check is None else check()
+
+
+def _float64(values):
+    """Return ``values`` as a NumPy array the NumPy engine takes without changing any result.
+
+    Returns None when the pure-Python path must run instead: NumPy is
+    missing, or the values are not all floats (converting ints could round
+    them before the operation instead of after it). NumPy arrays of ints a
+    float holds exactly are kept as they are, so the engine still sees ints.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    if _is_ndarray(values):
+        # The same check as Calculator.*_many makes before handing them to an engine
+        return values if _convertible(values) is not None else None
+    if isinstance(values, (array, memoryview)):
+        typecode = values.typecode if isinstance(values, array) else values.format
+        return np.frombuffer(values, dtype=np.float64) if typecode == "d" else None
+    if set(map(type, values)) <= {float}:
+        return np.array(values, dtype=np.float64)
+    return None
+
+
+def _merge_counters(total: Dict[str, List[int]], counters: Dict[str, List[int]]) -> None:
+    """Add one thread's ``{operation: [batches, elements, failed]}`` to ``total``."""
+    for operation, record in counters.items():
+        merged = total.setdefault(operation, [0, 0, 0])
+        for index, count in enumerate(record):
+            merged[index] += count
+
+
+class ThreadedBatch:
+    """Batch operations split into chunks that run on a pool of threads.
+
+    ``workers`` defaults to the number of CPUs. Batches of at most
+    ``chunk_size`` elements, or any batch when ``workers`` is 1, run in the
+    calling thread. One executor can be shared by any number of threads.
+    """
+
+    def __init__(self, workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("Worker count must be at least 1")
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1")
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        # Per thread: {operation: [batches, elements, failed elements]}
+        self._counters = PerThread(dict, _merge_counters)
+
+    def __enter__(self) -> "ThreadedBatch":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker threads."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def _executor(self) -> ThreadPoolExecutor:
+        pool = self._pool
+        if pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix="calculator")
+                pool = self._pool
+        return pool
+
+    def _count(self, operation: str, size: int, failed: int) -> None:
+        counters = self._counters.get()
+        record = counters.get(operation)
+        if record is None:
+            record = counters[operation] = [0, 0, 0]
+        record[0] += 1
+        record[1] += size
+        record[2] += failed
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return the batches, elements and failed elements per operation.
+
+        A batch that raises counts one failed element: the one it reports.
+        """
+        merged: Dict[str, Dict[str, int]] = {}
+        for counters in self._counters.values():
+            for operation, (batches, elements, failed) in list(counters.items()):
+                total = merged.setdefault(operation, {'batches': 0, 'elements': 0, 'failed': 0})
+                total['batches'] += batches
+                total['elements'] += elements
+                total['failed'] += failed
+        return merged
+
+    def _chunks(self, size: int) -> List[tuple]:
+        step = self.chunk_size
+        return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+    def _evaluate(self, operation: str, a, b, errors: str):
+        if len(a) != len(b):
+            raise ValueError(
+                f"Operand sequences must have the same length (got {len(a)} and {len(b)})"
+            )
+        if errors not in ("raise", "collect"):
+            raise ValueError(f"Unknown errors mode: {errors} (use 'raise' or 'collect')")
+        size = len(a)
+        fa = fb = None
+        if operation in BUILTINS and self.workers > 1 and size > self.chunk_size \
+                and engine_for(True) is ENGINES["numpy"]:
+            fa = _float64(a)
+            fb = _float64(b) if fa is not None else None
+        try:
+            if fa is not None and fb is not None:
+                keep_ndarray = _is_ndarray(a) or _is_ndarray(b)
+                result = self._evaluate_numpy(operation, fa, fb, errors, keep_ndarray)
+            elif self.workers > 1 and size > self.chunk_size and not _gil_enabled():
+                result = self._evaluate_python(operation, a, b, errors)
+            else:
+                result = _dispatch(operation, a, b, errors)
+        except _CAUGHT:
+            self._count(operation, size, 1)
+            raise
+        self._count(operation, size, result.failed if errors == "collect" else 0)
+        return result
+
+    def _evaluate_numpy(self, operation: str, a, b, errors: str, keep_ndarray: bool):
+        import numpy as np
+
+        size = len(a)
+        out = np.empty(size, dtype=np.float64)
+        codes = np.empty(size, dtype=np.uint8)
+        engine = ENGINES["numpy"]
+
+        def run(bounds: tuple) -> Optional[int]:
+            start, stop = bounds
+            chunk_codes = codes[start:stop]
+            _, _, failed = engine.compute(operation, a[start:stop], b[start:stop],
+                                          out[start:stop], chunk_codes)
+            if failed and errors == "raise":
+                return start + first_failure(chunk_codes)
+            return None
+
+        failures = [index for index in self._executor().map(run, self._chunks(size))
+                    if index is not None]
+        if failures:
+            index = failures[0]  # Chunks come back in order: the first is the lowest
+            _replay(operation, a[index].item(), b[index].item(), index)
+        if errors == "collect":
+            return BatchResult(out, codes)
+        if keep_ndarray:
+            return out
+        result = array("d")
+        result.frombytes(memoryview(out).cast("B"))
+        return result
+
+    def _evaluate_python(self, operation: str, a, b, errors: str):
+        def run(bounds: tuple):
+            start, stop = bounds
+            try:
+                return _dispatch(operation, a[start:stop], b[start:stop], errors)
+            except _CAUGHT as error:
+                return error
+
+        results = list(self._executor().map(run, self._chunks(len(a))))
+        for (start, _), result in zip(self._chunks(len(a)), results):
+            if isinstance(result, BaseException):
+                _replay(operation, a[start + result.index], b[start + result.index],
+                        start + result.index)
+        if errors == "raise":
+            out = array("d")
+            for result in results:
+                out.extend(result)
+            return out
+        values = array("d")
+        codes = array("B")
+        exceptions = {}
+        for (start, _), result in zip(self._chunks(len(a)), results):
+            values.extend(result.values)
+            codes.extend(result.codes)
+            for index, error in result._exceptions.items():
+                exceptions[start + index] = error
+        return BatchResult(values, codes, exceptions)
+
+    def add_many(self, a, b, errors: str = "raise"):
+        """Add two sequences of numbers element-wise."""
+        return self._evaluate("add", a, b, errors)
+
+    def subtract_many(self, a, b, errors: str = "raise"):
+        """Subtract the second sequence from the first element-wise."""
+        return self._evaluate("subtract", a, b, errors)
+
+    def multiply_many(self, a, b, errors: str = "raise"):
+        """Multiply two sequences of numbers element-wise."""
+        return self._evaluate("multiply", a, b, errors)
+
+    def divide_many(self, a, b, errors: str = "raise"):
+        """Divide the first sequence by the second element-wise."""
+        return self._evaluate("divide", a, b, errors)
+
+    def apply_many(self, operation: str, a, b, errors: str = "raise"):
+        """Apply any registered two-operand operation element-wise."""
+        if get(operation).arity != 2:
+            raise ValueError(f"Operation {operation} does not take two operands")
+        return self._evaluate(operation, a, b, errors)
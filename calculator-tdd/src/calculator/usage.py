@@ -0,0 +1,85 @@
+"""
+Help text for the calculator command line.
+"""
+
+USAGE = """
+Calculator CLI Usage:
+    python -m calculator <operation> <num1> <num2>
+    python -m calculator (sum | product | mean) <num1> [num2 ...]
+    python -m calculator eval "<expression>" [name=value ...]
+    python -m calculator --stream [--aggregate sum|product|mean|running-sum] [file]
+    python -m calculator --jsonl [file]
+    python -m calculator serve (--socket PATH | --port N [--host HOST])
+        [--async [--max-connections N] [--max-queue N]]
+    python -m calculator client (--socket PATH | --port N) [<operation> <num1> <num2>]
+    python -m calculator batch --op OPERATION --a A.f64 --b B.f64 --out OUT.f64
+        [--errors ERRORS.u8] [--chunk-size N]
+    python -m calculator csv (--op OPERATION --a COLUMN --b COLUMN | --expr EXPRESSION)
+        [--result NAME] [--delimiter C | --tsv] [file]
+    python -m calculator repl [--history FILE]
+    python -m calculator daemon [--socket PATH] [--idle SECONDS]
+    python -m calculator replay LOG [--max-divergences N]
+
+Operations:
+    add       - Add two numbers
+    subtract  - Subtract second number from first
+    multiply  - Multiply two numbers
+    divide    - Divide first number by second
+    sum       - Add any number of numbers (compensated, no rounding drift)
+    product   - Multiply any number of numbers
+    mean      - Average any number of numbers
+    eval      - Evaluate an expression using + - * / and parentheses
+
+Examples:
+    python -m calculator add 5 3
+    python -m calculator multiply 4.5 2
+    python -m calculator eval "(a + b) * c / d" a=1 b=2 c=3 d=4
+    printf 'add 1 2\\ndivide 1 0\\n' | python -m calculator --stream
+    echo '{"op": "divide", "a": 1, "b": 4}' | python -m calculator --jsonl
+    python -m calculator sum 0.1 0.2 0.3
+    cut -d, -f3 data.csv | python -m calculator --stream --aggregate mean
+    python -m calculator csv --expr "price * qty" --result total orders.csv
+
+Options (any mode):
+    --cache N             Cache up to N results (useful with --stream/serve)
+    --cache-policy P      Cache eviction policy: lru (default) or lfu
+    --exact               Exact results: ints stay ints, other values are fractions
+    --precision N         With --exact: use decimals rounded to N digits instead
+    --stats FORMAT        Count calls, errors and latency per operation and
+                          print them to stderr at exit: json or prometheus
+    --log FILE            Append a binary record of every calculation to FILE
+
+Stream mode reads one "<operation> <num1> <num2>" per line from the file
+(or stdin) and writes one "Result: ..." or "Error: ..." line per input.
+With --aggregate, it reads one number per line instead and writes one
+result (or the running sum after every line).
+JSON lines mode reads one {"op": ..., "a": ..., "b": ...} request per
+line and writes one {"result": ...} or {"error": "..."} line per request.
+The server answers the same lines over a socket (HOST must be a loopback
+address); the client sends one calculation, or every line of stdin when
+no calculation is given.
+With --stats, the line "metrics" returns the counters so far as JSON;
+"client ... metrics prometheus" prints them in the Prometheus format.
+
+The repl mode reads calculations interactively from one warm process.
+"ans" is the last result and "name = <calculation>" stores one; both can
+be used as operands. Type :help in a session for its commands.
+
+With CALCULATOR_DAEMON=1 in the environment, calculations are forwarded
+to a background daemon, started on first use, that keeps the calculator
+loaded and exits after CALCULATOR_DAEMON_IDLE seconds (default 300)
+without a call. The output is the same either way.
+
+CSV mode copies each row of a delimited file with a header row and
+appends a result column computed from the named columns. Rows that
+cannot be computed get an "Error: ..." cell. The row rate is reported
+on stderr.
+
+Batch mode applies an operation to two raw float64 files, writing a
+float64 result file. It stops at the first error unless --errors is
+given; that file then gets one error code byte per element (0 ok,
+1 NaN input, 2 division by zero, 3 NaN result, 4 overflow).
+
+Replay mode re-evaluates every calculation of a --log file and reports
+the ones whose result or error differs from the logged one.
+"""
@@ -0,0 +1,185 @@
+"""
+Tests for the asyncio calculator server.
+
+Testing Strategy:
+- Responses match the CLI output and arrive in request order
+- Many concurrent connections are served
+- The connection limit rejects extra clients; limits below 1 are refused
+- A line longer than MAX_LINE gets an error and closes its connection
+- A small queue still delivers every response (backpressure, no loss)
+- The ``stats`` request reports per-operation latency percentiles
+- A request that raises inside the worker gets an error line, and the worker
+  keeps serving that client and new ones
+- Non-loopback hosts and non-socket files at the socket path are refused
+All servers listen on localhost only.
+"""
+
+import asyncio
+import json
+from io import StringIO
+from unittest.mock import patch
+import pytest
+from src.calculator.__main__ import CalculatorCLI
+from src.calculator.async_server import AsyncCalculatorServer, percentile
+from src.calculator.server import MAX_LINE
+from src.calculator.registry import register, unregister
+
+
+async def _exchange(port: int, requests: list) -> list:
+    """Send pipelined requests and read one response line per request."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write("".join(f"{request}\n" for request in requests).encode())
+    await writer.drain()
+    responses = [(await reader.readline()).decode().rstrip("\n") for _ in requests]
+    writer.close()
+    await writer.wait_closed()
+    return responses
+
+
+def _run_with_server(scenario, **limits):
+    """Start a server on a free port, run the scenario, then close it."""
+    async def main():
+        server = AsyncCalculatorServer(**limits)
+        await server.start(port=0)
+        try:
+            return await scenario(server, server.address[1])
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+
+def test_responses_in_order() -> None:
+    """Test that pipelined requests are answered in order."""
+    async def scenario(server, port):
+        return await _exchange(port, ["add 5 3", "divide 1 0", "multiply x 2", "eval (1+2)*3"])
+    assert _run_with_server(scenario) == [
+        "Result: 8.0",
+        "Error: Cannot divide by zero",
+        "Error: Invalid number format provided",
+        "Result: 9.0",
+    ]
+
+
+def test_concurrent_connections() -> None:
+    """Test that many clients are served concurrently."""
+    async def scenario(server, port):
+        return await asyncio.gather(*(
+            _exchange(port, [f"add {n} {i}" for i in range(100)]) for n in range(50)
+        ))
+    results = _run_with_server(scenario)
+    for n, responses in enumerate(results):
+        assert responses == [f"Result: {float(n + i)}" for i in range(100)]
+
+
+def test_connection_limit() -> None:
+    """Test that connections beyond the limit are rejected."""
+    async def scenario(server, port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b"add 1 1\n")
+        assert await reader.readline() == b"Result: 2.0\n"
+        rejected = await _exchange(port, ["add 1 2"])
+        writer.close()
+        await writer.wait_closed()
+        return rejected
+    assert _run_with_server(scenario, max_connections=1) == ["Error: Too many connections"]
+
+
+def test_backpressure_delivers_everything() -> None:
+    """Test that tiny queue limits slow clients down without losing responses."""
+    async def scenario(server, port):
+        return await asyncio.gather(*(
+            _exchange(port, [f"multiply {i} {n}" for i in range(3000)]) for n in range(4)
+        ))
+    results = _run_with_server(scenario, max_queue=1, max_pending=1)
+    for n, responses in enumerate(results):
+        assert responses == [f"Result: {float(i * n)}" for i in range(3000)]
+
+
+def test_limits_must_be_positive() -> None:
+    """Test that zero or negative limits are rejected, by the server and the CLI."""
+    for limit in ('max_connections', 'max_queue', 'max_pending'):
+        for value in (0, -1):
+            with pytest.raises(ValueError, match="must be at least 1"):
+                AsyncCalculatorServer(**{limit: value})
+    for option in ('--max-connections', '--max-queue'):
+        for value in ('0', '-5', 'x'):
+            with patch('sys.stdout', new=StringIO()) as fake_out:
+                CalculatorCLI().run(['serve', '--async', '--port', '0', option, value])
+            assert fake_out.getvalue() == f"Error: Invalid value for {option}: {value}\n"
+
+
+def test_long_line_closes_connection() -> None:
+    """Test that a line longer than MAX_LINE is answered with an error and the connection closed."""
+    async def scenario(server, port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        # One byte over: the server has read everything when it closes, so no reset
+        writer.write(b"add 1 2\n" + b"1" * (MAX_LINE + 1))
+        await writer.drain()
+        responses = await reader.read()
+        writer.close()
+        return responses, await _exchange(port, ["add 2 2"])
+    responses, after = _run_with_server(scenario)
+    assert responses == b"Result: 3.0\nError: Request line too long\n"
+    assert after == ["Result: 4.0"]
+
+
+def test_latency_stats() -> None:
+    """Test per-operation latency percentiles."""
+    async def scenario(server, port):
+        responses = await _exchange(port, ["add 1 2"] * 10 + ["divide 1 0", "stats"])
+        return server, responses
+    server, responses = _run_with_server(scenario)
+    report = json.loads(responses[-1])
+    assert set(report) == {'add', 'subtract', 'multiply', 'divide'}
+    assert report['add']['count'] == 10
+    assert report['divide']['count'] == 1
+    assert report['subtract']['count'] == 0
+    assert 0 <= report['add']['p50'] <= report['add']['p99'] <= report['add']['max']
+    assert server.stats()['add']['count'] == 10
+
+
+def test_worker_survives_failing_request() -> None:
+    """Test that an exception the CLI does not catch is answered, not fatal."""
+    def explode(a, b):
+        raise RuntimeError("operation exploded")
+
+    async def scenario(server, port):
+        first = await asyncio.wait_for(
+            _exchange(port, ["add 1 2", "explode 1 2", "multiply 2 3"]), timeout=5)
+        second = await asyncio.wait_for(_exchange(port, ["subtract 5 3"]), timeout=5)
+        return first, second, server._worker.done()
+
+    register('explode', explode)
+    try:
+        first, second, worker_done = _run_with_server(scenario)
+    finally:
+        unregister('explode')
+    assert first == ["Result: 3.0", "Error: operation exploded", "Result: 6.0"]
+    assert second == ["Result: 2.0"]
+    assert not worker_done
+
+
+def test_refuses_unsafe_addresses(tmp_path) -> None:
+    """Test the host and socket path checks shared with the threaded server."""
+    path = tmp_path / "data.txt"
+    path.write_text("keep me")
+
+    async def main():
+        for options in ({'host': '0.0.0.0'}, {'socket_path': str(path)}):
+            with pytest.raises(ValueError):
+                await AsyncCalculatorServer().start(**options)
+    asyncio.run(main())
+    assert path.read_text() == "keep me"
+
+
+def test_percentile() -> None:
+    """Test the nearest-rank percentile helper."""
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 0.5) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile(values, 1.0) == 100.0
+    assert percentile([], 0.5) == 0.0
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,219 @@
+"""
+Tests for the batch (element-wise) Calculator operations.
+
+Testing Strategy:
+- Results match the scalar methods for lists, arrays and memoryviews
+- Each scalar error is raised for the first offending element
+- Error messages and the ``index`` attribute report the position
+- NumPy arrays take the vectorised path when NumPy is installed, and int arrays
+  give the scalar results there too, down to the sign of zero products
+- errors='collect' records one error code per element instead of raising,
+  and rebuilds each element's exception only when it is accessed
+"""
+
+import math
+from array import array
+import pytest
+from src.calculator import Calculator
+from src.calculator.batch import BatchResult, ErrorCode, apply_many
+
+
+def test_add_many_lists() -> None:
+    """Test element-wise addition of two lists."""
+    result = Calculator.add_many([1, 2.5, -3], [4, 0.5, 3])
+    assert isinstance(result, array)
+    assert list(result) == [5.0, 3.0, 0.0]
+
+
+def test_subtract_many_arrays() -> None:
+    """Test element-wise subtraction of two float arrays."""
+    a = array('d', [10.0, 5.5, 0.0])
+    b = array('d', [4.0, 2.2, 5.0])
+    result = Calculator.subtract_many(a, b)
+    assert list(result) == [Calculator.subtract(x, y) for x, y in zip(a, b)]
+
+
+def test_multiply_many_memoryview() -> None:
+    """Test element-wise multiplication of buffer operands."""
+    a = memoryview(array('d', [2.5, 3.0]))
+    b = memoryview(array('d', [4.0, -2.0]))
+    assert list(Calculator.multiply_many(a, b)) == [10.0, -6.0]
+
+
+def test_divide_many_lists() -> None:
+    """Test element-wise division of two lists."""
+    assert list(Calculator.divide_many([15, 7.5, 1], [3, 2.5, 4])) == [5.0, 3.0, 0.25]
+
+
+def test_empty_operands() -> None:
+    """Test that empty inputs give an empty result."""
+    assert len(Calculator.add_many([], [])) == 0
+
+
+def test_length_mismatch() -> None:
+    """Test that operands of different lengths are rejected."""
+    with pytest.raises(ValueError):
+        Calculator.add_many([1, 2], [1])
+
+
+def test_type_error_reports_index() -> None:
+    """Test that a non-numeric element raises TypeError with its index."""
+    with pytest.raises(TypeError) as exc_info:
+        Calculator.add_many([1, 2, "3"], [1, 2, 3])
+    assert exc_info.value.index == 2
+    assert "Cannot add str and int" in str(exc_info.value)
+    assert "index 2" in str(exc_info.value)
+
+
+def test_nan_input_reports_index() -> None:
+    """Test that a NaN input raises ValueError with its index."""
+    with pytest.raises(ValueError) as exc_info:
+        Calculator.multiply_many([1.0, 2.0, 3.0], [1.0, math.nan, 3.0])
+    assert exc_info.value.index == 1
+    assert "NaN" in str(exc_info.value)
+
+
+def test_first_error_wins() -> None:
+    """Test that the earliest failing element is reported."""
+    with pytest.raises(ValueError) as exc_info:
+        Calculator.add_many([1, math.nan, "x"], [1, 1, 1])
+    assert exc_info.value.index == 1
+
+
+def test_divide_by_zero_reports_index() -> None:
+    """Test that a zero divisor raises ZeroDivisionError with its index."""
+    with pytest.raises(ZeroDivisionError) as exc_info:
+        Calculator.divide_many([1, 2, 3, 4], [1, 2, -0.0, 4])
+    assert exc_info.value.index == 2
+    assert "Cannot divide by zero" in str(exc_info.value)
+
+
+def test_multiply_nan_result_reports_index() -> None:
+    """Test that inf * 0 raises the scalar NaN-result error."""
+    with pytest.raises(ValueError) as exc_info:
+        Calculator.multiply_many([1.0, math.inf], [2.0, 0.0])
+    assert exc_info.value.index == 1
+    assert "Result is not a number" in str(exc_info.value)
+
+
+def test_overflow_returns_inf() -> None:
+    """Test that results too large for a float become infinity."""
+    result = Calculator.add_many([10**308, 1e308], [10**308, 1e308])
+    assert list(result) == [math.inf, math.inf]
+
+
+def test_matches_scalar_methods() -> None:
+    """Test that batch results equal the scalar results."""
+    a = [0, 1, -7, 2.5, 1e-308, 10**20, math.inf]
+    b = [3, -1, 7, 0.1, 1e-308, 3, 2]
+    for name in ('add', 'subtract', 'multiply', 'divide'):
+        expected = [getattr(Calculator, name)(x, y) for x, y in zip(a, b)]
+        assert list(getattr(Calculator, f"{name}_many")(a, b)) == expected
+
+
+def test_numpy_arrays() -> None:
+    """Test the vectorised NumPy path."""
+    np = pytest.importorskip("numpy")
+    a = np.array([1.0, 2.0, 3.0])
+    b = np.array([4, 5, 6])
+    result = Calculator.multiply_many(a, b)
+    assert isinstance(result, np.ndarray)
+    assert result.tolist() == [4.0, 10.0, 18.0]
+
+
+def test_numpy_int_arrays_match_scalar_methods() -> None:
+    """Test that int arrays give the scalar results, whose int zero products are 0.0."""
+    np = pytest.importorskip("numpy")
+    a = [0, -2**53, 0, 5, -3]
+    b = [-1, 0, -7, -2, 4]
+    for name in ('add', 'subtract', 'multiply'):
+        expected = [getattr(Calculator, name)(x, y) for x, y in zip(a, b)]
+        for operands in ((np.array(a), np.array(b)), (array('q', a), array('q', b))):
+            result = getattr(Calculator, f"{name}_many")(*operands)
+            assert [(value, math.copysign(1, value)) for value in result] == \
+                [(value, math.copysign(1, value)) for value in expected]
+
+
+def test_numpy_errors_report_index() -> None:
+    """Test that NumPy inputs raise the same errors as the scalar methods."""
+    np = pytest.importorskip("numpy")
+    with pytest.raises(ZeroDivisionError) as exc_info:
+        Calculator.divide_many(np.ones(5), np.array([1.0, 1.0, 1.0, 0.0, 1.0]))
+    assert exc_info.value.index == 3
+    with pytest.raises(ValueError) as exc_info:
+        Calculator.subtract_many(np.array([1.0, np.nan]), np.ones(2))
+    assert exc_info.value.index == 1
+
+
+def test_collect_errors_codes() -> None:
+    """Test that each scalar exception gets its own error code."""
+    result = Calculator.divide_many([1, 2, "x", math.nan, 1e308, 10**400],
+                                    [2, 0, 1, 1, 1e-308, 1], errors='collect')
+    assert isinstance(result, BatchResult)
+    assert list(result.codes) == [
+        ErrorCode.OK, ErrorCode.ZERO_DIVISION, ErrorCode.TYPE_ERROR,
+        ErrorCode.NAN_INPUT, ErrorCode.OVERFLOW, ErrorCode.INPUT_OVERFLOW,
+    ]
+    assert result.values.itemsize == 8 and result.codes.itemsize == 1
+    assert result.failed == 4
+    assert result[0] == 0.5 and result[4] == math.inf
+    assert math.isnan(result.values[1])
+    assert list(Calculator.multiply_many([math.inf, 2], [0, 3], errors='collect').codes) == [
+        ErrorCode.NAN_RESULT, ErrorCode.OK]
+
+    # Numeric operands take the C-level path, with zero divisors set aside
+    result = Calculator.divide_many(array('d', [1, 2, 3]), memoryview(array('d', [0, 4, 0])),
+                                    errors='collect')
+    assert list(result.codes) == [ErrorCode.ZERO_DIVISION, ErrorCode.OK, ErrorCode.ZERO_DIVISION]
+    assert result[1] == 0.5 and result.failed == 2
+
+
+def test_collect_errors_materialize_lazily() -> None:
+    """Test that failed elements raise the scalar exception on access."""
+    a = [1, 2, "x", math.nan]
+    b = [2, 0, 1, 1]
+    result = Calculator.divide_many(a, b, errors='collect')
+    for index, (x, y) in enumerate(zip(a, b)):
+        try:
+            expected = Calculator.divide(x, y)
+        except (TypeError, ValueError, ZeroDivisionError) as error:
+            with pytest.raises(type(error)) as exc_info:
+                result[index]
+            assert str(exc_info.value) == f"{error} (at index {index})"
+            assert result.error(index).index == index
+        else:
+            assert result[index] == expected
+            assert result.error(index) is None
+    assert [index for index, _ in result.errors()] == [1, 2, 3]
+    with pytest.raises(ZeroDivisionError):
+        list(result)
+    with pytest.raises(ZeroDivisionError):
+        result.unwrap()
+
+
+def test_collect_errors_views() -> None:
+    """Test that slices share memory and report their own indices."""
+    result = apply_many('add', [1, 2, math.nan, 4, "x"], [1] * 5, errors='collect')
+    view = result[2:]
+    assert len(view) == 3
+    assert view.values.obj is result.values.obj
+    with pytest.raises(ValueError, match=r"\(at index 0\)"):
+        view[0]
+    assert str(view.error(-1)) == "Cannot add str and int (at index 2)"
+    assert list(result[:2]) == [2.0, 3.0]
+    assert result[1::3][0] == 3.0
+    assert list(Calculator.add_many([1], [2], errors='collect').unwrap()) == [3.0]
+    with pytest.raises(ValueError, match="Unknown errors mode"):
+        Calculator.add_many([1], [2], errors='ignore')
+
+
+def test_collect_errors_numpy() -> None:
+    """Test that NumPy inputs give the same codes as the pure-Python path."""
+    np = pytest.importorskip("numpy")
+    a = [1.0, 2.0, math.nan, 1e308, math.inf]
+    b = [0.0, 4.0, 1.0, 1e-308, 0.0]
+    for name in ('add', 'multiply', 'divide'):
+        expected = apply_many(name, a, b, errors='collect')
+        result = apply_many(name, np.array(a), np.array(b), errors='collect')
+        assert result.codes.tolist() == expected.codes.tolist()
+        assert result.failed == expected.failed
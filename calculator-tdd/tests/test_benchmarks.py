@@ -0,0 +1,59 @@
+"""
+Tests for the benchmark harness in ``benchmarks/run.py``.
+
+Testing Strategy:
+- Cases cover every operation, distribution and entry point
+- A tiny run produces JSON-serialisable results
+- The baseline comparison flags only slowdowns beyond the threshold
+"""
+
+import json
+import pytest
+from benchmarks.run import cli_cases, compare, main, run_benchmarks, scalar_cases
+
+
+def test_cases_cover_entry_points() -> None:
+    """Test that every operation is timed for each entry point and distribution."""
+    names = {name for name, _, _ in scalar_cases() + cli_cases()}
+    for op in ('add', 'subtract', 'multiply', 'divide'):
+        for dist in ('ints', 'floats', 'huge_ints', 'errors'):
+            assert f"Calculator.{op}[{dist}]" in names
+            assert f"function.{op}[{dist}]" in names
+        assert f"CLI.calculate.{op}[floats]" in names
+
+
+def test_tiny_run_is_json() -> None:
+    """Test a minimal run of a filtered subset."""
+    report = run_benchmarks(number=10, repeat=1, process_runs=0, selected="Calculator.add")
+    assert set(report['results']) == {
+        "Calculator.add[ints]", "Calculator.add[floats]",
+        "Calculator.add[huge_ints]", "Calculator.add[errors]",
+    }
+    assert all(r['ns_per_call'] > 0 for r in report['results'].values())
+    json.dumps(report)
+
+
+def test_compare_flags_regressions() -> None:
+    """Test that only cases slower than the threshold are reported."""
+    baseline = {'results': {'a': {'ns_per_call': 100.0}, 'b': {'ns_per_call': 100.0}}}
+    current = {'results': {
+        'a': {'ns_per_call': 105.0},
+        'b': {'ns_per_call': 150.0},
+        'new': {'ns_per_call': 1.0},
+    }}
+    regressions = compare(current, baseline, threshold=0.10)
+    assert [name for name, *_ in regressions] == ['b']
+    assert regressions[0][3] == pytest.approx(0.5)
+
+
+def test_main_exit_status(tmp_path) -> None:
+    """Test that a regression against a saved baseline exits with status 1."""
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({'results': {'Calculator.add[ints]': {'ns_per_call': 0.001}}}))
+    assert main(['--quick', '--filter', 'Calculator.add[ints]', '--compare', str(baseline)]) == 1
+    baseline.write_text(json.dumps({'results': {'Calculator.add[ints]': {'ns_per_call': 1e9}}}))
+    assert main(['--quick', '--filter', 'Calculator.add[ints]', '--compare', str(baseline)]) == 0
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,168 @@
+"""
+Tests for the result cache.
+
+Testing Strategy:
+- Hits return the cached result without calling the operation again
+- Errors are cached and replayed with the same type and message
+- Keys keep int/float and 0.0/-0.0 apart
+- LRU and LFU evict the right entries; size and memory limits hold
+- The CLI --cache option caches results in stream mode
+"""
+
+from io import StringIO
+from unittest.mock import patch
+import pytest
+from src.calculator import Calculator
+from src.calculator.cache import CachedCalculator, LFUCache, LRUCache
+from src.calculator.__main__ import CalculatorCLI
+
+
+class CountingCalculator:
+    """Calculator that counts how often each operation really runs."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def _count(self, method, a, b):
+        self.calls += 1
+        return method(a, b)
+
+    def add(self, a, b):
+        return self._count(Calculator.add, a, b)
+
+    def subtract(self, a, b):
+        return self._count(Calculator.subtract, a, b)
+
+    def multiply(self, a, b):
+        return self._count(Calculator.multiply, a, b)
+
+    def divide(self, a, b):
+        return self._count(Calculator.divide, a, b)
+
+
+def test_cache_hits() -> None:
+    """Test that a repeated call is served from the cache."""
+    inner = CountingCalculator()
+    calc = CachedCalculator(inner)
+    assert calc.multiply(2.5, 4) == 10.0
+    assert calc.multiply(2.5, 4) == 10.0
+    assert inner.calls == 1
+    stats = calc.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1 and stats['entries'] == 1
+
+
+def test_operations_are_separate() -> None:
+    """Test that different operations on the same operands do not collide."""
+    calc = CachedCalculator()
+    assert calc.add(6, 3) == 9.0
+    assert calc.subtract(6, 3) == 3.0
+    assert calc.divide(6, 3) == 2.0
+
+
+def test_cached_errors_replayed() -> None:
+    """Test that errors are replayed without recomputation."""
+    inner = CountingCalculator()
+    calc = CachedCalculator(inner)
+    for _ in range(3):
+        with pytest.raises(ZeroDivisionError, match="Cannot divide by zero"):
+            calc.divide(10, 0)
+    with pytest.raises(TypeError):
+        calc.add("5", 3)
+    with pytest.raises(TypeError):
+        calc.add("5", 3)
+    assert inner.calls == 2
+
+
+def test_negative_zero_key() -> None:
+    """Test that 0.0 and -0.0 are cached separately."""
+    calc = CachedCalculator()
+    assert str(calc.multiply(0.0, 5.0)) == "0.0"
+    assert str(calc.multiply(-0.0, 5.0)) == "-0.0"
+    with pytest.raises(ZeroDivisionError):
+        calc.divide(1.0, -0.0)
+    assert calc.add(0.0, 1.0) == 1.0
+    assert calc.add(1.0, 1.0) == 2.0
+
+
+def test_int_and_float_keys() -> None:
+    """Test that int and float operands are cached separately."""
+    inner = CountingCalculator()
+    calc = CachedCalculator(inner)
+    calc.add(1, 2)
+    calc.add(1.0, 2.0)
+    calc.add(True, 2)
+    assert inner.calls == 3
+
+
+def test_unhashable_operands_bypass_cache() -> None:
+    """Test that unhashable operands go straight to the operation."""
+    calc = CachedCalculator()
+    with pytest.raises(TypeError):
+        calc.add([1], 2)
+    assert calc.stats()['entries'] == 0
+
+
+def test_lru_eviction() -> None:
+    """Test that LRU drops the least recently used entry."""
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.evictions == 1
+
+
+def test_lfu_eviction() -> None:
+    """Test that LFU drops the least frequently used entry."""
+    cache = LFUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.get('a')
+    cache.get('b')
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    cache.put('d', 4)
+    assert cache.get('c') is None
+    assert len(cache) == 2 and cache.evictions == 2
+
+
+def test_memory_limit() -> None:
+    """Test that the estimated memory stays under max_bytes."""
+    calc = CachedCalculator(maxsize=10**6, max_bytes=4096)
+    for i in range(1000):
+        calc.add(float(i), 1.0)
+    stats = calc.stats()
+    assert 0 < stats['bytes'] <= 4096
+    assert stats['entries'] < 1000
+    assert stats['evictions'] == 1000 - stats['entries']
+
+
+def test_invalid_options() -> None:
+    """Test that invalid cache settings are rejected."""
+    with pytest.raises(ValueError):
+        CachedCalculator(policy='fifo')
+    with pytest.raises(ValueError):
+        CachedCalculator(maxsize=0)
+
+
+def test_cli_cache_option() -> None:
+    """Test --cache in stream mode."""
+    cli = CalculatorCLI()
+    with patch('sys.stdin', new=StringIO("add 1 2\nadd 1 2\ndivide 1 0\ndivide 1 0\n")), \
+            patch('sys.stdout', new=StringIO()) as fake_out:
+        cli.run(['--stream', '--cache', '100', '--cache-policy', 'lfu'])
+    assert fake_out.getvalue().splitlines() == [
+        "Result: 3.0", "Result: 3.0",
+        "Error: Cannot divide by zero", "Error: Cannot divide by zero",
+    ]
+    stats = cli.calc.stats()
+    assert stats['policy'] == 'lfu'
+    assert stats['hits'] == 2 and stats['misses'] == 2
+
+
+if __name__ == "__main__":
+    pytest.main()
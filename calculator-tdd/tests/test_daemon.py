@@ -0,0 +1,159 @@
+"""
+Tests for forwarding CLI calls to the background daemon.
+
+Testing Strategy:
+- Forwarded calls print exactly what CalculatorCLI.run prints, on stdout and stderr
+- Calls that need the caller's process, or that no daemon answers, run locally
+- A missing daemon is spawned; an idle daemon exits and removes its own socket
+- The socket lives in a private directory, is created owner-only, and calls are
+  not forwarded through a shared directory or to another user's daemon
+- Only CALCULATOR_DAEMON=1 enables forwarding
+- End to end, python -m calculator gives the same output through the daemon
+  without importing the CLI module
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import threading
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from src.calculator import daemon
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="needs Unix sockets")
+
+PROJECT = Path(__file__).resolve().parent.parent
+
+
+def capture(function, *args) -> tuple:
+    """Call ``function`` and return (its result, stdout text, stderr text)."""
+    with patch('sys.stdout', new_callable=StringIO) as out, \
+            patch('sys.stderr', new_callable=StringIO) as err:
+        result = function(*args)
+    return result, out.getvalue(), err.getvalue()
+
+
+@pytest.fixture
+def running_daemon(tmp_path, monkeypatch):
+    """Serve a daemon on a private socket for the duration of a test."""
+    path = str(tmp_path / "calculator.sock")
+    monkeypatch.setenv('CALCULATOR_DAEMON_SOCKET', path)
+    server = daemon.create_daemon(path, idle=30)
+    thread = threading.Thread(target=daemon.serve, args=(server,), daemon=True)
+    thread.start()
+    yield path
+    server.idle_exit = True
+    with socket.socket(socket.AF_UNIX) as wake:  # Let the loop see idle_exit
+        wake.connect(path)
+    thread.join(5)
+    assert not os.path.exists(path)
+
+
+def test_forwarded_output_matches_in_process(running_daemon) -> None:
+    """Test that forwarded calls print exactly what a local run prints."""
+    from src.calculator.__main__ import CalculatorCLI
+
+    calls = [
+        ['add', '1', '2'], ['divide', '1', '0'], ['multiply', 'x', '2'], ['power', '2', '3'],
+        ['sum', '0.1', '0.2'], ['eval', '(a + 1) * 2', 'a=3'], ['--exact', 'divide', '1', '3'],
+        ['--stats', 'json', 'subtract', '5', '3'], ['--help'], [],
+    ]
+    for args in calls:
+        forwarded, out, err = capture(daemon.forward, args)
+        assert forwarded, args
+        _, expected_out, expected_err = capture(CalculatorCLI().run, args)
+        assert (out, err.split('"seconds"')[0]) == (expected_out, expected_err.split('"seconds"')[0])
+
+
+def test_calls_that_run_locally(running_daemon, monkeypatch) -> None:
+    """Test the calls that the client keeps in-process."""
+    for args in (['--stream'], ['csv', '--op', 'add'], ['--exact', 'repl'], ['daemon']):
+        assert daemon.forward(args) is False
+    assert daemon._answer(b"/another/copy\0add\x001\x002") == b"L"
+
+    spawned = []
+    monkeypatch.setattr(daemon, 'spawn', spawned.append)
+    monkeypatch.setenv('CALCULATOR_DAEMON_SOCKET', running_daemon + ".missing")
+    assert daemon.forward(['add', '1', '2']) is False
+    assert spawned == [running_daemon + ".missing"]
+
+
+def test_socket_is_private(running_daemon, tmp_path, monkeypatch) -> None:
+    """Test the socket location and the checks made before a call is forwarded."""
+    monkeypatch.delenv('CALCULATOR_DAEMON_SOCKET')
+    monkeypatch.delenv('XDG_RUNTIME_DIR', raising=False)
+    assert daemon.socket_path() == f"/tmp/calculator-{os.getuid()}/daemon.sock"
+    assert os.stat(running_daemon).st_mode & 0o777 == 0o600
+
+    shared = tmp_path / "shared"
+    shared.mkdir(mode=0o777)
+    shared.chmod(0o777)
+    spawned = []
+    monkeypatch.setattr(daemon, 'spawn', spawned.append)
+    monkeypatch.setenv('CALCULATOR_DAEMON_SOCKET', str(shared / "calculator.sock"))
+    assert daemon.forward(['add', '1', '2']) is False
+    assert spawned == []
+    with pytest.raises(ValueError, match="only this user"):
+        daemon.create_daemon(str(shared / "calculator.sock"))
+
+    created = tmp_path / "new" / "calculator.sock"
+    assert daemon.private_directory(str(created))
+    assert created.parent.stat().st_mode & 0o777 == 0o700
+
+    # A daemon run by someone else is never trusted
+    monkeypatch.setenv('CALCULATOR_DAEMON_SOCKET', running_daemon)
+    monkeypatch.setattr(daemon, '_peer_is_user', lambda sock: False)
+    assert capture(daemon.forward, ['add', '1', '2']) == (False, "", "")
+
+
+def test_idle_exit(tmp_path) -> None:
+    """Test that idle daemons exit, leaving a newer daemon's socket alone."""
+    path = str(tmp_path / "calculator.sock")
+    older = daemon.create_daemon(path, idle=0.01)
+    newer = daemon.create_daemon(path, idle=0.01)
+    daemon.serve(older)
+    assert os.path.exists(path)
+    daemon.serve(newer)
+    assert not os.path.exists(path)
+
+
+def test_only_enabled_by_one(monkeypatch) -> None:
+    """Test that CALCULATOR_DAEMON=0, false or empty keeps calls in-process."""
+    from src.calculator import __main__ as entry
+
+    for value, forwarded in (('1', True), ('0', False), ('false', False), ('', False)):
+        monkeypatch.setenv('CALCULATOR_DAEMON', value)
+        with patch.object(daemon, 'forward', return_value=True) as forward, \
+                patch('src.calculator.cli.main') as run:
+            entry.main()
+        assert forward.called == forwarded, value
+        assert run.called != forwarded, value
+
+
+def test_cli_end_to_end(tmp_path) -> None:
+    """Test python -m calculator with the daemon enabled."""
+    path = tmp_path / "d.sock"
+    env = dict(os.environ, CALCULATOR_DAEMON="1", CALCULATOR_DAEMON_SOCKET=str(path),
+               CALCULATOR_DAEMON_IDLE="2")
+    command = [sys.executable, '-X', 'importtime', '-m', 'calculator', 'divide', '1', '0']
+
+    def call() -> subprocess.CompletedProcess:
+        return subprocess.run(command, cwd=PROJECT, env=env, capture_output=True, text=True)
+
+    first = call()  # Starts the daemon and runs in-process
+    assert (first.returncode, first.stdout) == (0, "Error: Cannot divide by zero\n")
+    for _ in range(100):
+        if path.exists():
+            break
+        threading.Event().wait(0.05)
+    second = call()
+    assert (second.returncode, second.stdout) == (0, "Error: Cannot divide by zero\n")
+    assert 'calculator.cli' in first.stderr
+    assert 'calculator.cli' not in second.stderr
+
+
+if __name__ == "__main__":
+    pytest.main()
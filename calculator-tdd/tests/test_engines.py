@@ -0,0 +1,225 @@
+"""
+Tests for the pluggable engines and the special-value policy.
+
+Testing Strategy:
+- Conformance: every engine in ENGINES gives the codes and values of the policy
+  for NaN operands, zero divisors of either sign, NaN results and overflow
+- Engines agree with each other and with the scalar Calculator methods on random
+  and special operands, writing into given buffers or returning their own
+- Int operands (lists, wide arrays, NumPy int arrays) give the scalar results,
+  down to the sign of zero products such as 0 * -1
+- Engine selection: set_engine, get_engine, engine_for and the errors they raise;
+  a bad CALCULATOR_ENGINE warns and falls back to auto; Engine is abstract
+- The scalar methods follow the same policy (NaN results, the sign of overflow)
+"""
+
+import math
+import random
+import sys
+from array import array
+import pytest
+from src.calculator import Calculator, fast
+from src.calculator import engines
+from src.calculator.engines import (ENGINES, ErrorCode, engine_for, first_failure, get_engine,
+                                    set_engine)
+
+OPERATIONS = ('add', 'subtract', 'multiply', 'divide')
+SPECIAL = [0.0, -0.0, 1.0, -2.5, 1e308, -1e308, 5e-324, math.inf, -math.inf, math.nan]
+
+
+@pytest.fixture(params=list(ENGINES))
+def engine(request):
+    """Each engine, skipped where it cannot run."""
+    engine = ENGINES[request.param]
+    if not engine.available():
+        pytest.skip(f"{request.param} engine not available")
+    return engine
+
+
+def scalar(operation: str, a: float, b: float) -> tuple:
+    """The (code, value) the Calculator method gives, value NaN for errors."""
+    try:
+        value = getattr(Calculator, operation)(a, b)
+    except ValueError as error:
+        code = ErrorCode.NAN_INPUT if "NaN value" in str(error) else ErrorCode.NAN_RESULT
+        return code, math.nan
+    except ZeroDivisionError:
+        return ErrorCode.ZERO_DIVISION, math.nan
+    if math.isinf(value) and math.isfinite(a) and math.isfinite(b):
+        return ErrorCode.OVERFLOW, value
+    return ErrorCode.OK, value
+
+
+def same(x: float, y: float) -> bool:
+    """Equal floats, NaN equal to NaN and 0.0 distinct from -0.0."""
+    if math.isnan(x) or math.isnan(y):
+        return math.isnan(x) and math.isnan(y)
+    return x == y and math.copysign(1, x) == math.copysign(1, y)
+
+
+def test_policy_codes(engine) -> None:
+    """Test the code and value of each rule of the policy."""
+    cases = [
+        ('add', math.nan, 1.0, ErrorCode.NAN_INPUT),
+        ('divide', math.nan, 0.0, ErrorCode.NAN_INPUT),  # NaN checked before the divisor
+        ('divide', 1.0, 0.0, ErrorCode.ZERO_DIVISION),
+        ('divide', 1.0, -0.0, ErrorCode.ZERO_DIVISION),
+        ('divide', 0.0, 0.0, ErrorCode.ZERO_DIVISION),
+        ('add', math.inf, -math.inf, ErrorCode.NAN_RESULT),
+        ('subtract', math.inf, math.inf, ErrorCode.NAN_RESULT),
+        ('multiply', math.inf, 0.0, ErrorCode.NAN_RESULT),
+        ('divide', -math.inf, math.inf, ErrorCode.NAN_RESULT),
+        ('multiply', 1e200, -1e200, ErrorCode.OVERFLOW),
+        ('subtract', -1e308, 1e308, ErrorCode.OVERFLOW),
+        ('divide', 1e308, 1e-10, ErrorCode.OVERFLOW),
+        ('add', math.inf, 1.0, ErrorCode.OK),  # Infinite operands: not an overflow
+    ]
+    for operation, a, b, expected in cases:
+        values, codes, failed = engine.compute(operation, [a], [b])
+        assert codes[0] == expected, (operation, a, b)
+        assert failed == (expected not in (ErrorCode.OK, ErrorCode.OVERFLOW))
+        if failed:
+            assert math.isnan(values[0])
+    values, _, _ = engine.compute('subtract', [-1e308, 1e308], [1e308, -1e308])
+    assert list(values) == [-math.inf, math.inf]
+
+
+@pytest.mark.parametrize("operation", OPERATIONS)
+def test_matches_scalar_methods(engine, operation) -> None:
+    """Test element-wise agreement with the Calculator methods."""
+    rng = random.Random(25)
+    a = SPECIAL * len(SPECIAL) + [rng.uniform(-1e6, 1e6) for _ in range(500)]
+    b = [y for y in SPECIAL for _ in SPECIAL] + [rng.choice(SPECIAL + [rng.uniform(-9, 9)])
+                                                  for _ in range(500)]
+    values, codes, failed = engine.compute(operation, a, b)
+    expected = [scalar(operation, x, y) for x, y in zip(a, b)]
+    assert list(codes) == [code for code, _ in expected]
+    assert all(same(value, want) for value, (_, want) in zip(values, expected))
+    assert failed == sum(code not in (ErrorCode.OK, ErrorCode.OVERFLOW) for code, _ in expected)
+
+
+@pytest.mark.parametrize("kind", ['list', 'array', 'ndarray'])
+def test_int_operands_match_scalar_methods(engine, kind) -> None:
+    """Test int operands against the Calculator methods, zero products included."""
+    a = [0, 0, -2**53, 2**53, 0, 7, -3, 1, 0]
+    b = [-1, -5, 0, 0, 2**53, -1, 3, 0, -1]
+    if kind == 'list':
+        a, b = a + [0.0, 0], b + [-1, -1.0]  # A float operand keeps float64's -0.0
+        operands = a, b
+    elif kind == 'array':
+        operands = array('q', a), array('q', b)
+    else:
+        np = pytest.importorskip("numpy")
+        operands = np.array(a, dtype=np.int64), np.array(b, dtype=np.int64)
+    for operation in OPERATIONS:
+        values, codes, _ = engine.compute(operation, *operands)
+        expected = [scalar(operation, x, y) for x, y in zip(a, b)]
+        assert list(codes) == [code for code, _ in expected], operation
+        assert all(same(value, want) for value, (_, want) in zip(values, expected)), operation
+
+
+def test_engines_agree() -> None:
+    """Test that all available engines give identical bytes."""
+    available = [engine for engine in ENGINES.values() if engine.available()]
+    if len(available) < 2:
+        pytest.skip("only one engine available")
+    rng = random.Random(7)
+    a = array('d', (rng.choice(SPECIAL + [rng.uniform(-1e308, 1e308)]) for _ in range(2000)))
+    b = array('d', (rng.choice(SPECIAL + [rng.uniform(-1e3, 1e3)]) for _ in range(2000)))
+    for operation in OPERATIONS:
+        results = []
+        for engine in available:
+            values, codes, failed = engine.compute(operation, a, b)
+            results.append((memoryview(values).tobytes(), bytes(memoryview(codes)), failed))
+        assert all(result == results[0] for result in results)
+
+
+def test_writes_into_buffers(engine) -> None:
+    """Test that results and codes go into the buffers given, of any buffer type."""
+    out = array('d', [9.0] * 4)
+    codes = bytearray(4)
+    returned, returned_codes, failed = engine.compute(
+        'divide', memoryview(array('d', [1.0, 2.0, math.nan, 1e308])),
+        array('d', [2.0, 0.0, 1.0, 1e-300]), out, codes)
+    assert returned is out and returned_codes is codes
+    assert out[0] == 0.5 and math.isnan(out[1]) and out[3] == math.inf
+    assert list(codes) == [ErrorCode.OK, ErrorCode.ZERO_DIVISION, ErrorCode.NAN_INPUT,
+                           ErrorCode.OVERFLOW]
+    assert failed == 2 and first_failure(codes) == 1
+    assert first_failure(bytes([0, ErrorCode.OVERFLOW, 0])) is None
+
+
+def test_engine_selection(monkeypatch) -> None:
+    """Test set_engine, get_engine and engine_for in each mode."""
+    monkeypatch.setattr(engines, '_selected', engines.AUTO)
+    assert get_engine() == 'auto'
+    assert engine_for(False) is ENGINES['python']
+    if ENGINES['numpy'].available():
+        assert engine_for(True) is ENGINES['numpy']
+    set_engine('python')
+    assert get_engine() == 'python'
+    assert engine_for(True) is ENGINES['python']
+    with pytest.raises(ValueError, match="Unknown engine: simd"):
+        set_engine('simd')
+    assert get_engine() == 'python'
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+    with pytest.raises(ValueError, match="Engine numpy is not available"):
+        set_engine('numpy')
+
+
+def test_environment_selection(monkeypatch) -> None:
+    """Test CALCULATOR_ENGINE, and the fallback to auto for a bad value."""
+    monkeypatch.setattr(engines, '_selected', engines.AUTO)
+    monkeypatch.setenv("CALCULATOR_ENGINE", "python")
+    engines._select_from_environment()
+    assert get_engine() == 'python'
+    monkeypatch.setenv("CALCULATOR_ENGINE", "simd")
+    with pytest.warns(RuntimeWarning, match="Unknown engine: simd"):
+        engines._select_from_environment()
+    assert get_engine() == 'auto'
+    with pytest.raises(TypeError, match="abstract"):
+        engines.Engine()
+
+
+def test_engine_used_by_batches(monkeypatch) -> None:
+    """Test that a selected engine computes Calculator.*_many, with the same results."""
+    monkeypatch.setattr(engines, '_selected', engines.AUTO)
+    a = [1.0, 1e308, 3.0]
+    b = [4.0, 1e308, 0.0]
+    expected = Calculator.add_many(a, b, errors='collect')
+    for name, engine in ENGINES.items():
+        if not engine.available():
+            continue
+        set_engine(name)
+        calls = []
+        monkeypatch.setattr(engine, 'compute', lambda *args, compute=engine.compute:
+                            calls.append(args[0]) or compute(*args))
+        result = Calculator.add_many(a, b, errors='collect')
+        assert calls == ['add']
+        assert list(result.codes) == list(expected.codes)
+        assert list(result.values) == list(expected.values)
+        with pytest.raises(ZeroDivisionError, match="index 2"):
+            Calculator.divide_many(a, b)
+
+
+def test_scalar_policy() -> None:
+    """Test the scalar methods and fast functions against the policy."""
+    assert Calculator.subtract(-10**308, 10**308) == -math.inf
+    assert Calculator.add(-1e308, -1e308) == -math.inf
+    assert Calculator.multiply(10**200, -10**200) == -math.inf
+    assert Calculator.multiply(2**53 + 1, 3) == float((2**53 + 1) * 3)  # Exact, then rounded
+    for method in (Calculator.add, fast.add):
+        with pytest.raises(ValueError, match="Result is not a number"):
+            method(math.inf, -math.inf)
+    for method in (Calculator.subtract, fast.subtract):
+        with pytest.raises(ValueError, match="Result is not a number"):
+            method(math.inf, math.inf)
+    for method in (Calculator.divide, fast.divide):
+        with pytest.raises(ValueError, match="Result is not a number"):
+            method(math.inf, -math.inf)
+    with pytest.raises(OverflowError, match="int too large"):
+        Calculator.add(10**400, 1)
+
+
+if __name__ == "__main__":
+    pytest.main()
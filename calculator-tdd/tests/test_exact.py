@@ -0,0 +1,100 @@
+"""
+Tests for exact (int/Fraction/Decimal) arithmetic.
+
+Testing Strategy:
+- Int operands give exact int results at any size
+- Non-integer results are Fractions (or Decimals with the decimal backend)
+- Floats are taken at their shortest repr; NaN and infinity are rejected
+- Errors match Calculator's types and messages
+- The CLI --exact and --precision options parse operands without float
+"""
+
+import decimal
+from fractions import Fraction
+from io import StringIO
+from unittest.mock import patch
+import pytest
+from src.calculator.exact import ExactCalculator
+from src.calculator.__main__ import CalculatorCLI
+
+
+def test_big_ints_stay_exact() -> None:
+    """Test that large ints never lose precision."""
+    calc = ExactCalculator()
+    big = 10**400
+    assert calc.add(big, 1) == big + 1
+    assert calc.subtract(big, 1) == big - 1
+    assert calc.multiply(big, big) == 10**800
+    assert calc.divide(big, 10**200) == 10**200
+    assert isinstance(calc.divide(10, 2), int)
+
+
+def test_fraction_results() -> None:
+    """Test exact division and float operands in the fraction backend."""
+    calc = ExactCalculator()
+    assert calc.divide(1, 3) == Fraction(1, 3)
+    assert calc.add(0.1, 0.2) == Fraction(3, 10)
+    assert calc.multiply(Fraction(1, 3), 3) == 1
+    assert isinstance(calc.multiply(Fraction(1, 3), 3), int)
+    assert calc.subtract(True, 2) == -1
+
+
+def test_decimal_backend() -> None:
+    """Test the decimal backend's rounding to the configured precision."""
+    calc = ExactCalculator('decimal', precision=10)
+    assert calc.divide(1, 3) == decimal.Decimal("0.3333333333")
+    assert calc.add(0.1, 0.2) == decimal.Decimal("0.3")
+    assert calc.multiply(decimal.Decimal("1.5"), 2) == decimal.Decimal("3.0")
+    assert calc.add(2, 3) == 5
+
+
+def test_errors() -> None:
+    """Test that errors match the Calculator methods."""
+    calc = ExactCalculator()
+    with pytest.raises(ZeroDivisionError, match="Cannot divide by zero"):
+        calc.divide(1, 0)
+    with pytest.raises(ZeroDivisionError, match="Cannot divide by zero"):
+        ExactCalculator('decimal').divide(decimal.Decimal(1), 0.0)
+    with pytest.raises(TypeError, match="Cannot add str and int"):
+        calc.add("5", 3)
+    with pytest.raises(TypeError, match="Cannot subtract str from int"):
+        calc.subtract(5, "3")
+    with pytest.raises(ValueError, match="NaN"):
+        calc.multiply(float("nan"), 2)
+    with pytest.raises(ValueError, match="Infinity"):
+        calc.add(float("inf"), 1)
+    with pytest.raises(ValueError, match="Unknown exact backend"):
+        ExactCalculator('float')
+
+
+def test_parse() -> None:
+    """Test parsing tokens without going through float."""
+    calc = ExactCalculator()
+    assert calc.parse("123456789012345678901234567890") == 123456789012345678901234567890
+    assert calc.parse("0.1") == Fraction(1, 10)
+    assert calc.parse("3/4") == Fraction(3, 4)
+    assert ExactCalculator('decimal').parse("0.1") == decimal.Decimal("0.1")
+    assert calc.parse("nan") != calc.parse("nan")
+    with pytest.raises(ValueError):
+        calc.parse("abc")
+
+
+def test_cli_exact() -> None:
+    """Test the --exact and --precision options."""
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        CalculatorCLI().run(['--exact', 'add', '100000000000000000000', '1'])
+        CalculatorCLI().run(['--exact', 'divide', '1', '3'])
+        CalculatorCLI().run(['--exact', '--precision', '5', 'divide', '2', '3'])
+        CalculatorCLI().run(['--exact', 'add', 'nan', '1'])
+        CalculatorCLI().run(['--precision', '5', 'add', '1', '1'])
+    assert fake_out.getvalue().splitlines() == [
+        "Result: 100000000000000000001",
+        "Result: 1/3",
+        "Result: 0.66667",
+        "Error: Cannot perform operation with NaN value",
+        "Error: --precision requires --exact",
+    ]
+
+
+if __name__ == "__main__":
+    pytest.main()
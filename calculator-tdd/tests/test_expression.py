@@ -0,0 +1,153 @@
+"""
+Tests for the expression engine and the ``eval`` CLI operation.
+
+Testing Strategy:
+- Precedence, associativity, parentheses and unary minus
+- Variables bound at evaluation time, without re-parsing
+- Calculator errors (division by zero, NaN, types) propagate
+- Syntax errors raise ValueError
+- Long flat chains and long runs of unary signs compile; nesting beyond MAX_DEPTH
+  raises ValueError, never SyntaxError or RecursionError
+- The CLI ``eval`` operation prints results and errors like other operations
+"""
+
+import math
+from io import StringIO
+from unittest.mock import patch
+import pytest
+from src.calculator.expression import (
+    MAX_DEPTH, BinaryOp, Number, Variable, compile_expression, evaluate, parse,
+)
+from src.calculator.__main__ import CalculatorCLI
+
+
+def test_precedence() -> None:
+    """Test that * and / bind tighter than + and -."""
+    assert evaluate("2 + 3 * 4") == 14.0
+    assert evaluate("10 - 6 / 2") == 7.0
+
+
+def test_left_associativity() -> None:
+    """Test that operators of equal precedence group to the left."""
+    assert evaluate("10 - 4 - 3") == 3.0
+    assert evaluate("24 / 4 / 2") == 3.0
+
+
+def test_parentheses() -> None:
+    """Test that parentheses override precedence."""
+    assert evaluate("(2 + 3) * 4") == 20.0
+    assert evaluate("((1 + 2) * (3 + 4)) / 7") == 3.0
+
+
+def test_unary_minus() -> None:
+    """Test unary minus and plus."""
+    assert evaluate("-2 * -3") == 6.0
+    assert evaluate("-(1 + 2)") == -3.0
+    assert evaluate("+4 - -1") == 5.0
+
+
+def test_number_formats() -> None:
+    """Test decimal and exponent literals."""
+    assert evaluate(".5 + 1.5") == 2.0
+    assert evaluate("1e3 / 2E1") == 50.0
+
+
+def test_parse_tree() -> None:
+    """Test the shape of the parsed syntax tree."""
+    tree = parse("a + 2 * b")
+    assert isinstance(tree, BinaryOp) and tree.operation == 'add'
+    assert isinstance(tree.left, Variable) and tree.left.name == 'a'
+    assert isinstance(tree.right, BinaryOp) and tree.right.operation == 'multiply'
+    assert isinstance(tree.right.left, Number) and tree.right.left.value == 2.0
+
+
+def test_variables() -> None:
+    """Test evaluation with variable bindings."""
+    assert evaluate("(a + b) * c / d", a=1, b=2, c=3, d=4) == 2.25
+    assert evaluate("price * qty", {'price': 2.5, 'qty': 4}) == 10.0
+
+
+def test_compiled_expression_is_reused() -> None:
+    """Test that the same source text returns the cached compiled expression."""
+    compiled = compile_expression("x * y + 1")
+    assert compile_expression("x * y + 1") is compiled
+    assert compiled.variables == {'x', 'y'}
+    assert compiled(x=2, y=3) == 7.0
+    assert compiled.evaluate({'x': 4, 'y': 5}) == 21.0
+
+
+def test_missing_variable() -> None:
+    """Test that an unbound variable is reported."""
+    with pytest.raises(ValueError, match="Undefined variable: y"):
+        evaluate("x + y", x=1)
+
+
+def test_division_by_zero() -> None:
+    """Test that division by zero raises the Calculator error."""
+    with pytest.raises(ZeroDivisionError):
+        evaluate("1 / (2 - 2)")
+
+
+def test_calculator_validation_applies() -> None:
+    """Test that NaN and non-numeric variables are rejected by Calculator."""
+    with pytest.raises(ValueError):
+        evaluate("x + 1", x=math.nan)
+    with pytest.raises(TypeError):
+        evaluate("x * 2", x="3")
+
+
+def test_syntax_errors() -> None:
+    """Test that malformed expressions raise ValueError."""
+    for source in ["", "2 +", "(1 + 2", "1 + 2)", "2 ** 3", "3 $ 4", "4 5"]:
+        with pytest.raises(ValueError, match="Invalid expression"):
+            evaluate(source)
+
+
+def test_long_and_deep_expressions() -> None:
+    """Test thousands of terms and signs, and the nesting limit."""
+    assert evaluate("+".join(["1"] * 3000)) == 3000.0
+    assert evaluate(" - ".join(["x"] * 2000), x=1.0) == -1998.0
+    assert evaluate("-" * 5001 + "x", x=2.0) == -2.0
+    assert evaluate("-" * 5000 + "3") == 3.0
+    nested = "(" * MAX_DEPTH + "a * 2" + ")" * MAX_DEPTH
+    assert evaluate(nested, a=4.0) == 8.0
+    with pytest.raises(ValueError, match="nested more than"):
+        evaluate("(" + nested + ")", a=4.0)
+    with pytest.raises(ValueError, match="nested more than"):
+        evaluate("(" * 10000 + "1" + ")" * 10000)
+
+
+def test_cli_eval_long_expression() -> None:
+    """Test that long or too deeply nested formulas print a result or an error."""
+    cli = CalculatorCLI()
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        cli.run(['eval', "+".join(["1"] * 300)])
+        cli.run(['eval', "(" * 300 + "1" + ")" * 300])
+    result, error = fake_out.getvalue().splitlines()
+    assert result == "Result: 300.0"
+    assert error.startswith("Error: Invalid expression: parentheses nested more than")
+
+
+def test_cli_eval() -> None:
+    """Test the eval operation through the CLI."""
+    cli = CalculatorCLI()
+    assert cli.calculate(['eval', '(a+b)*c/d', 'a=1', 'b=2', 'c=3', 'd=4']) == 2.25
+    assert cli.calculate(['eval', '2', '*', '(3', '+', '4)']) == 14.0
+
+
+def test_cli_eval_output() -> None:
+    """Test the printed result and error of the eval operation."""
+    cli = CalculatorCLI()
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        cli.run(['eval', '1 + 2 * 3'])
+        cli.run(['eval', '1 / 0'])
+        cli.run(['eval', 'x + 1', 'x=abc'])
+    assert fake_out.getvalue().splitlines() == [
+        "Result: 7.0",
+        "Error: Cannot divide by zero",
+        "Error: Invalid number format provided",
+    ]
+
+
+if __name__ == "__main__":
+    pytest.main()
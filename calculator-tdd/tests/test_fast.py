@@ -0,0 +1,73 @@
+"""
+Tests for the unchecked (trusted float) calculator operations.
+
+Testing Strategy:
+- Calculator(validate=False) matches the validated methods on floats
+- Division by zero, overflow to infinity and NaN products still behave
+- The CLI still rejects NaN input with the validated error message
+"""
+
+import math
+import pytest
+from src.calculator import Calculator, fast
+from src.calculator.__main__ import CalculatorCLI
+
+FLOAT_PAIRS = [
+    (5.0, 3.0),
+    (-2.5, 0.1),
+    (1e308, 1e308),
+    (-1e308, 1e308),
+    (math.inf, 5.0),
+    (1e-308, 1e-308),
+    (0.0, -7.0),
+]
+
+
+def test_unchecked_matches_checked() -> None:
+    """Test that unchecked results equal the validated ones for floats."""
+    checked = Calculator()
+    unchecked = Calculator(validate=False)
+    for name in ('add', 'subtract', 'multiply', 'divide'):
+        for a, b in FLOAT_PAIRS:
+            assert getattr(unchecked, name)(a, b) == getattr(checked, name)(a, b)
+
+
+def test_validate_flag() -> None:
+    """Test that only unchecked instances swap in the fast operations."""
+    assert Calculator().validate is True
+    assert Calculator().add is Calculator.add
+    unchecked = Calculator(validate=False)
+    assert unchecked.validate is False
+    assert unchecked.add is fast.add
+
+
+def test_unchecked_divide_by_zero() -> None:
+    """Test that division by zero is still an error."""
+    with pytest.raises(ZeroDivisionError, match="Cannot divide by zero"):
+        Calculator(validate=False).divide(10.0, 0.0)
+    with pytest.raises(ZeroDivisionError):
+        fast.divide(1.0, -0.0)
+
+
+def test_unchecked_overflow_to_inf() -> None:
+    """Test that results too large for a float become infinity."""
+    assert fast.add(1e308, 1e308) == math.inf
+    assert fast.multiply(1e308, 10.0) == math.inf
+    assert fast.divide(1e308, 0.1) == math.inf
+
+
+def test_unchecked_nan_product() -> None:
+    """Test that inf * 0 still raises like the validated multiply."""
+    with pytest.raises(ValueError, match="Result is not a number"):
+        fast.multiply(math.inf, 0.0)
+
+
+def test_cli_still_rejects_nan() -> None:
+    """Test that the CLI reports NaN input with the usual message."""
+    cli = CalculatorCLI()
+    with pytest.raises(ValueError, match="Cannot perform operation with NaN value"):
+        cli.calculate(['add', 'nan', '5'])
+
+
+if __name__ == "__main__":
+    pytest.main()
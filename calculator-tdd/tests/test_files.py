@@ -0,0 +1,163 @@
+"""
+Tests for batch arithmetic over memory-mapped float64 files.
+
+Testing Strategy:
+- Results match the scalar Calculator methods, across chunk boundaries
+- Without an error file, the first rejected element raises with its global index
+- With an error file, every element gets an error code and the run completes
+- The pure-Python and NumPy chunk paths give identical files
+- Registered operations get the batch codes: signed overflow, OTHER for their own errors
+- Output and error files naming an operand file are rejected, inputs left intact
+- The ``batch`` CLI subcommand reports counts and errors
+"""
+
+import math
+import sys
+from array import array
+from io import StringIO
+from unittest.mock import patch
+import pytest
+from src.calculator import Calculator
+from src.calculator.batch import ErrorCode
+from src.calculator.files import evaluate_files
+from src.calculator.registry import register, unregister
+from src.calculator.__main__ import CalculatorCLI
+
+A = [1.0, 2.0, math.nan, 1e308, 5.0, math.inf, 7.0, -3.0]
+B = [2.0, 0.0, 1.0, 10.0, 2.0, 0.0, 1.0, 4.0]
+
+
+@pytest.fixture(params=['python', 'numpy'])
+def engine(request, monkeypatch):
+    """Run each test with and without NumPy."""
+    if request.param == 'numpy':
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setitem(sys.modules, 'numpy', None)
+    return request.param
+
+
+def write(path, values) -> str:
+    """Write values as raw float64 and return the path as a string."""
+    with open(path, 'wb') as handle:
+        array('d', values).tofile(handle)
+    return str(path)
+
+
+def read(path, typecode='d') -> list:
+    """Read a raw file of the given array typecode."""
+    values = array(typecode)
+    with open(path, 'rb') as handle:
+        values.frombytes(handle.read())
+    return list(values)
+
+
+def test_results_match_scalar(tmp_path, engine) -> None:
+    """Test that every operation matches the scalar method over many chunks."""
+    a = [float(i) * 1.5 for i in range(1, 101)]
+    b = [float(i % 7 + 1) for i in range(1, 101)]
+    a_path, b_path = write(tmp_path / "a.f64", a), write(tmp_path / "b.f64", b)
+    for name in ('add', 'subtract', 'multiply', 'divide'):
+        out = tmp_path / f"{name}.f64"
+        report = evaluate_files(name, a_path, b_path, str(out), chunk_size=16)
+        assert report == {'count': 100}
+        method = getattr(Calculator, name)
+        assert read(out) == [method(x, y) for x, y in zip(a, b)]
+
+
+def test_first_error_stops_run(tmp_path, engine) -> None:
+    """Test that the first rejected element raises with its global index."""
+    a_path, b_path = write(tmp_path / "a.f64", A), write(tmp_path / "b.f64", B)
+    with pytest.raises(ZeroDivisionError, match=r"\(at index 1\)") as info:
+        evaluate_files('divide', a_path, b_path, str(tmp_path / "out"), chunk_size=3)
+    assert info.value.index == 1
+    with pytest.raises(ValueError, match="NaN") as info:
+        evaluate_files('add', a_path, b_path, str(tmp_path / "out"), chunk_size=2)
+    assert info.value.index == 2
+
+
+def test_error_file(tmp_path, engine) -> None:
+    """Test per-element error codes for division and multiplication."""
+    a_path, b_path = write(tmp_path / "a.f64", A), write(tmp_path / "b.f64", B)
+    out, errors = tmp_path / "out.f64", tmp_path / "errors.u8"
+    report = evaluate_files('divide', a_path, b_path, str(out), str(errors), chunk_size=3)
+    assert read(errors, 'B') == [0, 2, 1, 0, 0, 2, 0, 0]
+    assert report['errors'] == {'NAN_INPUT': 1, 'ZERO_DIVISION': 2, 'NAN_RESULT': 0, 'OVERFLOW': 0}
+    result = read(out)
+    assert [math.isnan(value) for value in result] == [code != 0 for code in read(errors, 'B')]
+    assert result[7] == -0.75
+
+    evaluate_files('multiply', a_path, b_path, str(out), str(errors), chunk_size=3)
+    assert read(errors, 'B') == [
+        ErrorCode.OK, ErrorCode.OK, ErrorCode.NAN_INPUT, ErrorCode.OVERFLOW,
+        ErrorCode.OK, ErrorCode.NAN_RESULT, ErrorCode.OK, ErrorCode.OK,
+    ]
+    assert read(out)[3] == math.inf
+
+
+def test_registered_operation_codes(tmp_path, engine) -> None:
+    """Test signed overflow and the operation's own errors for a registered operation."""
+    register('scale', lambda a, b: int(a) * int(b) * 10**400 if b else a * 10.0**400)
+    try:
+        a_path = write(tmp_path / "a.f64", [2.0, 2.0, 1.0, math.nan])
+        b_path = write(tmp_path / "b.f64", [3.0, -3.0, 0.0, 1.0])
+        out, errors = tmp_path / "out.f64", tmp_path / "errors.u8"
+        report = evaluate_files('scale', a_path, b_path, str(out), str(errors))
+    finally:
+        unregister('scale')
+    assert read(errors, 'B') == [ErrorCode.OVERFLOW, ErrorCode.OVERFLOW, ErrorCode.OTHER,
+                                 ErrorCode.NAN_INPUT]
+    assert read(out)[:2] == [math.inf, -math.inf]
+    assert report['errors'] == {'NAN_INPUT': 1, 'ZERO_DIVISION': 0, 'NAN_RESULT': 0,
+                                'OVERFLOW': 2, 'OTHER': 1}
+
+
+def test_invalid_files(tmp_path, engine) -> None:
+    """Test length mismatches, partial float64 files and empty files."""
+    a_path = write(tmp_path / "a.f64", [1.0, 2.0])
+    b_path = write(tmp_path / "b.f64", [1.0])
+    with pytest.raises(ValueError, match="same length"):
+        evaluate_files('add', a_path, b_path, str(tmp_path / "out"))
+    (tmp_path / "odd").write_bytes(b"\0" * 12)
+    with pytest.raises(ValueError, match="multiple of 8"):
+        evaluate_files('add', str(tmp_path / "odd"), b_path, str(tmp_path / "out"))
+    empty = write(tmp_path / "empty", [])
+    assert evaluate_files('add', empty, empty, str(tmp_path / "out")) == {'count': 0}
+    with pytest.raises(ValueError, match="Unknown operation"):
+        evaluate_files('power', a_path, a_path, str(tmp_path / "out"))
+
+
+def test_output_must_not_be_an_input(tmp_path, engine) -> None:
+    """Test that an output naming an operand file is rejected before truncating it."""
+    a_path = write(tmp_path / "a.f64", [1.0, 2.0])
+    b_path = write(tmp_path / "b.f64", [3.0, 4.0])
+    (tmp_path / "link.f64").symlink_to(tmp_path / "b.f64")
+    for out, errors in ((a_path, None), (str(tmp_path / "link.f64"), None),
+                        (str(tmp_path / "out.f64"), b_path),
+                        (str(tmp_path / "out.f64"), str(tmp_path / "out.f64"))):
+        with pytest.raises(ValueError, match="is also the"):
+            evaluate_files('add', a_path, b_path, out, errors)
+    assert read(a_path) == [1.0, 2.0] and read(b_path) == [3.0, 4.0]
+
+
+def test_cli_batch(tmp_path) -> None:
+    """Test the batch subcommand with and without an error file."""
+    a_path, b_path = write(tmp_path / "a.f64", A), write(tmp_path / "b.f64", B)
+    out, errors = str(tmp_path / "out.f64"), str(tmp_path / "errors.u8")
+    command = ['batch', '--op', 'divide', '--a', a_path, '--b', b_path, '--out', out]
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        CalculatorCLI().run(command + ['--errors', errors])
+        CalculatorCLI().run(command)
+        CalculatorCLI().run(['batch', '--op', 'divide', '--a', a_path])
+        CalculatorCLI().run(command[:-2] + ['--out', str(tmp_path / "missing" / "out")])
+    assert fake_out.getvalue().splitlines() == [
+        f"Result: 8 values written to {out}",
+        "Errors: NAN_INPUT=1 ZERO_DIVISION=2 NAN_RESULT=0 OVERFLOW=0",
+        "Error: Cannot divide by zero (at index 1)",
+        "Error: Batch mode requires --op, --a, --b and --out",
+        f"Error: Cannot access {tmp_path / 'missing' / 'out'}: No such file or directory",
+    ]
+
+
+if __name__ == "__main__":
+    pytest.main()
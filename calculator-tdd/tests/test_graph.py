@@ -0,0 +1,155 @@
+"""
+Tests for the incremental calculation graph.
+
+Testing Strategy:
+- Node results equal the Calculator methods over inputs, nodes and constants
+- Updates recompute only downstream nodes, each once, and stop where results
+  do not change
+- Errors are node states that propagate downstream and clear on later updates
+- Random graphs under random updates match graphs built from scratch
+"""
+
+import math
+import operator
+import random
+import pytest
+from src.calculator import Calculator
+from src.calculator.graph import Graph
+from src.calculator.registry import register, unregister
+
+OPERATIONS = ('add', 'subtract', 'multiply', 'divide')
+
+
+def test_results_match_calculator() -> None:
+    """Test node results against the Calculator methods."""
+    graph = Graph()
+    graph.input('a', 7)
+    graph.input('b', 2.5)
+    for name in OPERATIONS:
+        graph.node(name, name, 'a', 'b')
+        assert graph[name] == getattr(Calculator, name)(7, 2.5)
+    graph.node('half', 'divide', 'add', 2)
+    graph.node('twice', 'multiply', 'a', 'a')
+    assert graph.value('half') == 4.75
+    assert graph.value('twice') == 49.0
+    assert len(graph) == 8 and 'half' in graph and 'x' not in graph
+
+
+def test_updates_recompute_only_downstream() -> None:
+    """Test how many nodes an update recomputes."""
+    graph = Graph()
+    graph.input('x', 1.0)
+    graph.input('y', 2.0)
+    graph.node('left', 'add', 'x', 1)
+    graph.node('right', 'multiply', 'x', 3)
+    graph.node('both', 'add', 'left', 'right')  # x reaches it by two paths
+    graph.node('other', 'subtract', 'y', 1)
+    graph.node('sign', 'multiply', 'x', 0)
+
+    assert graph.set('x', 2.0) == 4
+    assert graph['both'] == 9.0
+    assert graph.set('x', 2.0) == 0
+    assert graph.update({'x': 3.0, 'y': 5.0}) == 5
+    assert (graph['both'], graph['other']) == (13.0, 4.0)
+
+    graph.node('after', 'add', 'other', 'sign')
+    graph.input('z', 4.0)
+    graph.node('parity', 'subtract', 'z', 'z')
+    graph.node('end', 'add', 'parity', 1)
+    assert graph.set('z', 5.0) == 1  # parity is still 0.0: end is left alone
+    assert graph.set('x', -1.0) == 5  # sign turns -0.0, so after is recomputed
+    assert math.copysign(1.0, graph['sign']) == -1.0
+
+
+def test_errors_are_node_states() -> None:
+    """Test error propagation, reporting and recovery."""
+    graph = Graph()
+    graph.input('total', 10.0)
+    graph.input('count', 2)
+    graph.node('each', 'divide', 'total', 'count')
+    graph.node('plus', 'add', 'each', 1)
+    graph.node('other', 'add', 'total', 1)
+    assert graph.error('plus') is None
+
+    graph.set('count', 0)
+    with pytest.raises(ZeroDivisionError, match=r"^Cannot divide by zero \(at node each\)$"):
+        graph.value('plus')
+    assert graph.error('each').node == 'each'
+    assert graph['other'] == 11.0
+    assert [name for name, _ in graph.errors()] == ['each', 'plus']
+
+    graph.set('total', 20.0)  # Still failing: only other changes
+    assert [name for name, _ in graph.errors()] == ['each', 'plus']
+    graph.set('count', math.nan)
+    assert str(graph.error('plus')) == "Cannot perform operation with NaN value (at node each)"
+    graph.set('count', 'x')
+    assert isinstance(graph.error('each'), TypeError)
+    graph.set('count', 4)
+    assert list(graph.errors()) == []
+    assert graph['plus'] == 6.0
+
+
+def test_invalid_definitions() -> None:
+    """Test unknown, duplicate and misused nodes and operations."""
+    graph = Graph()
+    graph.input('a', 1.0)
+    graph.node('b', 'add', 'a', 1)
+    with pytest.raises(ValueError, match="Unknown node: c"):
+        graph.node('d', 'add', 'a', 'c')
+    with pytest.raises(ValueError, match="Node b already exists"):
+        graph.input('b', 2.0)
+    with pytest.raises(ValueError, match="Unknown operation: modulo"):
+        graph.node('e', 'modulo', 'a', 'b')
+    with pytest.raises(ValueError, match="Node b is not an input"):
+        graph.update({'a': 5.0, 'b': 1.0})
+    assert graph['b'] == 2.0  # Nothing changed
+    with pytest.raises(ValueError, match="Unknown node: c"):
+        graph.value('c')
+
+    register('negate', operator.neg, arity=1)
+    register('power', operator.pow)
+    try:
+        with pytest.raises(ValueError, match="does not take two operands"):
+            graph.node('e', 'negate', 'a', 'b')
+        graph.node('e', 'power', 'b', 10)
+        assert graph['e'] == 1024.0
+    finally:
+        unregister('negate')
+        unregister('power')
+
+
+def test_random_updates_match_rebuild() -> None:
+    """Test random graphs under random updates against fresh graphs."""
+    rng = random.Random(7)
+
+    def build(inputs: dict, definitions: list) -> Graph:
+        graph = Graph()
+        for name, value in inputs.items():
+            graph.input(name, value)
+        for definition in definitions:
+            graph.node(*definition)
+        return graph
+
+    def state(graph: Graph, names: list) -> list:
+        return [(repr(graph.error(name)) if graph.error(name) else graph[name])
+                for name in names]
+
+    for _ in range(20):
+        inputs = {f"i{k}": float(rng.randint(-3, 3)) for k in range(5)}
+        names = list(inputs)
+        definitions = []
+        for k in range(60):
+            operands = [rng.choice(names) if rng.random() < 0.9 else rng.randint(-2, 2)
+                        for _ in range(2)]
+            definitions.append((f"n{k}", rng.choice(OPERATIONS), *operands))
+            names.append(f"n{k}")
+        graph = build(inputs, definitions)
+        for _ in range(10):
+            changes = {name: float(rng.randint(-3, 3)) for name in rng.sample(list(inputs), 2)}
+            graph.update(changes)
+            inputs.update(changes)
+            assert state(graph, names) == state(build(inputs, definitions), names)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,144 @@
+"""
+Tests for the CLI JSON lines mode.
+
+Testing Strategy:
+- One JSON response per request line, with the results and error texts of
+  stream mode
+- Malformed requests produce an error response without stopping the stream
+- Input comes from stdin or a file; a pipe gets each response before it sends
+  the next request
+"""
+
+import io
+import json
+import subprocess
+import sys
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from src.calculator.__main__ import CalculatorCLI
+from src.calculator.cli import read_blocks
+
+PROJECT = Path(__file__).resolve().parent.parent
+
+
+def run_jsonl(*lines: str, options: list = ()) -> list:
+    """Run request lines through jsonl, returning the decoded responses."""
+    cli = CalculatorCLI()
+    cli._apply_options(list(options))
+    out = StringIO()
+    assert cli.jsonl([line + "\n" for line in lines], out) == len(lines)
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_matches_stream_mode() -> None:
+    """Test that results and errors carry the text stream mode writes."""
+    calls = ["add 5 3", "divide 1 0", "add abc 3", "power 2 3", "multiply nan 2",
+             "subtract 0.1 0.3", "multiply 1e200 1e200", "divide 1e-320 1e10"]
+    out = StringIO()
+    CalculatorCLI().stream(calls, out)
+    expected = []
+    for line in out.getvalue().splitlines():
+        kind, _, text = line.partition(": ")
+        expected.append({'result': text} if kind == "Result" else {'error': text})
+
+    requests = [json.dumps(dict(zip(('op', 'a', 'b'), call.split()))) for call in calls]
+    responses = run_jsonl(*requests)
+    assert [{key: str(value) for key, value in response.items()}
+            for response in responses] == expected
+    assert responses[0] == {'result': 8.0}
+    assert responses[6] == {'result': "inf"}
+
+
+def test_request_forms() -> None:
+    """Test operand types, malformed requests and other modes' options."""
+    assert run_jsonl(
+        '{"op": "divide", "a": 1, "b": 4, "id": 7}',
+        '  {"b": "2", "a": -6.5, "op": "multiply"}  ',
+        '{"op": "add", "a": 1, "b": NaN}',
+        '{"op": "add", "a": true, "b": 1}',
+        '{"op": "add", "a": 1}',
+        '{"a": 1, "b": 2}',
+        '[1, 2]',
+        '{"op": "add", "a": 1, "b": 2} x',
+        '',
+        '{"op": "--help"}',
+        '{"op": "sum", "a": 0.1, "b": 0.2}',
+    ) == [
+        {'result': 0.25},
+        {'result': -13.0},
+        {'error': "Cannot perform operation with NaN value"},
+        {'error': "Invalid number format provided"},
+        {'error': "Operation add requires exactly 2 numbers"},
+        {'error': 'Invalid JSON request: expected {"op": ..., "a": ..., "b": ...}'},
+        {'error': 'Invalid JSON request: expected {"op": ..., "a": ..., "b": ...}'},
+        {'error': "Invalid JSON request"},
+        {'error': "Empty input line"},
+        {'error': "Help is not available in JSON lines mode"},
+        {'result': 0.30000000000000004},
+    ]
+    assert run_jsonl('{"op": "divide", "a": 1, "b": 3}', '{"op": "add", "a": 0.1, "b": 0.2}',
+                     '{"op": "add", "a": 100000000000000000000, "b": 1}',
+                     options=['--exact']) == [
+        {'result': "1/3"}, {'result': "3/10"}, {'result': 100000000000000000001},
+    ]
+
+
+def test_jsonl_from_stdin_and_file(tmp_path) -> None:
+    """Test --jsonl reading from stdin and from a file argument."""
+    with patch('sys.stdin', new=StringIO('{"op": "add", "a": 1, "b": 2}\n')), \
+            patch('sys.stdout', new=StringIO()) as fake_out:
+        CalculatorCLI().run(['--jsonl'])
+    assert fake_out.getvalue() == '{"result": 3.0}\n'
+
+    path = tmp_path / "requests.jsonl"
+    path.write_text('{"op": "divide", "a": 1, "b": 0}\n', encoding='utf-8')
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        CalculatorCLI().run(['--jsonl', str(path)])
+        CalculatorCLI().run(['--jsonl', str(tmp_path / "missing.jsonl")])
+    assert fake_out.getvalue().splitlines() == [
+        '{"error": "Cannot divide by zero"}',
+        f"Error: Cannot read {tmp_path / 'missing.jsonl'}: No such file or directory",
+    ]
+
+
+def test_read_blocks() -> None:
+    """Test splitting reads into lines, across reads and multi-byte characters."""
+    class Reads(io.RawIOBase):
+        def __init__(self, chunks: list) -> None:
+            self.chunks = chunks
+
+        def readable(self) -> bool:
+            return True
+
+        def readinto(self, buffer) -> int:
+            chunk = self.chunks.pop(0) if self.chunks else b""
+            buffer[:len(chunk)] = chunk
+            return len(chunk)
+
+    text = 'a\nb "é"\nc\nend'.encode('utf-8')
+    split = text.index(b"\xa9")  # Inside the two-byte "é"
+    stream = io.BufferedReader(Reads([text[:3], text[3:split], text[split:]]))
+    assert list(read_blocks(stream)) == [['a'], ['b "é"', 'c'], ['end']]
+
+
+def test_responses_arrive_before_next_request() -> None:
+    """Test a pipe exchanging one request and response at a time."""
+    process = subprocess.Popen([sys.executable, '-m', 'calculator', '--jsonl'], cwd=PROJECT,
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    try:
+        for request, response in [('{"op": "add", "a": 1, "b": 2}', '{"result": 3.0}'),
+                                  ('{"op": "divide", "a": 1, "b": 0}',
+                                   '{"error": "Cannot divide by zero"}')]:
+            process.stdin.write(request + "\n")
+            process.stdin.flush()
+            assert process.stdout.readline() == response + "\n"
+        process.stdin.close()
+        assert process.wait(timeout=10) == 0
+    finally:
+        process.kill()
+
+
+if __name__ == "__main__":
+    pytest.main()
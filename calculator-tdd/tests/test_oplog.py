@@ -0,0 +1,184 @@
+"""
+Tests for the binary operation log and its replay.
+
+Testing Strategy:
+- Records hold the op code, operands, result and error code of every call, as
+  fixed-width little-endian fields, through the call and stream-column paths
+- Column blocks, with their errors, stay in order with the calls around them
+- Replay of a faithful log finds no divergence; changed records are reported
+- Inexact operands, registered operations, sessions and torn tails are handled
+- The CLI --log option and replay command
+"""
+
+import math
+import operator
+import struct
+from io import StringIO
+from unittest.mock import patch
+import pytest
+from src.calculator import Calculator
+from src.calculator.__main__ import CalculatorCLI
+from src.calculator.batch import ErrorCode
+from src.calculator.oplog import (INEXACT, MAGIC, RECORD_SIZE, LoggedCalculator, OperationLog,
+                                  read_records, replay)
+from src.calculator.registry import register, unregister
+
+RECORD = struct.Struct("<BBB5xddd")
+
+
+def records(path) -> list:
+    """The (op, error, flags, a, b, result) tuples of a log file."""
+    data = b"".join(read_records(str(path)))
+    return [RECORD.unpack_from(data, offset) for offset in range(0, len(data), RECORD_SIZE)]
+
+
+def test_records_of_calls(tmp_path) -> None:
+    """Test the record written for results, errors and inexact operands."""
+    path = tmp_path / "calls.bin"
+    calc = LoggedCalculator(Calculator(), str(path))
+    assert calc.add(1.5, 2.25) == 3.75
+    with pytest.raises(ZeroDivisionError):
+        calc.divide(1.0, 0.0)
+    with pytest.raises(ValueError):
+        calc.multiply(math.nan, 2.0)
+    assert calc.subtract(2**60 + 1, 1) == 2**60
+    with pytest.raises(TypeError):
+        calc.add(1)  # Not a call: nothing logged
+    calc.close()
+
+    session, *calls = records(path)
+    assert session[0] == 0 and path.read_bytes()[8:16] == MAGIC
+    assert calls[0] == (1, ErrorCode.OK, 0, 1.5, 2.25, 3.75)
+    assert calls[1][:5] == (4, ErrorCode.ZERO_DIVISION, 0, 1.0, 0.0)
+    assert math.isnan(calls[1][5])
+    assert calls[2][:2] == (3, ErrorCode.NAN_INPUT)
+    assert calls[3][:3] == (2, ErrorCode.OK, INEXACT)
+    assert len(calls) == 4
+    assert replay(str(path))['replayed'] == 3
+    assert replay(str(path))['skipped'] == 1
+    assert replay(str(path))['divergent'] == 0
+
+
+def test_column_records_match_call_records(tmp_path) -> None:
+    """Test that OperationLog.extend writes the bytes of one append per call."""
+    calls = [('add', 1.0, 2.0, 3.0), ('divide', -0.0, 4.0, -0.0),
+             ('multiply', 1e300, 1e10, math.inf)]
+    with OperationLog(str(tmp_path / "columns.bin")) as log:
+        log.extend(*zip(*calls))
+        log.extend(['add'], [1.0], [2.0], [3])  # An int result is logged call by call
+    with OperationLog(str(tmp_path / "calls.bin")) as log:
+        for name, a, b, result in calls + [('add', 1.0, 2.0, 3)]:
+            log.append(name, (a, b), result)
+    assert records(tmp_path / "columns.bin")[1:] == records(tmp_path / "calls.bin")[1:]
+    assert records(tmp_path / "calls.bin")[-1][2] == 0  # 3 is exactly 3.0
+
+
+def test_column_errors_and_call_order(tmp_path) -> None:
+    """Test errors passed to OperationLog.extend, and calls logged between blocks."""
+    error = ZeroDivisionError("Cannot divide by zero")
+    with OperationLog(str(tmp_path / "columns.bin"), buffer_records=2) as log:
+        log.append('add', (1.0, 2.0), 3.0)
+        log.extend(['divide', 'divide', 'add'], [1.0, 6.0, 0.5], [0.0, 3.0, 0.5],
+                   [math.nan, 2.0, 1.0], {0: error})
+        log.append('subtract', (5.0, 1.0), 4.0)
+        log.extend(['multiply'], [2.0], [4.0], [8.0])
+    with OperationLog(str(tmp_path / "calls.bin")) as log:
+        log.append('add', (1.0, 2.0), 3.0)
+        log.append('divide', (1.0, 0.0), error=error)
+        log.append('divide', (6.0, 3.0), 2.0)
+        log.append('add', (0.5, 0.5), 1.0)
+        log.append('subtract', (5.0, 1.0), 4.0)
+        log.append('multiply', (2.0, 4.0), 8.0)
+    columns = records(tmp_path / "columns.bin")[1:]
+    assert [record[:2] for record in columns] == [
+        (1, ErrorCode.OK), (4, ErrorCode.ZERO_DIVISION), (4, ErrorCode.OK), (1, ErrorCode.OK),
+        (2, ErrorCode.OK), (3, ErrorCode.OK)]
+    assert (tmp_path / "columns.bin").read_bytes()[RECORD_SIZE:] == \
+        (tmp_path / "calls.bin").read_bytes()[RECORD_SIZE:]
+
+
+def test_replay_reports_divergences(tmp_path) -> None:
+    """Test that changed results and error codes are reported, and a torn tail dropped."""
+    path = tmp_path / "audit.bin"
+    calc = LoggedCalculator(Calculator(), str(path))
+    for k in range(1000):
+        try:
+            calc.divide(float(k), float(k % 7))
+        except ZeroDivisionError:
+            pass
+    calc.close()
+    data = bytearray(path.read_bytes())
+    RECORD.pack_into(data, 10 * RECORD_SIZE, 4, 0, 0, 9.0, 3.0, 4.0)
+    RECORD.pack_into(data, 15 * RECORD_SIZE, 4, 0, 0, 14.0, 0.0, math.inf)
+    path.write_bytes(bytes(data) + b"\x01" * 20)
+
+    report = replay(str(path), max_divergences=1)
+    assert (report['records'], report['replayed'], report['divergent']) == (1001, 1000, 2)
+    assert report['divergences'] == [{
+        'record': 10, 'operation': 'divide', 'operands': (9.0, 3.0),
+        'logged': (ErrorCode.OK, 4.0), 'replayed': (ErrorCode.OK, 3.0),
+    }]
+    (tmp_path / "notes.txt").write_text("add 1 2\n" * 10)
+    with pytest.raises(ValueError, match="Not an operation log"):
+        replay(str(tmp_path / "notes.txt"))
+
+
+def test_registered_operations_and_sessions(tmp_path) -> None:
+    """Test definition records: codes are per session, unknown names are skipped."""
+    path = str(tmp_path / "ops.bin")
+    register('power', operator.pow)
+    register('negate', operator.neg, arity=1)
+    try:
+        calc = LoggedCalculator(Calculator(), path)
+        assert calc.power(2.0, 10.0) == 1024.0
+        assert calc.negate(3.0) == -3.0
+        calc.close()
+        assert replay(path)['replayed'] == 2
+    finally:
+        unregister('power')
+        unregister('negate')
+    register('negate', operator.neg, arity=1)
+    try:
+        calc = LoggedCalculator(Calculator(), path)  # negate gets power's old code
+        calc.negate(1.0)
+        calc.close()
+        report = replay(path)
+    finally:
+        unregister('negate')
+    assert (report['replayed'], report['skipped'], report['divergent']) == (2, 1, 0)
+
+
+def test_cli_log_and_replay(tmp_path) -> None:
+    """Test --log in stream and single-call modes, and the replay command."""
+    path = str(tmp_path / "cli.bin")
+    with patch('sys.stdin', new=StringIO("add 1 2\ndivide 1 0\nmultiply 2 3\n")), \
+            patch('sys.stdout', new=StringIO()):
+        CalculatorCLI().run(['--log', path, '--stream'])
+    with patch('sys.stdout', new=StringIO()):
+        CalculatorCLI().run(['--log', path, 'subtract', '5', '3'])
+    assert [record[:2] for record in records(path) if record[0]] == [
+        (1, ErrorCode.OK), (4, ErrorCode.ZERO_DIVISION), (3, ErrorCode.OK), (2, ErrorCode.OK)]
+
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        CalculatorCLI().run(['replay', path])
+        CalculatorCLI().run(['--log', path, '--exact', 'add', '1', '2'])
+        CalculatorCLI().run(['replay', str(tmp_path / "missing.bin")])
+    assert fake_out.getvalue().splitlines() == [
+        "Replayed 4 calculations (0 skipped): 0 divergent",
+        "Error: --log cannot be combined with --exact",
+        f"Error: Cannot read {tmp_path / 'missing.bin'}: No such file or directory",
+    ]
+
+    data = bytearray(open(path, 'rb').read())
+    data[RECORD_SIZE + 24:RECORD_SIZE + 32] = struct.pack("<d", 4.0)
+    open(path, 'wb').write(data)
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        CalculatorCLI().run(['replay', path])
+    assert fake_out.getvalue().splitlines() == [
+        "Divergence at record 1: add 1.0 2.0: logged Result: 4.0, replayed Result: 3.0",
+        "Replayed 4 calculations (0 skipped): 1 divergent",
+    ]
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,95 @@
+"""
+Tests for the process-pool batch executor.
+
+Testing Strategy:
+- Results match Calculator.*_many and come back in input order
+- The first failing element reports its global index, not its index in a chunk
+- Inputs that cannot be stored as float64 fall back to in-process evaluation
+- Small inputs and a single worker skip the pool
+- NumPy operands keep a NumPy result when NumPy is installed
+"""
+
+import math
+from array import array
+import pytest
+from src.calculator import Calculator
+from src.calculator.parallel import ParallelBatch
+
+
+@pytest.fixture(scope="module")
+def pool():
+    """A two-worker executor with small chunks, shared by the tests."""
+    with ParallelBatch(workers=2, chunk_size=100) as executor:
+        yield executor
+
+
+def test_results_in_order(pool) -> None:
+    """Test that every operation matches the in-process batch result."""
+    a = [float(i) for i in range(1000)]
+    b = [float(i % 13 + 1) for i in range(1000)]
+    for name in ('add_many', 'subtract_many', 'multiply_many', 'divide_many'):
+        result = getattr(pool, name)(a, b)
+        assert isinstance(result, array)
+        assert list(result) == list(getattr(Calculator, name)(a, b))
+
+
+def test_global_error_index(pool) -> None:
+    """Test that the lowest failing index across chunks is reported."""
+    a = array('d', range(1000))
+    b = array('d', [1.0] * 1000)
+    b[950] = 0.0
+    b[431] = 0.0
+    with pytest.raises(ZeroDivisionError, match=r"Cannot divide by zero \(at index 431\)") as info:
+        pool.divide_many(a, b)
+    assert info.value.index == 431
+
+
+def test_nan_and_type_errors(pool) -> None:
+    """Test NaN inputs in workers and non-numeric inputs in the fallback."""
+    a = [1.0] * 500
+    a[250] = math.nan
+    with pytest.raises(ValueError) as info:
+        pool.add_many(a, [2.0] * 500)
+    assert info.value.index == 250
+    a[250] = "5"
+    with pytest.raises(TypeError) as info:
+        pool.add_many(a, [2.0] * 500)
+    assert info.value.index == 250
+
+
+def test_small_inputs_skip_pool() -> None:
+    """Test that inputs within one chunk are evaluated without a pool."""
+    executor = ParallelBatch(workers=4, chunk_size=100)
+    assert list(executor.add_many([1, 2], [3, 4])) == [4.0, 6.0]
+    assert executor._pool is None
+    single = ParallelBatch(workers=1, chunk_size=1)
+    assert list(single.multiply_many([1, 2], [3, 4])) == [3.0, 8.0]
+    assert single._pool is None
+
+
+def test_invalid_settings() -> None:
+    """Test that invalid worker counts, chunk sizes and lengths are rejected."""
+    with pytest.raises(ValueError):
+        ParallelBatch(workers=0)
+    with pytest.raises(ValueError):
+        ParallelBatch(chunk_size=0)
+    with pytest.raises(ValueError, match="same length"):
+        ParallelBatch().add_many([1, 2], [1])
+
+
+def test_numpy_operands(pool) -> None:
+    """Test that NumPy operands are processed with NumPy in the workers."""
+    np = pytest.importorskip("numpy")
+    a = np.arange(1000, dtype=np.int64)
+    b = np.full(1000, 4.0)
+    result = pool.divide_many(a, b)
+    assert isinstance(result, np.ndarray)
+    assert result.tolist() == (a / 4.0).tolist()
+    b[777] = 0.0
+    with pytest.raises(ZeroDivisionError) as info:
+        pool.divide_many(a, b)
+    assert info.value.index == 777
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,87 @@
+"""
+Tests for the number parsing layer.
+
+Testing Strategy:
+- Single tokens and token lists parse like float(), rejecting NaN early
+- Error messages match CalculatorCLI.calculate
+- exact=True keeps integer tokens as exact ints
+- parse_block returns columns only for blocks of well-formed requests
+- Stream mode output is unchanged by the columnar fast path
+"""
+
+from io import StringIO
+import pytest
+from src.calculator import add, multiply
+from src.calculator.parsing import parse_block, parse_number, parse_numbers
+from src.calculator.__main__ import CalculatorCLI
+
+
+def test_parse_number() -> None:
+    """Test single tokens, including signs, exponents and infinity."""
+    assert parse_number("5") == 5.0 and isinstance(parse_number("5"), float)
+    assert parse_number("-2.5e3") == -2500.0
+    assert parse_number("inf") == float("inf")
+    with pytest.raises(ValueError, match="Invalid number format provided"):
+        parse_number("abc")
+    for token in ("nan", "NaN", "-nan"):
+        with pytest.raises(ValueError, match="Cannot perform operation with NaN value"):
+            parse_number(token)
+
+
+def test_parse_numbers_errors() -> None:
+    """Test that bad formats are reported before NaN, as in calculate."""
+    assert parse_numbers(["1", "2.5", "-3"]) == [1.0, 2.5, -3.0]
+    with pytest.raises(ValueError, match="Invalid number format"):
+        parse_numbers(["nan", "x"])
+    with pytest.raises(ValueError, match="NaN"):
+        parse_numbers(["1", "nan"])
+    cli = CalculatorCLI()
+    with pytest.raises(ValueError, match="Invalid number format"):
+        cli.calculate(["add", "nan", "x"])
+
+
+def test_exact_integers() -> None:
+    """Test that exact=True keeps integers exact for the module functions."""
+    big, one = parse_numbers(["100000000000000000001", "+1"], exact=True)
+    assert big == 10**20 + 1 and isinstance(big, int)
+    assert add(big, one) == 10**20 + 2
+    assert multiply(*parse_numbers(["-3", "1.5"], exact=True)) == -4.5
+    assert parse_number("7", exact=True) == 7 and isinstance(parse_number("7", exact=True), int)
+    assert isinstance(parse_number("7.0", exact=True), float)
+    with pytest.raises(ValueError, match="NaN"):
+        parse_numbers(["1", "nan"], exact=True)
+
+
+def test_parse_block() -> None:
+    """Test columnar parsing of well-formed blocks and rejection of others."""
+    operations, first, second = parse_block(["add 1 2\n", "divide 6 3\n"])
+    assert operations == ["add", "divide"]
+    assert first == [1.0, 6.0] and second == [2.0, 3.0]
+    assert parse_block(["add 1 2\n", "\n"]) is None
+    assert parse_block(["add 1 2\n", "eval 1+2\n"]) is None
+    assert parse_block(["add 1 x\n"]) is None
+    assert parse_block(["power 1 2\n"]) is None
+    assert parse_block([]) is None
+
+
+def test_stream_output_unchanged() -> None:
+    """Test that fast and line-by-line blocks give the same output."""
+    good = [f"multiply {i} 0.5\n" for i in range(5000)]
+    mixed = good[:10] + ["divide 1 0\n", "bad\n", "\n", "add nan 1\n"] + good[:10]
+    out = StringIO()
+    assert CalculatorCLI().stream(good + ["divide 1 0\n"] + good + mixed, out) == 10025
+    lines = out.getvalue().splitlines()
+    expected = [f"Result: {i * 0.5}" for i in range(5000)]
+    assert lines[:5000] == expected
+    assert lines[5000] == "Error: Cannot divide by zero"
+    assert lines[5001:10001] == expected
+    assert lines[10011:10015] == [
+        "Error: Cannot divide by zero",
+        "Error: Operation bad requires exactly 2 numbers",
+        "Error: Empty input line",
+        "Error: Cannot perform operation with NaN value",
+    ]
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,178 @@
+"""
+Tests for the sum/product/mean reductions.
+
+Testing Strategy:
+- Compensated summation is exact where a chain of Calculator.add calls drifts,
+  across chunk boundaries too
+- Validation and overflow follow the Calculator methods, with the failing index
+- Generators are consumed lazily, and running totals come out one per value
+- The CLI exposes the reductions as commands and as --stream aggregations
+"""
+
+import math
+from io import StringIO
+from unittest.mock import patch
+import pytest
+from src.calculator import Calculator
+from src.calculator import reductions
+from src.calculator.reductions import mean, product, running_total, total
+
+
+def test_total_is_compensated() -> None:
+    """Test that summation does not accumulate rounding error."""
+    values = [0.1] * 10
+    chained = 0.0
+    for value in values:
+        chained = Calculator.add(chained, value)
+    assert chained != 1.0
+    assert total(values) == 1.0
+    assert total([1e16, 1.0, -1e16]) == 1.0
+    assert total([]) == 0.0
+    assert total([1, 2, True]) == 4.0
+
+
+def test_total_across_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that compensation carries across chunks."""
+    monkeypatch.setattr(reductions, 'CHUNK_SIZE', 3)
+    values = [1e16] + [1.0] * 10 + [-1e16]
+    assert total(values) == 10.0
+    assert mean([1.0, 2.0, 3.0, 4.0]) == 2.5
+
+
+def test_total_overflow() -> None:
+    """Test that sums beyond the float range overflow like Calculator.add."""
+    assert total([1e308, 1e308]) == math.inf
+    assert total([-1e308, -1e308]) == -math.inf
+    assert total([10**400, 1.0]) == math.inf
+    assert total([10**400, -10**400, 1.5]) == 1.5
+    assert total([math.inf, 1.0, math.inf]) == math.inf
+
+
+def test_nan_result() -> None:
+    """Test that infinities of both signs raise like Calculator.add, at their index."""
+    with pytest.raises(ValueError, match=r"Result is not a number \(NaN\) \(at index 2\)"):
+        total([math.inf, 1.0, -math.inf])
+    with pytest.raises(ValueError, match=r"Result is not a number \(NaN\) \(at index 1\)"):
+        mean([math.inf, -math.inf])
+    with pytest.raises(ValueError, match=r"\(at index 1\)"):
+        total([math.inf, -10**400])
+    # Infinities of both signs in different chunks
+    values = [math.inf] * reductions.CHUNK_SIZE + [2.0, -math.inf]
+    with pytest.raises(ValueError, match="Result is not a number") as error:
+        total(values)
+    assert error.value.index == reductions.CHUNK_SIZE + 1
+    running = running_total([math.inf, 1.0, -math.inf])
+    assert next(running) == next(running) == math.inf
+    with pytest.raises(ValueError, match=r"\(at index 2\)"):
+        next(running)
+
+
+def test_validation_reports_index() -> None:
+    """Test type and NaN errors with the position of the bad value."""
+    with pytest.raises(TypeError, match=r"Cannot sum str \(at index 2\)") as error:
+        total([1, 2, "3"])
+    assert error.value.index == 2
+    with pytest.raises(ValueError, match=r"NaN value \(at index 1\)"):
+        mean([1.0, math.nan])
+    with pytest.raises(ValueError, match="no values"):
+        mean([])
+
+
+def test_product() -> None:
+    """Test products, including the Calculator.multiply error cases."""
+    assert product([2, 3.5, 4]) == 28.0
+    assert product([]) == 1.0
+    assert product([1e200, 1e200]) == math.inf
+    with pytest.raises(ValueError, match=r"Result is not a number \(NaN\) \(at index 2\)"):
+        product([1e308, 10.0, 0.0])
+    with pytest.raises(OverflowError, match=r"^int too large to convert to float \(at index 1\)"):
+        product([2, 10**400])
+
+
+def test_product_overflow_matches_multiply() -> None:
+    """Test that int products beyond the float range are infinite, as with Calculator.multiply."""
+    for a, b in ((10**200, 10**200), (10**200, -10**200), (-2**1023, 2), (10**300, 1e300)):
+        assert product([a, b]) == Calculator.multiply(a, b)
+        assert math.copysign(1.0, product([a, b])) == math.copysign(1.0, Calculator.multiply(a, b))
+    for values in ([10**400, 1], [1, -10**400]):
+        with pytest.raises(OverflowError):
+            Calculator.multiply(*values)
+        with pytest.raises(OverflowError):
+            product(values)
+
+
+def test_lazy_consumption() -> None:
+    """Test that generators are consumed without building a list first."""
+    assert total(float(i) for i in range(100001)) == 5000050000.0
+
+    consumed = []
+
+    def values():
+        for value in (1.0, 2.0, 3.0):
+            consumed.append(value)
+            yield value
+
+    totals = running_total(values())
+    assert next(totals) == 1.0
+    assert consumed == [1.0]
+    assert list(totals) == [3.0, 6.0]
+
+
+def test_running_total_errors() -> None:
+    """Test that running totals stop at the first bad value."""
+    results = []
+    with pytest.raises(ValueError, match=r"\(at index 2\)"):
+        for value in running_total([1.0, 2.0, math.nan]):
+            results.append(value)
+    assert results == [1.0, 3.0]
+
+
+def test_cli_reduction_commands() -> None:
+    """Test the sum, product and mean commands."""
+    from src.calculator.__main__ import CalculatorCLI
+
+    cli = CalculatorCLI()
+    assert cli.calculate(['sum', '0.1', '0.2', '0.3']) == 0.6
+    assert cli.calculate(['product', '2', '3', '4']) == 24.0
+    assert cli.calculate(['mean', '5']) == 5.0
+    with pytest.raises(ValueError, match="requires at least 1 number"):
+        cli.calculate(['sum'])
+    with pytest.raises(ValueError, match="Invalid number format"):
+        cli.calculate(['sum', '1', 'x'])
+    with patch('sys.stdout', new_callable=StringIO) as output:
+        cli.run(['add', 'inf', '-inf'])
+        cli.run(['sum', 'inf', '-inf'])
+        cli.run(['mean', 'inf', '-inf'])
+    assert output.getvalue().splitlines() == ["Error: Result is not a number (NaN)"] + [
+        "Error: Result is not a number (NaN) (at index 1)"] * 2
+
+    with patch('sys.stdout', new_callable=StringIO) as output:
+        CalculatorCLI().run(['--exact', 'mean', '1', '2'])
+    assert output.getvalue() == "Result: 3/2\n"
+
+
+def test_stream_aggregations() -> None:
+    """Test --stream aggregations over one number per line."""
+    from src.calculator.__main__ import CalculatorCLI
+
+    cli = CalculatorCLI()
+    out = StringIO()
+    assert cli.aggregate(["0.1\n", "0.2\n", "0.3\n"], 'sum', out) == 3
+    assert out.getvalue() == "Result: 0.6\n"
+
+    out = StringIO()
+    cli.aggregate(["1\n", "2\n", "x\n", "4\n"], 'running-sum', out)
+    assert out.getvalue() == (
+        "Result: 1.0\nResult: 3.0\nError: Invalid number format provided (at index 2)\n"
+    )
+
+    out = StringIO()
+    cli.aggregate([], 'mean', out)
+    assert out.getvalue() == "Error: Cannot compute the mean of no values\n"
+
+    with pytest.raises(ValueError, match="Unknown aggregation"):
+        cli.aggregate([], 'median', StringIO())
+
+
+if __name__ == "__main__":
+    pytest.main()
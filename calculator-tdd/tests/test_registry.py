@@ -0,0 +1,182 @@
+"""
+Tests for the operation registry.
+
+Testing Strategy:
+- The built-in operations map to the Calculator methods, the fast functions
+  and the module-level functions
+- Built-in and registered operations share one validation and its messages
+- Policies (validation, overflow, result type) select and cache implementations
+- An operation registered at runtime works from Calculator, the CLI, stream
+  and CSV mode, the batch functions and the cache without further changes
+- Exact results beyond the float range overflow to infinity with their sign
+- Invalid and duplicate registrations are rejected
+"""
+
+import math
+import operator
+from io import StringIO
+import pytest
+from src.calculator import Calculator, add, fast
+from src.calculator.batch import apply_many
+from src.calculator.cache import CachedCalculator
+from src.calculator.registry import OPERATIONS, get, names, register, resolve, unregister
+from src.calculator.table import calculate_columns
+
+
+@pytest.fixture
+def power():
+    """Register a ``power`` operation for the duration of a test."""
+    operation = register('power', operator.pow)
+    yield operation
+    unregister('power')
+
+
+def test_builtin_operations() -> None:
+    """Test that the built-in operations reuse the existing implementations."""
+    assert names()[:4] == ('add', 'subtract', 'multiply', 'divide')
+    operation = get('add')
+    assert operation.arity == 2
+    assert operation.checked is Calculator.add
+    assert operation.unchecked is fast.add
+    assert operation.function is add
+
+
+def test_registered_operations_validate_like_builtins(power) -> None:
+    """Test that every checked implementation raises the same errors."""
+    calc = Calculator()
+    with pytest.raises(TypeError, match="Cannot subtract str from int"):
+        calc.subtract(1, "2")
+    with pytest.raises(TypeError, match="Cannot divide str by int"):
+        calc.divide("1", 2)
+    with pytest.raises(TypeError, match="Cannot power str and int"):
+        calc.power("1", 2)
+    for method in (calc.add, calc.power):
+        with pytest.raises(ValueError, match="NaN value"):
+            method(2.0, math.nan)
+        with pytest.raises(OverflowError):
+            method(10**400, 1)
+    with pytest.raises(ZeroDivisionError, match="Cannot divide by zero"):
+        fast.divide(1.0, 0.0)
+
+
+def test_bind_policies() -> None:
+    """Test that bind picks an implementation per policy and caches it."""
+    assert resolve('add') is Calculator.add
+    assert resolve('add', validate=False) is fast.add
+    assert resolve('add', validate=False, result='native')(10**20, 1) == 10**20 + 1
+    with pytest.raises(TypeError):
+        resolve('add', result='native')("1", 2)
+
+    strict = resolve('multiply', overflow='raise')
+    assert strict is resolve('multiply', overflow='raise')
+    assert strict(2.0, 3.0) == 6.0
+    assert Calculator.multiply(1e308, 10.0) == math.inf
+    with pytest.raises(OverflowError, match="too large"):
+        strict(1e308, 10.0)
+    assert strict(math.inf, 2.0) == math.inf
+
+    with pytest.raises(ValueError, match="Unknown overflow policy"):
+        resolve('add', overflow='wrap')
+    with pytest.raises(ValueError, match="Unknown operation: power"):
+        resolve('power')
+
+
+def test_registered_operation_follows_calculator_rules(power) -> None:
+    """Test the checked and unchecked implementations built for a new operation."""
+    assert power.checked(2, 10) == 1024.0
+    assert isinstance(power.checked(2, 10), float)
+    assert power.unchecked(2.0, 0.5) == math.sqrt(2)
+    with pytest.raises(TypeError, match="Cannot power str and int"):
+        power.checked("2", 3)
+    with pytest.raises(ValueError, match="NaN value"):
+        power.checked(math.nan, 2)
+
+
+def test_registered_operation_overflow_sign() -> None:
+    """Test that exact results beyond the float range give infinity with their sign."""
+    register('scale', lambda a, b: a * b * 10**400)
+    try:
+        scale = OPERATIONS['scale']
+        assert scale.checked(2, 3) == math.inf
+        assert scale.checked(2, -3) == -math.inf
+        assert Calculator().calculate('scale', -1, 1) == -math.inf
+        with pytest.raises(OverflowError):  # Raised by the operation itself: no sign to give
+            scale.checked(2.0, 3.0)
+    finally:
+        unregister('scale')
+
+
+def test_registered_operation_on_calculator(power) -> None:
+    """Test that Calculator instances pick up a registered operation."""
+    assert Calculator().power(3, 2) == 9.0
+    assert Calculator(validate=False).power(3.0, 2.0) == 9.0
+    assert Calculator().calculate('power', 2, 3) == 8.0
+    assert Calculator().calculate('add', 2, 3) == 5.0
+    with pytest.raises(AttributeError):
+        Calculator().root
+    with pytest.raises(ValueError, match="Unknown operation: root"):
+        Calculator().calculate('root', 4, 2)
+
+
+def test_registered_operation_in_cli(power) -> None:
+    """Test that the CLI, stream and CSV mode dispatch a registered operation."""
+    from src.calculator.__main__ import CalculatorCLI
+
+    cli = CalculatorCLI()
+    assert cli.calculate(['power', '2', '8']) == 256.0
+
+    out = StringIO()
+    cli.stream(["power 2 3\n", "add 1 2\n", "power 2 x\n"], out)
+    assert out.getvalue() == (
+        "Result: 8.0\nResult: 3.0\nError: Invalid number format provided\n"
+    )
+
+    out = StringIO()
+    calculate_columns(["x,y\n", "3,2\n"], out, operation='power', a='x', b='y')
+    assert out.getvalue() == "x,y,result\n3,2,9.0\n"
+
+
+def test_registered_operation_in_batch_and_cache(power) -> None:
+    """Test batch evaluation and caching of a registered operation."""
+    assert list(apply_many('power', [2, 3], [3, 2])) == [8.0, 9.0]
+    with pytest.raises(TypeError, match=r"\(at index 1\)"):
+        apply_many('power', [2, "3"], [3, 2])
+
+    cached = CachedCalculator(Calculator())
+    assert cached.power(2, 4) == 16.0
+    assert cached.power(2, 4) == 16.0
+    assert cached.stats()['hits'] == 1
+
+
+def test_unary_operation_in_cli() -> None:
+    """Test that the CLI checks a registered operation's arity."""
+    from src.calculator.__main__ import CalculatorCLI
+
+    register('negate', operator.neg, arity=1)
+    try:
+        cli = CalculatorCLI()
+        assert cli.calculate(['negate', '4']) == -4.0
+        with pytest.raises(ValueError, match="requires exactly 1 number$"):
+            cli.calculate(['negate', '4', '5'])
+        with pytest.raises(ValueError, match="does not take two operands"):
+            apply_many('negate', [1], [2])
+    finally:
+        unregister('negate')
+    assert 'negate' not in OPERATIONS
+
+
+def test_invalid_registrations() -> None:
+    """Test that taken, reserved and malformed names are rejected."""
+    for name in ('add', 'eval', 'batch', 'calculate', 'add_many', '_private', 'two words'):
+        with pytest.raises(ValueError):
+            register(name, operator.pow)
+    with pytest.raises(ValueError, match="Arity"):
+        register('nothing', lambda: 0, arity=0)
+    with pytest.raises(ValueError, match="built-in"):
+        unregister('divide')
+    with pytest.raises(ValueError, match="Unknown operation"):
+        unregister('power')
+
+
+if __name__ == "__main__":
+    pytest.main()
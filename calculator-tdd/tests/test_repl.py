@@ -0,0 +1,113 @@
+"""
+Tests for the interactive session mode.
+
+Testing Strategy:
+- Lines give the same results and error messages as CalculatorCLI.run
+- ans and named results chain calculations, in operands and expressions
+- Session commands toggle timing and list results and history
+- History is appended to the file in batches and when the session ends
+"""
+
+from io import StringIO
+from unittest.mock import patch
+import pytest
+from src.calculator import repl
+from src.calculator.repl import Session
+
+
+def run_lines(*lines: str, session: Session = None) -> str:
+    """Run lines through a session without history, returning its output."""
+    session = session if session is not None else Session()
+    out = StringIO()
+    session.run(lines, out)
+    return out.getvalue()
+
+
+def test_matches_cli_output() -> None:
+    """Test that results and errors are printed as the CLI prints them."""
+    from src.calculator.__main__ import CalculatorCLI
+
+    lines = ["add 5 3", "divide 1 0", "add 1 x", "multiply 1", "power 2 3",
+             "divide 1e308 1e-308", "sum 0.1 0.2 0.3"]
+    expected = []
+    for line in lines:
+        with patch('sys.stdout', new_callable=StringIO) as output:
+            CalculatorCLI().run(line.split())
+        expected.append(output.getvalue())
+    assert run_lines(*lines) == "".join(expected)
+
+
+def test_ans_and_names() -> None:
+    """Test chaining results through ans and stored names."""
+    output = run_lines(
+        "add 1 2",
+        "x = multiply ans 10",
+        "divide x 0",  # errors leave ans unchanged
+        "subtract x ans",
+        'eval "(x + ans) / 2"',
+        'eval "x * k" k=2',
+        "y = 4",
+        "ans",
+        "z",
+    )
+    assert output.splitlines() == [
+        "Result: 3.0",
+        "Result: 30.0",
+        "Error: Cannot divide by zero",
+        "Result: 0.0",
+        "Result: 15.0",
+        "Result: 60.0",
+        "Result: 4.0",
+        "Result: 4.0",
+        "Error: Unknown name: z",
+    ]
+    assert run_lines("add = add 1 2") == "Error: Cannot assign to add\n"
+
+
+def test_commands() -> None:
+    """Test the timing, vars, history and quit commands."""
+    session = Session()
+    output = run_lines(":time", "add 1 2", ":time off", "v = add 2 2", ":vars",
+                       ":history", ":nope", ":quit", "add 9 9", session=session)
+    lines = output.splitlines()
+    assert lines[:2] == ["Timing on", "Result: 3.0"]
+    assert lines[2].startswith("Time: ")
+    assert lines[3:7] == ["Timing off", "Result: 4.0", "ans = 4.0", "v = 4.0"]
+    assert lines[7] == "   1  :time"
+    assert lines[-1] == "Error: Unknown command: :nope"
+    assert "Result: 18.0" not in lines
+    assert session.finished
+
+
+def test_history_is_written_in_batches(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that history reaches the file in batches and at the end."""
+    monkeypatch.setattr(repl, 'HISTORY_BATCH', 3)
+    path = tmp_path / "history"
+    session = Session(history_path=str(path))
+    session.execute("add 1 2")
+    session.execute("add 3 4")
+    assert not path.exists()
+    session.execute("   ")  # blank lines are not history
+    session.execute("add 5 6")
+    assert path.read_text() == "add 1 2\nadd 3 4\nadd 5 6\n"
+    run_lines("ans", session=session)
+    assert path.read_text().splitlines()[-1] == "ans"
+
+    monkeypatch.setenv('CALCULATOR_HISTORY', "")
+    assert repl.default_history_path() is None
+
+
+def test_cli_repl_mode(tmp_path) -> None:
+    """Test python -m calculator repl with options applied to the session."""
+    from src.calculator.__main__ import CalculatorCLI
+
+    path = tmp_path / "history"
+    with patch('sys.stdin', StringIO("divide 1 3\nadd ans ans\n")), \
+            patch('sys.stdout', new_callable=StringIO) as output:
+        CalculatorCLI().run(['--exact', 'repl', '--history', str(path)])
+    assert output.getvalue() == "Result: 1/3\nResult: 2/3\n"
+    assert path.read_text() == "divide 1 3\nadd ans ans\n"
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,191 @@
+"""
+Tests for the calculator server and client.
+
+Testing Strategy:
+- Requests over TCP localhost and Unix sockets get CLI-identical responses
+- Pipelined requests come back complete and in order
+- Bad requests produce an error line without closing the connection; a line
+  longer than MAX_LINE gets an error and closes it
+- Several clients can be served at the same time
+- Only loopback hosts are accepted, and only a stale socket is replaced at --socket
+- serve exits cleanly if its socket file is already gone
+"""
+
+import os
+import socket
+import threading
+from io import StringIO
+from unittest.mock import patch
+import pytest
+from src.calculator.server import (MAX_LINE, RECV_SIZE, CalculatorClient, create_server,
+                                  parse_address)
+from src.calculator.__main__ import CalculatorCLI
+
+
+@pytest.fixture
+def tcp_server():
+    """Run a TCP server on a free localhost port."""
+    server = create_server(port=0)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_tcp_request(tcp_server) -> None:
+    """Test a single request over TCP."""
+    port = tcp_server.server_address[1]
+    with CalculatorClient(port=port) as client:
+        assert client.calculate('add', 5, 3) == "Result: 8.0"
+        assert client.calculate('divide', 10, 0) == "Error: Cannot divide by zero"
+
+
+def test_pipelined_requests(tcp_server) -> None:
+    """Test that many pipelined requests are answered in order."""
+    port = tcp_server.server_address[1]
+    requests = [f"multiply {i} 2" for i in range(5000)]
+    with CalculatorClient(port=port) as client:
+        responses = client.calculate_many(requests, window=700)
+    assert responses == [f"Result: {float(i * 2)}" for i in range(5000)]
+
+
+def test_bad_requests_keep_connection(tcp_server) -> None:
+    """Test that errors are answered per line and the connection stays open."""
+    port = tcp_server.server_address[1]
+    with CalculatorClient(port=port) as client:
+        assert client.calculate_many(["add x 1", "", "--help", "eval (1+2)*3", "subtract 10 4"]) == [
+            "Error: Invalid number format provided",
+            "Error: Empty input line",
+            "Error: Help is not available in stream mode",
+            "Result: 9.0",
+            "Result: 6.0",
+        ]
+
+
+def test_split_request_lines(tcp_server) -> None:
+    """Test that a request split across several sends is reassembled."""
+    port = tcp_server.server_address[1]
+    with socket.create_connection(('127.0.0.1', port)) as sock:
+        sock.sendall(b"add 1")
+        sock.sendall(b" 2\nsubtract 5 ")
+        sock.sendall(b"1\n")
+        reader = sock.makefile('rb')
+        assert reader.readline() == b"Result: 3.0\n"
+        assert reader.readline() == b"Result: 4.0\n"
+
+
+def test_long_line_closes_connection(tcp_server) -> None:
+    """Test that a line longer than MAX_LINE is answered with an error and the connection closed."""
+    port = tcp_server.server_address[1]
+    with socket.create_connection(('127.0.0.1', port)) as sock:
+        # One byte over: the server has read everything when it closes, so no reset
+        sock.sendall(b"add 1 2\n" + b"1" * (MAX_LINE + 1))
+        responses = b""
+        while True:
+            data = sock.recv(RECV_SIZE)
+            if not data:
+                break
+            responses += data
+    assert responses == b"Result: 3.0\nError: Request line too long\n"
+
+
+def test_concurrent_clients(tcp_server) -> None:
+    """Test that several clients are served at the same time."""
+    port = tcp_server.server_address[1]
+    results = {}
+
+    def worker(n: int) -> None:
+        with CalculatorClient(port=port) as client:
+            results[n] = client.calculate_many([f"add {n} {i}" for i in range(200)])
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for n in range(8):
+        assert results[n] == [f"Result: {float(n + i)}" for i in range(200)]
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="Unix sockets not available")
+def test_unix_socket(tmp_path) -> None:
+    """Test requests over a Unix-domain socket."""
+    path = str(tmp_path / "calc.sock")
+    server = create_server(socket_path=path)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    try:
+        with CalculatorClient(socket_path=path) as client:
+            assert client.calculate('subtract', 10, 4) == "Result: 6.0"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="needs Unix sockets")
+def test_socket_path_and_host_checks(tmp_path) -> None:
+    """Test that regular files are never removed and non-loopback hosts are refused."""
+    path = tmp_path / "notes.txt"
+    path.write_text("keep me")
+    with pytest.raises(ValueError, match="exists and is not a socket"):
+        create_server(socket_path=str(path))
+    assert path.read_text() == "keep me"
+
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(tmp_path / "stale.sock"))
+    stale.close()  # Leaves the socket file behind, as a crashed server would
+    create_server(socket_path=str(tmp_path / "stale.sock")).server_close()
+
+    for host in ('0.0.0.0', '192.168.1.10', 'example.com'):
+        with pytest.raises(ValueError, match=f"Refusing to listen on {host}"):
+            create_server(host=host, port=0)
+    for host in ('localhost', '127.0.0.2'):
+        create_server(host=host, port=0).server_close()
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        CalculatorCLI().run(['serve', '--host', '0.0.0.0', '--port', '0'])
+    assert fake_out.getvalue().startswith("Error: Refusing to listen on 0.0.0.0")
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="needs Unix sockets")
+def test_cli_serve_socket_already_removed(tmp_path) -> None:
+    """Test that serve exits cleanly when its socket file was removed meanwhile."""
+    path = tmp_path / "calc.sock"
+
+    def serve_until_interrupted(server, *args) -> None:
+        os.unlink(path)
+        raise KeyboardInterrupt
+
+    with patch('socketserver.BaseServer.serve_forever', serve_until_interrupted), \
+            patch('sys.stdout', new=StringIO()) as fake_out, patch('sys.stderr', new=StringIO()):
+        CalculatorCLI().run(['serve', '--socket', str(path)])
+    assert fake_out.getvalue() == ""
+    assert not path.exists()
+
+
+def test_cli_client_shim(tcp_server) -> None:
+    """Test the client subcommand prints the server response."""
+    port = str(tcp_server.server_address[1])
+    cli = CalculatorCLI()
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        cli.run(['client', '--port', port, 'multiply', '6', '7'])
+    assert fake_out.getvalue() == "Result: 42.0\n"
+    with patch('sys.stdin', new=StringIO("add 1 2\ndivide 1 0\n")), \
+            patch('sys.stdout', new=StringIO()) as fake_out:
+        cli.run(['client', '--port', port])
+    assert fake_out.getvalue() == "Result: 3.0\nError: Cannot divide by zero\n"
+
+
+def test_parse_address() -> None:
+    """Test parsing of the server address options."""
+    args = ['--port', '8000', 'add', '1', '2']
+    assert parse_address(args) == {'port': 8000}
+    assert args == ['add', '1', '2']
+    with pytest.raises(ValueError):
+        parse_address(['add', '1', '2'])
+    with pytest.raises(ValueError):
+        parse_address(['--port', 'abc'])
+
+
+if __name__ == "__main__":
+    pytest.main()
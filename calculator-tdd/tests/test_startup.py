@@ -0,0 +1,64 @@
+"""
+Tests for the cost of starting ``python -m calculator`` for a single operation.
+
+Testing Strategy:
+- The ``op a b`` path does not import argparse, typing or any mode-specific module
+- The package's cumulative import time, as reported by ``-X importtime``,
+  stays under a budget (a warm-up run writes the bytecode cache first)
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+PROJECT = Path(__file__).resolve().parent.parent
+
+# Cumulative microseconds allowed for importing the calculator package
+IMPORT_BUDGET_US = 20_000
+
+# Modules the plain "op a b" path must not pull in
+FORBIDDEN = {
+    'argparse', 'typing', 're', 'array', 'asyncio', 'socket', 'socketserver', 'json',
+    'calculator.batch', 'calculator.expression', 'calculator.usage', 'calculator.cache',
+    'calculator.server', 'calculator.async_server', 'calculator.repl',
+    'calculator.daemon',
+}
+
+
+def _import_times(*args: str) -> tuple:
+    """Run the CLI under ``-X importtime`` and return (stdout, {module: cumulative_us})."""
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    command = [sys.executable, '-X', 'importtime', '-m', 'calculator', *args]
+    subprocess.run(command, cwd=PROJECT, env=env, capture_output=True, check=True)
+    result = subprocess.run(command, cwd=PROJECT, env=env, capture_output=True,
+                            text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # "import time:  self_us | cumulative_us | [indent]module"
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative)
+    return result.stdout, times
+
+
+def test_single_operation_imports() -> None:
+    """Test that a plain operation avoids argparse, typing and mode-specific modules."""
+    output, times = _import_times('add', '1', '2')
+    assert output == "Result: 3.0\n"
+    assert 'calculator.cli' in times
+    assert not FORBIDDEN & set(times)
+
+
+def test_import_time_budget() -> None:
+    """Test that importing the calculator package stays within the startup budget."""
+    _, times = _import_times('multiply', '2', '3')
+    total = times['calculator'] + times['calculator.cli']
+    assert total < IMPORT_BUDGET_US, f"calculator imports took {total}us"
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,162 @@
+"""
+Tests for the opt-in operation instrumentation.
+
+Testing Strategy:
+- Calls, errors by kind, overflows to infinity and latency buckets are counted
+  per operation, and reset clears them, finished threads' counts included
+- Uninstrumented calculators are left untouched
+- Snapshots export to one JSON line and to the Prometheus text format
+- The CLI's --stats option reports on stderr, and servers answer "metrics"
+- Counters of exited threads are merged and dropped: memory stays flat over
+  many short-lived threads, such as one per server connection
+"""
+
+import json
+import math
+import threading
+from io import StringIO
+from unittest.mock import patch
+import pytest
+from src.calculator import Calculator
+from src.calculator.server import CalculatorClient, create_server
+from src.calculator.stats import InstrumentedCalculator, PerThread, format_json, format_prometheus
+
+
+def test_counts_calls_errors_and_overflows() -> None:
+    """Test the counters recorded for each operation."""
+    calc = InstrumentedCalculator(Calculator())
+    assert calc.add(1, 2) == 3.0
+    assert calc.multiply(1e308, 10) == math.inf
+    assert calc.multiply(math.inf, 2) == math.inf  # infinite operand: not an overflow
+    with pytest.raises(ZeroDivisionError):
+        calc.divide(1, 0)
+    with pytest.raises(TypeError):
+        calc.divide("1", 2)
+    with pytest.raises(ValueError):
+        calc.add(math.nan, 1)
+
+    stats = calc.stats()
+    assert stats['add']['calls'] == 2
+    assert stats['add']['errors'] == {'NAN_INPUT': 1}
+    assert stats['multiply']['overflows'] == 1
+    assert stats['divide']['errors'] == {'ZERO_DIVISION': 1, 'TYPE_ERROR': 1}
+    assert stats['subtract']['calls'] == 0
+    buckets = stats['divide']['buckets']
+    assert buckets[-1] == [math.inf, 2]
+    assert [count for _, count in buckets] == sorted(count for _, count in buckets)
+    assert stats['divide']['seconds'] > 0
+
+    calc.reset()
+    assert calc.stats()['add']['calls'] == 0
+    assert calc.stats()['divide']['errors'] == {}
+
+
+def test_no_wrapper_when_off() -> None:
+    """Test that instrumentation never touches the wrapped calculator."""
+    plain = Calculator(validate=False)
+    add = plain.add
+    descriptor = Calculator.__dict__['add']
+    InstrumentedCalculator(plain)
+    assert plain.add is add
+    assert Calculator.__dict__['add'] is descriptor
+
+
+def test_exports() -> None:
+    """Test the JSON and Prometheus exports."""
+    calc = InstrumentedCalculator(Calculator(), buckets=(1.0,))
+    calc.add(1, 2)
+    with pytest.raises(ZeroDivisionError):
+        calc.divide(1, 0)
+
+    line = format_json(calc.stats())
+    assert "\n" not in line
+    data = json.loads(line)['operations']
+    assert data['add']['calls'] == 1
+    assert data['add']['buckets'] == [[1.0, 1], ["+Inf", 1]]
+
+    text = format_prometheus(calc.stats())
+    assert 'calculator_operations_total{operation="add"} 1\n' in text
+    assert 'calculator_errors_total{operation="divide",error="ZERO_DIVISION"} 1\n' in text
+    assert 'calculator_operation_seconds_bucket{operation="add",le="+Inf"} 1\n' in text
+    assert 'calculator_operation_seconds_count{operation="divide"} 1\n' in text
+    assert format_prometheus(data) == text  # read back from JSON
+
+
+def test_cli_stats_option() -> None:
+    """Test that --stats reports on stderr after the normal output."""
+    from src.calculator.__main__ import CalculatorCLI
+
+    with patch('sys.stdout', new_callable=StringIO) as out, \
+            patch('sys.stderr', new_callable=StringIO) as err:
+        CalculatorCLI().run(['--stats', 'json', 'divide', '1', '0'])
+    assert out.getvalue() == "Error: Cannot divide by zero\n"
+    assert json.loads(err.getvalue())['operations']['divide']['errors'] == {'ZERO_DIVISION': 1}
+
+    with patch('sys.stdout', new_callable=StringIO) as out:
+        CalculatorCLI().run(['--stats', 'xml', 'add', '1', '2'])
+    assert out.getvalue() == "Error: Unknown stats format: xml\n"
+
+
+def test_short_lived_threads_are_merged() -> None:
+    """Test exact counts and bounded per-thread state over many short-lived threads."""
+    calc = InstrumentedCalculator(Calculator())
+
+    def work() -> None:
+        calc.add(1, 2)
+        try:
+            calc.divide(1, 0)
+        except ZeroDivisionError:
+            pass
+
+    for _ in range(10):
+        threads = [threading.Thread(target=work) for _ in range(50)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert len(calc._records._values) == 0  # Every thread has exited
+    calc.add(3, 4)  # This thread's counters stay live
+    report = calc.stats()
+    assert report['add']['calls'] == 501
+    assert report['divide']['errors'] == {'ZERO_DIVISION': 500}
+    assert report['divide']['buckets'][-1][1] == 500
+
+    def merge(total: list, value: list) -> None:
+        total[0] += value[0]
+
+    counters = PerThread(lambda: [0], merge)
+    thread = threading.Thread(target=lambda: counters.get().__setitem__(0, 7))
+    thread.start()
+    thread.join()
+    assert counters.values() == [[7]]
+    counters.get()[0] = 3
+    counters.reset(lambda value: value.__setitem__(0, 0))
+    assert counters.values() == [[0], [0]]  # This thread's, and no finished threads' total
+
+
+def test_server_metrics() -> None:
+    """Test the metrics request of an instrumented server."""
+    from src.calculator.__main__ import CalculatorCLI
+
+    cli = CalculatorCLI()
+    assert cli._apply_options(['--stats', 'json']) == []
+    server = create_server(port=0, cli=cli)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    try:
+        with CalculatorClient(port=server.server_address[1]) as client:
+            client.calculate_many(["add 1 2", "multiply 2 3", "divide 1 0"])
+            metrics = json.loads(client.calculate('metrics'))['operations']
+        assert metrics['divide']['errors'] == {'ZERO_DIVISION': 1}
+        assert metrics['multiply']['calls'] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    out = StringIO()
+    CalculatorCLI().stream(["metrics\n"], out)
+    assert out.getvalue() == "Error: Instrumentation is off (use --stats)\n"
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,96 @@
+"""
+Tests for the CLI stream mode.
+
+Testing Strategy:
+- One output line per input line, in order
+- Bad lines produce an error line without stopping the stream
+- Input can come from stdin or from a file argument
+"""
+
+from io import StringIO
+from unittest.mock import patch
+import pytest
+from src.calculator.__main__ import CalculatorCLI
+
+
+def test_stream_results() -> None:
+    """Test that each line is evaluated through calculate."""
+    cli = CalculatorCLI()
+    out = StringIO()
+    count = cli.stream(["add 5 3\n", "divide 15 3\n", "multiply 2.5 4\n"], out)
+    assert count == 3
+    assert out.getvalue() == "Result: 8.0\nResult: 5.0\nResult: 10.0\n"
+
+
+def test_stream_errors_do_not_stop() -> None:
+    """Test that a failing line only affects its own output line."""
+    cli = CalculatorCLI()
+    out = StringIO()
+    cli.stream([
+        "divide 10 0\n",
+        "add abc 3\n",
+        "power 2 3\n",
+        "add 1\n",
+        "\n",
+        "subtract 10 4\n",
+    ], out)
+    assert out.getvalue().splitlines() == [
+        "Error: Cannot divide by zero",
+        "Error: Invalid number format provided",
+        "Error: Unknown operation: power",
+        "Error: Operation add requires exactly 2 numbers",
+        "Error: Empty input line",
+        "Result: 6.0",
+    ]
+
+
+def test_stream_matches_run_output() -> None:
+    """Test that stream lines use the same text as single runs."""
+    cli = CalculatorCLI()
+    for line in ["add 2 3", "divide 1 0", "multiply nan 2"]:
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            cli.run(line.split())
+        out = StringIO()
+        cli.stream([line], out)
+        assert out.getvalue() == fake_out.getvalue()
+
+
+def test_stream_from_stdin() -> None:
+    """Test --stream reading from stdin."""
+    cli = CalculatorCLI()
+    with patch('sys.stdin', new=StringIO("add 1 2\nsubtract 5 1\n")), \
+            patch('sys.stdout', new=StringIO()) as fake_out:
+        cli.run(['--stream'])
+    assert fake_out.getvalue() == "Result: 3.0\nResult: 4.0\n"
+
+
+def test_stream_from_file(tmp_path) -> None:
+    """Test --stream reading from a file argument."""
+    path = tmp_path / "ops.txt"
+    path.write_text("multiply 6 7\ndivide 1 0\n")
+    cli = CalculatorCLI()
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        cli.run(['--stream', str(path)])
+    assert fake_out.getvalue() == "Result: 42.0\nError: Cannot divide by zero\n"
+
+
+def test_stream_missing_file(tmp_path) -> None:
+    """Test that an unreadable file is reported as an error."""
+    cli = CalculatorCLI()
+    with patch('sys.stdout', new=StringIO()) as fake_out:
+        cli.run(['--stream', str(tmp_path / "missing.txt")])
+    assert fake_out.getvalue().startswith("Error: Cannot read")
+
+
+def test_stream_large_input() -> None:
+    """Test that output is complete when it spans several buffered blocks."""
+    cli = CalculatorCLI()
+    out = StringIO()
+    count = cli.stream((f"add {i} 1\n" for i in range(10000)), out)
+    lines = out.getvalue().splitlines()
+    assert count == len(lines) == 10000
+    assert lines[-1] == "Result: 10000.0"
+
+
+if __name__ == "__main__":
+    pytest.main()
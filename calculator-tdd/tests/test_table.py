@@ -0,0 +1,84 @@
+"""
+Tests for the CSV/TSV column calculator.
+
+Testing Strategy:
+- Each row gets a result column computed from the named columns
+- Expressions use column names as variables
+- Bad cells produce the CLI error messages without stopping the run
+- Output is written in chunks and matches a single-chunk run
+- The ``csv`` CLI subcommand reads files or stdin and reports rows/sec
+"""
+
+from io import StringIO
+from unittest.mock import patch
+import pytest
+from src.calculator.table import calculate_columns
+from src.calculator.__main__ import CalculatorCLI
+
+ORDERS = "id,price,qty,note\n1,2.5,4,plain\n2,x,3,bad\n3,nan,1,nan\n4,1,0,\"a, b\"\n\n5,7\n"
+
+
+def run(text: str, **options) -> list:
+    """Process ``text`` and return the output lines."""
+    out = StringIO()
+    calculate_columns(StringIO(text), out, **options)
+    return out.getvalue().splitlines()
+
+
+def test_operation_column() -> None:
+    """Test one operation over two columns, with per-row errors."""
+    assert run(ORDERS, operation='divide', a='price', b='qty') == [
+        "id,price,qty,note,result",
+        "1,2.5,4,plain,0.625",
+        "2,x,3,bad,Error: Invalid number format provided",
+        "3,nan,1,nan,Error: Cannot perform operation with NaN value",
+        "4,1,0,\"a, b\",Error: Cannot divide by zero",
+        "5,7,Error: Missing value for column qty",
+    ]
+
+
+def test_expression_column() -> None:
+    """Test an expression over column names, in TSV."""
+    text = "price\tqty\ttax\n2\t3\t0.5\n10\t1\t2\n"
+    assert run(text, expression="price * qty + tax", delimiter="\t", result_column="total") == [
+        "price\tqty\ttax\ttotal", "2\t3\t0.5\t6.5", "10\t1\t2\t12.0",
+    ]
+
+
+def test_chunked_output_matches() -> None:
+    """Test that chunked writing gives the same output as one chunk."""
+    text = "a,b\n" + "".join(f"{i},{i % 5}\n" for i in range(1000))
+    assert (run(text, operation='divide', a='a', b='b', chunk_rows=7)
+            == run(text, operation='divide', a='a', b='b', chunk_rows=10**6))
+
+
+def test_invalid_options() -> None:
+    """Test unknown columns and missing operation settings."""
+    with pytest.raises(ValueError, match="Unknown column: total"):
+        run("a,b\n1,2\n", operation='add', a='a', b='total')
+    with pytest.raises(ValueError, match="either an operation or an expression"):
+        run("a,b\n1,2\n")
+    with pytest.raises(ValueError, match="requires two columns"):
+        run("a,b\n1,2\n", operation='add', a='a')
+    assert run("", operation='add', a='a', b='b') == []
+
+
+def test_cli_csv(tmp_path) -> None:
+    """Test the csv subcommand on a file and on stdin."""
+    path = tmp_path / "orders.csv"
+    path.write_text("price,qty\n2.5,4\n1,x\n")
+    with patch('sys.stdout', new=StringIO()) as fake_out, \
+            patch('sys.stderr', new=StringIO()) as fake_err:
+        CalculatorCLI().run(['csv', '--op', 'multiply', '--a', 'price', '--b', 'qty', str(path)])
+    assert fake_out.getvalue() == "price,qty,result\n2.5,4,10.0\n1,x,Error: Invalid number format provided\n"
+    assert fake_err.getvalue().startswith("Processed 2 rows in ")
+    assert "rows/s" in fake_err.getvalue()
+
+    with patch('sys.stdin', new=StringIO("a\tb\n1\t2\n")), \
+            patch('sys.stdout', new=StringIO()) as fake_out, patch('sys.stderr', new=StringIO()):
+        CalculatorCLI().run(['csv', '--tsv', '--expr', 'a - b'])
+    assert fake_out.getvalue() == "a\tb\tresult\n1\t2\t-1.0\n"
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,145 @@
+"""
+Tests for the thread-pool batch executor.
+
+Testing Strategy:
+- Results, result types and the first error match Calculator.*_many on every path
+  (NumPy kernels, pure-Python chunks as on free-threaded builds, in-thread)
+- Operands that float64 would round before the operation skip the NumPy kernels
+- Stress: many threads sharing one executor and one instrumented calculator get
+  deterministic results and exact merged counters
+"""
+
+import math
+import random
+import threading
+from array import array
+import pytest
+from src.calculator import Calculator
+from src.calculator import threads
+from src.calculator.stats import InstrumentedCalculator
+from src.calculator.threads import ThreadedBatch
+
+OPERATIONS = ('add', 'subtract', 'multiply', 'divide')
+
+
+def operands(size: int, seed: int = 0) -> tuple:
+    """Float operands with a few zero divisors."""
+    rng = random.Random(seed)
+    a = [rng.uniform(-1e6, 1e6) for _ in range(size)]
+    b = [0.0 if rng.random() < 0.001 else rng.uniform(-1e3, 1e3) for _ in range(size)]
+    return a, b
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def pool(request, monkeypatch):
+    """A three-thread executor with small chunks, on each kernel path."""
+    if request.param == 'numpy':
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(threads, '_float64', lambda values: None)
+        monkeypatch.setattr(threads, '_gil_enabled', lambda: False)
+    with ThreadedBatch(workers=3, chunk_size=500) as executor:
+        yield executor
+
+
+def test_matches_batch_operations(pool) -> None:
+    """Test that every operation gives the in-thread batch result."""
+    a, b = operands(5000)
+    b = [value or 1.0 for value in b]
+    for name in OPERATIONS:
+        result = getattr(pool, f"{name}_many")(a, b)
+        assert isinstance(result, array)
+        assert result == getattr(Calculator, f"{name}_many")(a, b)
+
+    collected = pool.divide_many(a, [0.0] * 10 + b[10:], errors='collect')
+    expected = Calculator.divide_many(a, [0.0] * 10 + b[10:], errors='collect')
+    assert list(collected.codes) == list(expected.codes)
+    assert collected.failed == 10
+    assert str(collected.error(3)) == "Cannot divide by zero (at index 3)"
+
+
+def test_first_error_across_chunks(pool) -> None:
+    """Test that the lowest failing index is reported, whatever chunk fails first."""
+    a = array('d', range(5000))
+    b = array('d', [1.0] * 5000)
+    b[4900] = 0.0
+    b[1234] = 0.0
+    with pytest.raises(ZeroDivisionError, match=r"\(at index 1234\)") as info:
+        pool.divide_many(a, b)
+    assert info.value.index == 1234
+    a[3000] = math.nan
+    with pytest.raises(ValueError, match=r"NaN value \(at index 3000\)"):
+        pool.add_many(a, b)
+
+
+def test_numpy_inputs_and_rounding() -> None:
+    """Test NumPy results and operands that must not be converted to float64 first."""
+    np = pytest.importorskip("numpy")
+    with ThreadedBatch(workers=2, chunk_size=100) as pool:
+        a = np.arange(1000, dtype=np.int64)
+        result = pool.multiply_many(a, np.full(1000, 0.5))
+        assert isinstance(result, np.ndarray)
+        assert result.tolist() == Calculator.multiply_many(a, np.full(1000, 0.5)).tolist()
+        zeros = pool.multiply_many(np.zeros(1000, dtype=np.int64), -a)
+        assert all(math.copysign(1, value) == 1 for value in zeros)  # As 0 * -n: 0.0
+
+        big = [2**53 + 1] * 1000
+        assert pool.add_many(big, [1] * 1000) == Calculator.add_many(big, [1] * 1000)
+        with pytest.raises(TypeError, match=r"\(at index 7\)"):
+            pool.add_many([1.0] * 7 + ["x"] + [1.0] * 992, [1.0] * 1000)
+        assert pool.stats()['add'] == {'batches': 2, 'elements': 2000, 'failed': 1}
+
+
+def test_stress_shared_executor_and_counters() -> None:
+    """Test many threads hammering add/divide through shared objects."""
+    a, b = operands(4000, seed=1)
+    safe_b = [value or 1.0 for value in b]
+    expected_add = Calculator.add_many(a, b)
+    expected_divide = Calculator.divide_many(a, safe_b)
+    first_zero = b.index(0.0)
+    calc = InstrumentedCalculator(Calculator())
+    pool = ThreadedBatch(workers=4, chunk_size=256)
+    thread_count, rounds = 16, 20
+    start = threading.Barrier(thread_count)
+    failures = []
+
+    def hammer(seed: int) -> None:
+        start.wait()
+        rng = random.Random(seed)
+        try:
+            for _ in range(rounds):
+                assert pool.add_many(a, b) == expected_add
+                assert pool.divide_many(a, safe_b) == expected_divide
+                with pytest.raises(ZeroDivisionError) as info:
+                    pool.divide_many(a, b)
+                assert info.value.index == first_zero
+                index = rng.randrange(len(a))
+                assert calc.add(a[index], b[index]) == expected_add[index]
+                assert calc.divide(a[index], safe_b[index]) == expected_divide[index]
+                with pytest.raises(ZeroDivisionError):
+                    calc.divide(1.0, 0.0)
+        except BaseException as error:  # Reported by the main thread
+            failures.append(error)
+
+    workers = [threading.Thread(target=hammer, args=(seed,)) for seed in range(thread_count)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    pool.close()
+    assert failures == []
+
+    calls = thread_count * rounds
+    assert pool.stats() == {
+        'add': {'batches': calls, 'elements': calls * 4000, 'failed': 0},
+        'divide': {'batches': 2 * calls, 'elements': 2 * calls * 4000, 'failed': calls},
+    }
+    stats = calc.stats()
+    assert stats['add']['calls'] == calls
+    assert stats['divide']['calls'] == 2 * calls
+    assert stats['divide']['errors'] == {'ZERO_DIVISION': calls}
+    assert stats['divide']['buckets'][-1][1] == 2 * calls
+
+
+if __name__ == "__main__":
+    pytest.main()